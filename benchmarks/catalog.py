@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Generate translation catalogs to benchmark with."""
+import json
+import random
+from pathlib import Path
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud"
+).split()
+
+
+def generate_catalog(
+    keys: int,
+    *,
+    depth: int = 3,
+    section_size: int = 10,
+    unique: float = 1.0,
+    words: int = 8,
+    seed: int = 0,
+) -> dict:
+    """Generate a catalog of nested sections.
+
+    :param keys: number of strings
+    :param depth: nesting levels of the strings
+    :param section_size: number of items in each section
+    :param unique: ratio of distinct strings, the rest are repeated
+    :param words: average words of each string
+    :param seed: random seed, so catalogs are reproducible
+    :return: catalog data
+    """
+    rng = random.Random(seed)
+    distinct = max(1, int(keys * unique))
+    catalog = {}
+    for idx in range(keys):
+        node = catalog
+        for level in range(depth - 1, 0, -1):
+            node = node.setdefault(f"section_{idx // section_size**level}", {})
+        text_idx = idx % distinct
+        length = max(1, words + rng.randint(-words // 2, words // 2))
+        text = " ".join(
+            WORDS[(text_idx + offset) % len(WORDS)] for offset in range(length)
+        )
+        node[f"key_{idx}"] = f"{text} {text_idx}"
+    return catalog
+
+
+def write_catalog(path: Path, keys: int, **kwargs) -> Path:
+    """Generate a catalog and write it to a json file."""
+    with Path.open(path, "w", encoding="utf-8") as file:
+        json.dump(generate_catalog(keys, **kwargs), file, indent=2, ensure_ascii=False)
+    return path
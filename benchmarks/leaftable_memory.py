@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Compare the time and memory to translate a catalog with the leaf table.
+
+Translators rebuild data recursively, and only use the leaf table for data
+nested past the recursion limit, as the recursive approach is faster and
+takes less memory.
+
+Usage: python benchmarks/leaftable_memory.py [--keys 100000] [--depth 4]
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from json_translate.leaftable import LeafTable  # noqa: E402
+
+
+def generate_catalog(keys: int, depth: int) -> dict:
+    """Generate a catalog of nested sections with `keys` strings."""
+    catalog = {}
+    for idx in range(keys):
+        node = catalog
+        for level in range(depth - 1):
+            node = node.setdefault(f"section_{level}_{idx // 10 ** (level + 1)}", {})
+        node[f"key_{idx}"] = f"Text number {idx % 1000}"
+    return catalog
+
+
+def translate_recursive(data, skip_keys: set):
+    """Rebuild each container while recursing (default approach)."""
+    if isinstance(data, dict):
+        return {
+            key: value if key in skip_keys else translate_recursive(value, skip_keys)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [translate_recursive(value, skip_keys) for value in data]
+    if isinstance(data, str):
+        return data.upper()
+    return data
+
+
+def translate_table(data, skip_keys: set):
+    """Flatten, translate the strings and rebuild (fallback approach)."""
+    table = LeafTable.from_data(data)
+    skipped = table.get_skipped(skip_keys)
+    values = list(table.values)
+    for idx in table.get_strings():
+        if not skipped[idx]:
+            values[idx] = values[idx].upper()
+    return table.to_data(values)
+
+
+def measure(func, *args) -> tuple:
+    """Measure the wall time and the peak memory allocated by a function.
+
+    Time is measured on its own, as tracing allocations slows down the
+    functions allocating more objects.
+    """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+
+    catalog = generate_catalog(args.keys, args.depth)
+    skip_keys = {"key_0"}
+    for name, func in (
+        ("recursive", translate_recursive),
+        ("leaftable", translate_table),
+    ):
+        elapsed, peak = measure(func, catalog, skip_keys)
+        print(  # noqa: T201
+            f"{name:>10}: {elapsed:.3f}s, peak {peak / 2**20:.1f} MiB"
+            f" ({args.keys} keys, depth {args.depth})"
+        )
+
+    # Nesting the recursive approach can't handle
+    nested = "leaf"
+    for _ in range(sys.getrecursionlimit() * 2):
+        nested = {"key": nested}
+    try:
+        translate_recursive(nested, skip_keys)
+        print(" recursive: deep nesting ok")  # noqa: T201
+    except RecursionError:
+        print(" recursive: RecursionError on deep nesting")  # noqa: T201
+    translate_table(nested, skip_keys)
+    print(" leaftable: deep nesting ok")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Stub of the boto3 AWS Translate client."""
+import time
+import random
+import threading
+from botocore.exceptions import ClientError
+
+
+class StubTranslateClient:
+    """AWS Translate client stub with configurable latency, errors and throttling.
+
+    Texts are "translated" prefixing them with the target language.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """Initialize client stub.
+
+        :param latency: seconds to wait before each response
+        :param jitter: random seconds added to the latency
+        :param error_rate: ratio of calls failing with InternalServerException
+        :param throttle_rate: ratio of calls failing with ThrottlingException
+        :param seed: random seed
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "texts": 0, "characters": 0, "429": 0, "500": 0}
+
+    def translate_text(
+        self, *, Text, SourceLanguageCode, TargetLanguageCode, **kwargs  # noqa: N803
+    ):
+        """Translate a text, like boto3 client translate_text."""
+        with self.lock:
+            self.counts["requests"] += 1
+            value = self.random.random()
+            delay = self.latency + self.random.random() * self.jitter
+        time.sleep(delay)
+
+        if value < self.throttle_rate + self.error_rate:
+            throttled = value < self.throttle_rate
+            with self.lock:
+                self.counts["429" if throttled else "500"] += 1
+            code = "ThrottlingException" if throttled else "InternalServerException"
+            raise ClientError(
+                {
+                    "Error": {"Code": code, "Message": "stub error"},
+                    "ResponseMetadata": {"HTTPStatusCode": 429 if throttled else 500},
+                },
+                "TranslateText",
+            )
+
+        with self.lock:
+            self.counts["texts"] += 1
+            self.counts["characters"] += len(Text)
+        return {
+            "TranslatedText": f"[{TargetLanguageCode}] {Text}",
+            "SourceLanguageCode": SourceLanguageCode,
+            "TargetLanguageCode": TargetLanguageCode,
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in of the DeepL /v2/translate API."""
+import json
+import time
+import random
+import threading
+from urllib import parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockDeepLServer:
+    """DeepL API mock with configurable latency, errors and throttling.
+
+    Texts are "translated" prefixing them with the target language.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 0,
+        seed: int = 0,
+    ):
+        """Initialize mock server.
+
+        :param latency: seconds to wait before each response
+        :param jitter: random seconds added to the latency
+        :param error_rate: ratio of requests answered with a 500 error
+        :param throttle_rate: ratio of requests answered with a 429 error
+        :param retry_after: Retry-After header of the 429 responses
+        :param seed: random seed
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "texts": 0, "characters": 0, "429": 0, "500": 0}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Get the translate endpoint URL."""
+        return f"http://127.0.0.1:{self.server.server_port}/v2/translate"
+
+    def start(self) -> "MockDeepLServer":
+        """Start serving in a background thread."""
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        """Start serving in a context."""
+        return self.start()
+
+    def __exit__(self, *args):
+        """Stop serving at the end of the context."""
+        self.stop()
+
+    def get_status(self) -> int:
+        """Count a request and draw its response status, after the latency."""
+        with self.lock:
+            self.counts["requests"] += 1
+            value = self.random.random()
+            delay = self.latency + self.random.random() * self.jitter
+        if value < self.throttle_rate:
+            status = 429
+        elif value < self.throttle_rate + self.error_rate:
+            status = 500
+        else:
+            status = 200
+        time.sleep(delay)
+        return status
+
+    def _get_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, don't delay the body
+            disable_nagle_algorithm = True
+
+            def do_POST(self):  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                params = parse.parse_qs(body.decode())
+                status = mock.get_status()
+
+                if status == 200:
+                    texts = params.get("text", [])
+                    target_lang = params.get("target_lang", ["XX"])[0]
+                    with mock.lock:
+                        mock.counts["texts"] += len(texts)
+                        mock.counts["characters"] += sum(len(text) for text in texts)
+                    response = json.dumps(
+                        {
+                            "translations": [
+                                {
+                                    "detected_source_language": "EN",
+                                    "text": f"[{target_lang}] {text}",
+                                }
+                                for text in texts
+                            ]
+                        }
+                    ).encode()
+                else:
+                    with mock.lock:
+                        mock.counts[str(status)] += 1
+                    response = b'{"message": "mock error"}'
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                if status == 429:
+                    self.send_header("Retry-After", str(mock.retry_after))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                """Don't log requests."""
+
+        return Handler
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Offline throughput benchmark of the translators.
+
+Translates generated catalogs against a local DeepL mock server and a stub
+AWS Translate client, and reports strings/sec, API call latency, peak RSS
+and request counts of each translator mode.
+
+Each mode and catalog size runs in its own process, so peak RSS is not
+shared between runs.
+
+Usage: python benchmarks/run.py --keys 1000 10000 100000 --latency 0.02
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json_translate  # noqa: E402, F401
+from catalog import write_catalog  # noqa: E402
+from files import iter_file_events, load_json_file, save_results_file  # noqa: E402
+from files import save_results_stream  # noqa: E402
+from memory import TranslationMemory  # noqa: E402
+from mock_aws import StubTranslateClient  # noqa: E402
+from mock_deepl import MockDeepLServer  # noqa: E402
+from ratelimit import RateLimiter  # noqa: E402
+from stream import translate_events  # noqa: E402
+from translators import get_translator  # noqa: E402
+from transport import HTTPConnectionPool  # noqa: E402
+
+# Mode: (service, workers option, streaming)
+MODES = {
+    "deepl": ("deepl", False, False),
+    "deepl-workers": ("deepl", True, False),
+    "deepl-stream": ("deepl", False, True),
+    "aws": ("aws", False, False),
+    "aws-workers": ("aws", True, False),
+}
+
+
+class LatencyRecorder:
+    """Wrap an API call function, recording the duration of each call."""
+
+    def __init__(self, func):
+        """Initialize recorder.
+
+        :param func: API call function
+        """
+        self.func = func
+        self.durations = []
+
+    def __call__(self, *args, **kwargs):
+        """Call the wrapped function, recording its duration."""
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+
+def get_percentile(values: list, percentile: float) -> float:
+    """Get a percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def get_peak_rss() -> float:
+    """Get the peak resident memory of the process, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_mode(mode: str, keys: int, args) -> dict:
+    """Translate a generated catalog with a translator mode.
+
+    :param mode: translator mode
+    :param keys: catalog strings
+    :param args: benchmark arguments
+    :return: benchmark results
+    """
+    service, use_workers, streaming = MODES[mode]
+    fault_options = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = write_catalog(Path(tmp_dir) / "en.json", keys, unique=args.unique)
+        output_file = Path(tmp_dir) / "fr.json"
+
+        server = None
+        if service == "deepl":
+            server = MockDeepLServer(**fault_options).start()
+            counter = server
+            service_kwargs = {"transport": HTTPConnectionPool(server.url)}
+        else:
+            counter = StubTranslateClient(**fault_options)
+            service_kwargs = {"client": counter}
+
+        translator = get_translator(service)(
+            "FR",
+            source_locale="EN",
+            sleep=0,
+            workers=args.workers if use_workers else 1,
+            memory=TranslationMemory(),
+            rate_limiter=RateLimiter(retries=args.retries, backoff=args.backoff),
+            **service_kwargs,
+        )
+        recorder = LatencyRecorder(translator.translate_batch)
+        translator.translate_batch = recorder
+
+        start = time.perf_counter()
+        if streaming:
+            events = translate_events(translator, iter_file_events(input_file))
+            save_results_stream(events, output_file)
+        else:
+            save_results_file(
+                translator.translate(load_json_file(input_file)), output_file
+            )
+        elapsed = time.perf_counter() - start
+
+        if server is not None:
+            server.stop()
+
+    return {
+        "mode": mode,
+        "keys": keys,
+        "seconds": round(elapsed, 3),
+        "strings_per_second": round(keys / elapsed, 1),
+        "p50_ms": round(get_percentile(recorder.durations, 50) * 1000, 2),
+        "p99_ms": round(get_percentile(recorder.durations, 99) * 1000, 2),
+        "peak_rss_mib": round(get_peak_rss(), 1),
+        "requests": counter.counts["requests"],
+        "throttled": counter.counts["429"],
+        "errors": counter.counts["500"],
+        "failed": translator.counts["failed"],
+    }
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get the benchmark arguments parser."""
+    parser = argparse.ArgumentParser(description="Offline translators benchmark")
+    parser.add_argument(
+        "--keys", type=int, nargs="+", default=[1000, 10000], help="catalog sizes"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=list(MODES),
+        default=list(MODES),
+        help="modes to run",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="workers of *-workers modes"
+    )
+    parser.add_argument(
+        "--unique", type=float, default=1.0, help="ratio of distinct strings"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="API latency, seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="API latency jitter, seconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="ratio of 500 errors"
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="ratio of 429 errors"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=5, help="retries of failed calls"
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=0.01, help="base retry backoff"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print results as json lines"
+    )
+    parser.add_argument(
+        "--child", nargs=2, metavar=("MODE", "KEYS"), help=argparse.SUPPRESS
+    )
+    return parser
+
+
+def print_table(results: list) -> None:
+    """Print the results as an aligned table."""
+    columns = (
+        "mode", "keys", "seconds", "strings_per_second", "p50_ms", "p99_ms",
+        "peak_rss_mib", "requests", "throttled", "errors", "failed",
+    )  # fmt: skip
+    widths = [
+        max(len(column), *(len(str(result[column])) for result in results))
+        for column in columns
+    ]
+    print(  # noqa: T201
+        "  ".join(column.rjust(width) for column, width in zip(columns, widths))
+    )
+    for result in results:
+        print(  # noqa: T201
+            "  ".join(
+                str(result[column]).rjust(width)
+                for column, width in zip(columns, widths)
+            )
+        )
+
+
+def main():
+    """Run each mode and catalog size in a child process, and print the results."""
+    args, argv = get_parser().parse_known_args()
+
+    if args.child:
+        mode, keys = args.child
+        print(json.dumps(run_mode(mode, int(keys), args)))  # noqa: T201
+        return
+
+    child_argv = [arg for arg in sys.argv[1:] if arg != "--json"]
+    results = []
+    for keys in args.keys:
+        for mode in args.modes:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    *child_argv,
+                    *argv,
+                    "--child",
+                    mode,
+                    str(keys),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.splitlines()[-1])
+            results.append(result)
+            if args.json:
+                print(json.dumps(result))  # noqa: T201
+
+    if not args.json:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
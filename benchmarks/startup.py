@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Startup time benchmark of the command line tool.
+
+Imports the command and the translator of each service in a new process with
+`python -X importtime`, and reports the import time, the slowest modules and
+the modules a service shouldn't import (like boto3 for DeepL).
+
+Exits with an error if a forbidden module is imported or the import time
+exceeds --max-ms, to catch startup regressions.
+
+Usage: python benchmarks/startup.py --services deepl aws --max-ms 300
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules each service must not import
+FORBIDDEN_MODULES = {
+    "deepl": ("boto3", "botocore"),
+    "aws": (),
+}
+
+STARTUP_CODE = (
+    "import sys, time; start = time.perf_counter(); sys.path.insert(0, {root!r});"
+    " import json_translate; from commands import main;"
+    " from translators import get_translator; get_translator({service!r});"
+    " print((time.perf_counter() - start) * 1000)"
+)
+
+
+def parse_importtime(output: str) -> dict:
+    """Get the cumulative import time of each module from the importtime output.
+
+    :return: microseconds by module name
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if cumulative_us.strip().isdigit():
+            modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def measure(service: str, repeat: int) -> dict:
+    """Import the command and a service translator in new processes.
+
+    :return: best total import time (ms), imported modules of the best run
+    """
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                STARTUP_CODE.format(root=str(ROOT), service=service),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        total_ms = float(process.stdout)
+        if best is None or total_ms < best["total_ms"]:
+            best = {
+                "total_ms": round(total_ms, 1),
+                "modules": parse_importtime(process.stderr),
+            }
+    return best
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get the benchmark arguments parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", nargs="+", default=list(FORBIDDEN_MODULES))
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per service (best one is kept)"
+    )
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to print")
+    parser.add_argument(
+        "--max-ms", type=float, help="fail if the import time is higher"
+    )
+    return parser
+
+
+def main():
+    """Measure the startup of each service, failing on slow or unexpected imports."""
+    args = get_parser().parse_args()
+
+    failed = False
+    for service in args.services:
+        result = measure(service, args.repeat)
+        print(f"{service}: {result['total_ms']} ms")  # noqa: T201
+        slowest = sorted(result["modules"].items(), key=lambda item: -item[1])
+        for name, us in slowest[: args.top]:
+            print(f"  {us / 1000:8.1f} ms  {name}")  # noqa: T201
+
+        forbidden = [
+            name
+            for name in result["modules"]
+            if name.split(".")[0] in FORBIDDEN_MODULES.get(service, ())
+        ]
+        if forbidden:
+            failed = True
+            print(  # noqa: T201
+                f"  error: {service} imports {', '.join(sorted(forbidden)[:5])}"
+            )
+        if args.max_ms is not None and result["total_ms"] > args.max_ms:
+            failed = True
+            print(f"  error: {result['total_ms']} ms > {args.max_ms} ms")  # noqa: T201
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
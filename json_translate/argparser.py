@@ -1,11 +1,26 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import argparse
+from translators import get_services, has_translator
+from shards import parse_shard
 
 from settings import (
     INDENTATION_DEFAULT,
     SLEEP_BETWEEN_API_CALLS,
+    REQUESTS_PER_SECOND,
+    CHARACTERS_PER_SECOND,
+    MAX_RETRIES,
+    WORKERS,
+    POOL_SIZE,
     ENCODING,
+    TRANSLATION_CACHE,
+    MEMORY_CACHE_SIZE,
+    PROJECT_SOURCE_PATTERN,
+    PROJECT_JOBS,
+    WATCH_INTERVAL,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_TOKEN,
 )
 
 
@@ -18,6 +33,7 @@ def get_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "service",
+        type=service_name,
         help="Translation service to use",
     )
     parser.add_argument(
@@ -26,7 +42,13 @@ def get_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "locale",
-        help="Language target to translate",
+        nargs="?",
+        help="Language target to translate (comma separated for several ones)",
+    )
+    parser.add_argument(
+        "--all-supported",
+        action="store_true",
+        help="Translate to all the languages supported by the service",
     )
     parser.add_argument(
         "-sl",
@@ -44,6 +66,31 @@ def get_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Extend an existing translation file",
     )
+    parser.add_argument(
+        "--list-key",
+        help="Key identifying the objects of a list when extending (like 'id')",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Translate the file incrementally, without loading it in memory",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard,
+        metavar="INDEX/COUNT",
+        help="Translate a slice of the strings only (like 1/4), to merge with merge-shards",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse the translations journaled by an interrupted run",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the strings, characters and API calls to send, without sending them",
+    )
     parser.add_argument(
         "--override",
         action="store_true",
@@ -54,6 +101,133 @@ def get_parser() -> argparse.ArgumentParser:
         "--output",
         help="Output file name",
     )
+    add_translation_arguments(parser)
+
+    return parser
+
+
+def get_project_parser() -> argparse.ArgumentParser:
+    """Construct and return the argument parser for the project command."""
+    parser = argparse.ArgumentParser(
+        prog="json_translate project",
+        description="Translate every source catalog of a directory tree",
+    )
+    add_project_arguments(parser)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Translate the catalogs whose source didn't change too",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, translating the source catalogs when they change",
+    )
+    add_translation_arguments(parser)
+
+    return parser
+
+
+def get_serve_parser() -> argparse.ArgumentParser:
+    """Construct and return the argument parser for the serve command."""
+    parser = argparse.ArgumentParser(
+        prog="json_translate serve",
+        description="Translate json data and the catalogs of a project on HTTP requests",
+    )
+    add_project_arguments(parser)
+    parser.add_argument(
+        "--host",
+        default=SERVE_HOST,
+        help="Address to listen on",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SERVE_PORT,
+        help="Port to listen on",
+    )
+    parser.add_argument(
+        "--token",
+        default=SERVE_TOKEN,
+        help="Token the requests must send (a random one by default)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Translate the source catalogs when they change too",
+    )
+    add_translation_arguments(parser)
+
+    return parser
+
+
+def add_project_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments locating the catalogs of a project."""
+    parser.add_argument(
+        "service",
+        type=service_name,
+        help="Translation service to use",
+    )
+    parser.add_argument(
+        "root",
+        help="Project directory to look for source catalogs",
+    )
+    parser.add_argument(
+        "locale",
+        nargs="?",
+        help="Language target to translate (comma separated for several ones)",
+    )
+    parser.add_argument(
+        "--all-supported",
+        action="store_true",
+        help="Translate to all the languages supported by the service",
+    )
+    parser.add_argument(
+        "-sl",
+        "--source-locale",
+        required=True,
+        help="Language translating from",
+    )
+    parser.add_argument(
+        "--source-pattern",
+        default=PROJECT_SOURCE_PATTERN,
+        help="Path pattern of the source catalogs, like '{lang}/**/*.json'",
+    )
+    parser.add_argument(
+        "--target-pattern",
+        help="Path pattern of the translated catalogs (same as the source one if not set)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=PROJECT_JOBS,
+        help="Number of catalogs to translate concurrently",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help="Seconds between checks of the source catalogs when watching",
+    )
+    parser.add_argument(
+        "-g",
+        "--glossary",
+        help="ID of glossary to use when translating",
+    )
+    parser.add_argument(
+        "--list-key",
+        help="Key identifying the objects of a list when extending (like 'id')",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse the translations journaled by an interrupted run",
+    )
+
+
+def add_translation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments to configure the translators and the output files."""
     parser.add_argument(
         "-i",
         "--indent",
@@ -66,18 +240,60 @@ def get_parser() -> argparse.ArgumentParser:
         "--sleep",
         type=float,
         default=SLEEP_BETWEEN_API_CALLS,
-        help="Sleep time between API calls",
+        help="Sleep time between API calls (ignored if --rps is defined)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=REQUESTS_PER_SECOND,
+        help="Maximum API calls per second",
+    )
+    parser.add_argument(
+        "--cps",
+        type=float,
+        default=CHARACTERS_PER_SECOND,
+        help="Maximum characters sent per second",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=MAX_RETRIES,
+        help="Retries of throttled or failed API calls",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Number of API calls to run concurrently",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=POOL_SIZE,
+        help="Maximum number of connections kept open to the service",
     )
     parser.add_argument(
         "--skip",
         nargs="+",
-        help="Keys to skip",
+        help="Key paths to leave untranslated (like title, meta.*.id or /^_/)",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="Key paths to translate, leaving the other values untranslated",
     )
     parser.add_argument(
         "--encoding",
         default=ENCODING,
         help="File encoding",
     )
+    parser.add_argument(
+        "--no-mask",
+        dest="mask_placeholders",
+        action="store_false",
+        help="Send placeholders (like {name}, %%d or <b>) without masking them",
+    )
     parser.add_argument(
         "--log",
         action="store_true",
@@ -93,5 +309,159 @@ def get_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Mask profane words and phrases",
     )
+    parser.add_argument(
+        "--documents",
+        action="store_true",
+        help="Pack the strings of each API call in a html document (AWS only)",
+    )
+
+    parser.add_argument(
+        "--cache",
+        default=TRANSLATION_CACHE,
+        help="Translation memory file to reuse translations between runs",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=MEMORY_CACHE_SIZE / 2**20,
+        help="Megabytes of recently used translations to keep in memory (64 by default)",
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        help="Write run metrics as json to a file ('-' for the standard error)",
+    )
+
+
+def get_cache_parser() -> argparse.ArgumentParser:
+    """Construct and return the argument parser for the cache command."""
+    parser = argparse.ArgumentParser(
+        prog="json_translate cache",
+        description="Manage the translation memory",
+    )
+    parser.add_argument(
+        "action",
+        choices=("inspect", "prune", "vacuum", "import", "export"),
+        help="Action to perform on the translation memory",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Translated catalogs or TMX files to import",
+    )
+    parser.add_argument(
+        "--cache",
+        default=TRANSLATION_CACHE,
+        required=TRANSLATION_CACHE is None,
+        help="Translation memory file",
+    )
+    parser.add_argument(
+        "--older-than",
+        type=float,
+        help="Prune entries not updated in this number of days",
+    )
+    parser.add_argument(
+        "--service",
+        help="Prune, import or export entries of this translation service only",
+    )
+    parser.add_argument(
+        "--locale",
+        help=(
+            "Prune or export entries of this target language only, or language"
+            " of the imported catalogs (their file name by default)"
+        ),
+    )
+    parser.add_argument(
+        "-sl",
+        "--source-locale",
+        help="Language of the source catalog to import translations from",
+    )
+    parser.add_argument(
+        "--source",
+        help=(
+            "Source catalog to import translations from"
+            " (<source locale>.json next to each catalog by default)"
+        ),
+    )
+    parser.add_argument(
+        "--list-key",
+        help="Key identifying the objects of a list (like 'id')",
+    )
+    parser.add_argument(
+        "--no-mask",
+        dest="mask_placeholders",
+        action="store_false",
+        help="Import for translators run with --no-mask",
+    )
+    parser.add_argument(
+        "-g",
+        "--glossary",
+        help="Import for translators run with this glossary",
+    )
+    parser.add_argument(
+        "--formality",
+        action="store_true",
+        help="Import for translators run with --formality",
+    )
+    parser.add_argument(
+        "--profanity",
+        action="store_true",
+        help="Import for translators run with --profanity",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="TMX file to export to (the standard output by default)",
+    )
 
     return parser
+
+
+def get_merge_shards_parser() -> argparse.ArgumentParser:
+    """Construct and return the argument parser for the merge-shards command."""
+    parser = argparse.ArgumentParser(
+        prog="json_translate merge-shards",
+        description="Combine the shards of sharded runs into their output files",
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="Shard files, of one or several output files",
+    )
+    parser.add_argument(
+        "-i",
+        "--indent",
+        type=int,
+        default=INDENTATION_DEFAULT,
+        help="Indentation spaces",
+    )
+    parser.add_argument(
+        "--encoding",
+        default=ENCODING,
+        help="File encoding",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the shard files once merged",
+    )
+
+    return parser
+
+
+def service_name(value: str) -> str:
+    """Check a translation service is available, without importing it."""
+    if not has_translator(value):
+        raise argparse.ArgumentTypeError(
+            f"unknown service {value!r} (available: {', '.join(get_services())})"
+        )
+    return value
+
+
+def shard(value: str) -> tuple:
+    """Parse a shard argument, like "1/4"."""
+    try:
+        return parse_shard(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
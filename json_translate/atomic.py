@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import os
+import uuid
+from pathlib import Path
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_atomic(path: os.PathLike, encoding: str = "utf8"):
+    """Open a file to write it atomically.
+
+    The content is written to a temporary file in the same directory, which
+    replaces the file only once it's complete, so an interrupted write never
+    leaves a partial file behind.
+
+    :param path: file path
+    :param encoding: file encoding
+    :return: text file object
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with Path.open(tmp_path, "x", encoding=encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        if path.exists():
+            # Keep the permissions of the replaced file
+            tmp_path.chmod(path.stat().st_mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Texts too long for a single API call are split in chunks, translated on
+# their own and joined back. Each paragraph is a chunk of its own, so the
+# unchanged paragraphs of an edited document are found in the translation
+# memory, and only the paragraphs still too long are split further, packing
+# as many lines, sentences or words as fit.
+import re
+
+# Boundaries texts are split at, from the preferred ones
+PARAGRAPH_RE = re.compile(r"(\n[^\S\n]*\n\s*)")
+BOUNDARIES_RE = (
+    re.compile(r"(\n\s*)"),  # lines
+    re.compile(r"((?<=[.!?…])\s+|(?<=[。！？]))"),  # sentences
+    re.compile(r"(\s+)"),  # words
+)
+
+
+def get_utf8_size(text: str) -> int:
+    """Get the size of a text encoded as utf-8."""
+    return len(text.encode("utf-8"))
+
+
+def split_text(text: str, max_size: int, get_size=get_utf8_size) -> list:
+    """Split a text in chunks no bigger than a size.
+
+    The whitespace between chunks is returned as parts of its own, so joining
+    the parts gives the text back.
+
+    :param text: text to split
+    :param max_size: maximum size of a chunk
+    :param get_size: function measuring the size of a text in a request
+        (like its utf-8 or urlencoded size), plus a constant overhead
+    :return: parts of the text: chunks and the whitespace between them
+    """
+    overhead = get_size("")
+
+    def measure(text: str) -> int:
+        return get_size(text) - overhead
+
+    budget = max_size - overhead
+    if measure(text) <= budget:
+        return [text]
+
+    parts = []
+    segments = PARAGRAPH_RE.split(text)
+    for idx, segment in enumerate(segments):
+        # Odd segments are the paragraph separators
+        if idx % 2 or measure(segment) <= budget:
+            parts.append(segment)
+        else:
+            parts.extend(_split_segment(segment, budget, measure, level=0))
+
+    return [part for part in parts if part]
+
+
+def _split_segment(text: str, budget: int, measure, level: int) -> list:
+    """Split a text at a level of boundaries, packing the pieces that fit in a chunk."""
+    if level == len(BOUNDARIES_RE):
+        return _split_characters(text, budget, measure)
+
+    parts = []
+    chunk = None
+    chunk_size = 0
+    segments = BOUNDARIES_RE[level].split(text)
+    for idx in range(0, len(segments), 2):
+        segment = segments[idx]
+        separator = segments[idx - 1] if idx else ""
+        size = measure(segment)
+        separator_size = measure(separator)
+        if chunk is not None and chunk_size + separator_size + size <= budget:
+            chunk += separator + segment
+            chunk_size += separator_size + size
+            continue
+
+        if chunk is not None:
+            parts.append(chunk)
+        parts.append(separator)
+        if size > budget:
+            parts.extend(_split_segment(segment, budget, measure, level + 1))
+            chunk = None
+            chunk_size = 0
+        else:
+            chunk = segment
+            chunk_size = size
+
+    if chunk is not None:
+        parts.append(chunk)
+    return parts
+
+
+def _split_characters(text: str, budget: int, measure) -> list:
+    """Split a text without boundaries, like a very long word or url."""
+    parts = []
+    start = 0
+    size = 0
+    for idx, char in enumerate(text):
+        char_size = measure(char)
+        if idx > start and size + char_size > budget:
+            parts.append(text[start:idx])
+            start = idx
+            size = 0
+        size += char_size
+
+    parts.append(text[start:])
+    return parts
@@ -1,62 +1,1180 @@
 # -*- coding: utf-8 -*-
-from argparser import get_parser
-from languages import get_target_lang_code
+import sys
+import copy
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from argparser import (
+    get_parser,
+    get_cache_parser,
+    get_project_parser,
+    get_serve_parser,
+    get_merge_shards_parser,
+)
+from languages import get_target_lang_codes, is_supported_lang
 from files import (
     get_input_dir_from_file,
     get_file_name_without_extension,
     get_input_file_from_dir,
     get_output_file,
-    get_data_to_translate,
+    load_json_file,
+    get_diff_to_translate,
     save_results_file,
+    iter_file_events,
+    save_results_stream,
+)
+from memory import TranslationMemory
+from atomic import open_atomic
+from ratelimit import RateLimiter
+from stream import translate_events
+from stats import RunStats
+from lockfile import write_lockfile, hash_file
+from journal import Journal, get_journal_path
+from paths import to_pointer
+from shards import (
+    ShardError,
+    ShardTranslations,
+    get_shard_leaves,
+    get_shard_path,
+    write_shard,
+    read_shard,
+    check_shards,
 )
-from translators import get_translator
+from translators import get_translator, get_services
+from watch import FileWatcher
+from project import find_catalogs, get_target_path, is_up_to_date, validate_patterns
+
+# Translators built concurrently update the resources they share
+SHARED_KWARGS_LOCK = threading.Lock()
+
+# Lock of each translated catalog, by path
+CATALOG_LOCKS = {}
 
 
 def main():
     """Execute translator command."""
+    # Commands with their own arguments
+    subcommands = {
+        "cache": cache,
+        "project": project,
+        "serve": serve,
+        "merge-shards": merge_shards,
+    }
+    command = subcommands.get(sys.argv[1]) if len(sys.argv) > 1 else None
+    if command is not None:
+        command(sys.argv[2:])
+        return
+
     parser = get_parser()
     args = parser.parse_args()
-
     input_dir = get_input_dir_from_file(args.file)
     input_file = get_input_file_from_dir(input_dir)
-    lang_code = get_target_lang_code(args.service, args.locale)
+    lang_codes = get_lang_codes(parser, args, input_file)
+
+    stats = RunStats()
+
+    # The source file is parsed only once for all the locales
+    with stats.stage("load"):
+        input_data = (
+            None
+            if args.stream and not args.dry_run
+            else load_json_file(input_file, args.encoding)
+        )
+    output_files = get_output_files(args, lang_codes, input_file)
+    # Completed translations are journaled until the output file is saved
+    journals = {
+        lang_code: Journal(
+            get_journal_path(
+                get_shard_path(output_file, *args.shard) if args.shard else output_file
+            )
+        )
+        for lang_code, output_file in output_files.items()
+    }
+    translators = get_translators(
+        args,
+        lang_codes,
+        stats=stats,
+        journals=None if args.dry_run else journals,
+    )
+    resume(args, translators, journals)
+
+    if args.dry_run:
+        dry_run(args, translators, input_file, input_data, output_files)
+        return
+
+    def translate_locale(lang_code: str):
+        translate_output(
+            args,
+            translators[lang_code],
+            lang_code=lang_code,
+            input_file=input_file,
+            output_file=output_files[lang_code],
+            input_data=input_data,
+            stats=stats,
+        )
+        journals[lang_code].remove()
+
+    errors = {}
+    try:
+        if len(lang_codes) == 1:
+            translate_locale(lang_codes[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(lang_codes)) as executor:
+                futures = {
+                    code: executor.submit(translate_locale, code) for code in lang_codes
+                }
+                errors = {code: future.exception() for code, future in futures.items()}
+            print_report(translators, output_files, errors)
+    finally:
+        # Journals of the locales not saved are kept to --resume them
+        for journal in journals.values():
+            journal.close()
+        if args.stats:
+            stats.write(args.stats, translators)
+
+    if any(errors.values()):
+        exit(1)
+
+
+def get_lang_codes(parser, args, input_file: Path) -> list:
+    """Validate the translate command arguments.
+
+    :param parser: command parser, to report errors
+    :param args: command arguments
+    :param input_file: source file
+    :return: target language codes
+    """
+    if not args.locale and not args.all_supported:
+        parser.error("the following arguments are required: locale")
+
     json_file_name = get_file_name_without_extension(input_file)
+    lang_codes = get_target_lang_codes(
+        args.service,
+        args.locale,
+        all_supported=args.all_supported,
+        exclude=(json_file_name, args.source_locale),
+    )
 
-    if lang_code.lower() == json_file_name.lower():
+    if len(lang_codes) > 1 and args.output:
+        parser.error("argument -o/--output: not allowed with several locales")
+
+    if args.stream and args.extend:
+        parser.error("argument --stream: not allowed with argument -e/--extend")
+
+    if args.stream and args.shard:
+        parser.error("argument --stream: not allowed with argument --shard")
+
+    if any(code.lower() == json_file_name.lower() for code in lang_codes):
         print("You are trying to translate to the same language!")  # noqa: T201
         exit(1)
 
-    output_file = get_output_file(
-        output=args.output,
-        lang_code=lang_code,
-        input_file=input_file,
-        extend=args.extend,
-        override=args.override,
+    return lang_codes
+
+
+def get_output_files(args, lang_codes: list, input_file: Path) -> dict:
+    """Get the output file of each target language.
+
+    :param args: command arguments
+    :param lang_codes: target languages
+    :param input_file: source file
+    :return: output files by language code
+    """
+    return {
+        lang_code: get_output_file(
+            output=args.output,
+            lang_code=lang_code,
+            input_file=input_file,
+            extend=args.extend,
+            # Nothing is written in a dry run, and shards write partial files
+            override=args.override or args.dry_run or bool(args.shard),
+        )
+        for lang_code in lang_codes
+    }
+
+
+def translate_output(
+    args,
+    translator,
+    *,
+    lang_code: str,
+    input_file: Path,
+    output_file: Path,
+    input_data,
+    stats: RunStats,
+):
+    """Translate the source file to a language, streaming it or as a shard if asked.
+
+    :param args: command arguments
+    :param translator: translator instance
+    :param lang_code: target language
+    :param input_file: source file
+    :param output_file: output file
+    :param input_data: source file data (None when streaming)
+    :param stats: run metrics
+    """
+    if args.stream:
+        # Translation and saving are interleaved
+        with stats.stage("translate"):
+            save_results_stream(
+                translate_events(
+                    translator, iter_file_events(input_file, args.encoding)
+                ),
+                output_file,
+                indent=args.indent,
+                encoding=args.encoding,
+            )
+    elif args.shard:
+        translate_shard(
+            args,
+            translator,
+            lang_code=lang_code,
+            input_file=input_file,
+            output_file=output_file,
+            input_data=input_data,
+            stats=stats,
+        )
+    else:
+        translate_file(
+            args,
+            translator,
+            input_file=input_file,
+            output_file=output_file,
+            input_data=input_data,
+            extend=args.extend,
+            stats=stats,
+        )
+
+
+def translate_file(
+    args,
+    translator,
+    *,
+    input_file: str,
+    output_file: str,
+    input_data: dict | list,
+    extend: bool,
+    stats: RunStats,
+):
+    """Translate a source file and save the results along with its lockfile.
+
+    :param args: command arguments
+    :param translator: translator of the target language
+    :param input_file: source file
+    :param output_file: file to save the translations
+    :param input_data: source file data
+    :param extend: if the output file must be extended
+    :param stats: run metrics
+    """
+    if extend:
+        with stats.stage("diff"):
+            diff = get_diff_to_translate(
+                input_file=input_file,
+                output_file=output_file,
+                encoding=args.encoding,
+                input_data=input_data,
+                identity_key=args.list_key,
+                only=args.only,
+            )
+        with stats.stage("translate"):
+            results = translator.translate_values(diff.get_paths(), diff.get_values())
+    else:
+        diff = None
+        with stats.stage("translate"):
+            results = translator.translate(
+                data=input_data,
+            )
+    with stats.stage("save"):
+        save_results_file(
+            data=results,
+            output_file=output_file,
+            extend=extend,
+            indent=args.indent,
+            encoding=args.encoding,
+            patch=diff,
+        )
+        write_lockfile(
+            output_file,
+            input_data,
+            source_file=input_file,
+            only=args.only,
+            identity_key=args.list_key,
+        )
+
+
+def get_shard_values(
+    args,
+    *,
+    input_file: str,
+    output_file: str,
+    input_data: dict | list,
+) -> tuple:
+    """Get the strings of the shard of a run, with their paths.
+
+    :param args: command arguments
+    :param input_file: source file
+    :param output_file: file the translations are merged into
+    :param input_data: source file data
+    :return: tuple of (paths, strings)
+    """
+    if args.extend:
+        diff = get_diff_to_translate(
+            input_file=input_file,
+            output_file=output_file,
+            encoding=args.encoding,
+            input_data=input_data,
+            identity_key=args.list_key,
+            only=args.only,
+        )
+        paths, values = diff.get_paths(), diff.get_values()
+    else:
+        paths, values = [()], [input_data]
+    return get_shard_leaves(paths, values, *args.shard)
+
+
+def translate_shard(
+    args,
+    translator,
+    *,
+    lang_code: str,
+    input_file: str,
+    output_file: str,
+    input_data: dict | list,
+    stats: RunStats,
+):
+    """Translate the shard of a run and save its translations to a shard file.
+
+    :param args: command arguments
+    :param translator: translator of the target language
+    :param lang_code: target language
+    :param input_file: source file
+    :param output_file: file the translations are merged into
+    :param input_data: source file data
+    :param stats: run metrics
+    """
+    index, count = args.shard
+    with stats.stage("diff"):
+        paths, values = get_shard_values(
+            args, input_file=input_file, output_file=output_file, input_data=input_data
+        )
+    with stats.stage("translate"):
+        results = translator.translate_values(paths, values)
+    shard_file = get_shard_path(output_file, index, count)
+    with stats.stage("save"):
+        write_shard(
+            shard_file,
+            {to_pointer(path): result for path, result in zip(paths, results)},
+            index=index,
+            count=count,
+            locale=lang_code,
+            input=str(input_file),
+            output=str(output_file),
+            source=hash_file(input_file),
+            # Extended shards are only valid for the output file they diffed
+            base=hash_file(output_file) if args.extend else None,
+            extend=args.extend,
+            list_key=args.list_key,
+            only=args.only,
+        )
+    print(f"{lang_code}: shard {index}/{count} saved on {shard_file}")  # noqa: T201
+
+
+def get_translators(
+    args,
+    lang_codes: list,
+    *,
+    stats: RunStats = None,
+    journals: dict = None,
+    shared_kwargs: dict = None,
+) -> dict:
+    """Build a translator per target language.
+
+    The translators share the translation memory, the rate limiter, the run
+    metrics and the service connections.
+
+    :param args: command arguments
+    :param lang_codes: target languages
+    :param stats: run metrics
+    :param journals: journal of each target language
+    :param shared_kwargs: resources to share with translators built before,
+        updated with the ones of the new translators
+    :return: translators by language code
+    """
+    translator_class = get_translator(args.service)
+    if shared_kwargs is None:
+        shared_kwargs = {}
+    if "memory" not in shared_kwargs:
+        shared_kwargs.update(
+            memory=TranslationMemory(
+                args.cache, cache_size=int(args.cache_size * 2**20)
+            ),
+            rate_limiter=get_rate_limiter(args),
+            stats=stats if stats is not None else RunStats(),
+        )
+    translators = {}
+    for lang_code in lang_codes:
+        translator = translator_class(
+            target_locale=lang_code.upper(),
+            source_locale=args.source_locale,
+            sleep=args.sleep,
+            workers=args.workers,
+            pool_size=args.pool_size,
+            skip=args.skip,
+            only=args.only,
+            encoding=args.encoding,
+            log_translations=args.log,
+            mask_placeholders=args.mask_placeholders,
+            journal=(journals or {}).get(lang_code),
+            glossary=args.glossary,
+            formality=args.formality,
+            profanity=args.profanity,
+            documents=args.documents,
+            **shared_kwargs,
+        )
+        shared_kwargs.update(translator.get_shared_kwargs())
+        translators[lang_code] = translator
+
+    return translators
+
+
+def resume(args, translators: dict, journals: dict):
+    """Reuse the translations of interrupted runs, if --resume is used."""
+    for lang_code, journal in journals.items():
+        if not journal.path.exists():
+            continue
+        if args.resume:
+            replayed = journal.replay(translators[lang_code].memory)
+            print(  # noqa: T201
+                f"{lang_code}: {replayed} translations resumed from {journal.path}"
+            )
+        else:
+            print(  # noqa: T201
+                f"{lang_code}: {journal.path} found, use --resume to reuse"
+                " the translations of the interrupted run"
+            )
+
+
+def print_report(translators: dict, output_files: dict, errors: dict):
+    """Print the results of each target language."""
+    for lang_code, translator in translators.items():
+        counts = translator.counts
+        if errors.get(lang_code):
+            result = f"error: {errors[lang_code]}"
+        else:
+            result = f"saved on {output_files[lang_code]}"
+        print(  # noqa: T201
+            f"{lang_code}: {counts['translated']} translated,"
+            f" {counts['cached']} cached, {counts['failed']} failed, {result}"
+        )
+
+
+def dry_run(
+    args,
+    translators: dict,
+    input_file: str,
+    input_data: dict | list,
+    output_files: dict,
+):
+    """Print the API usage translating to each target language would take.
+
+    Nothing is sent nor saved, and the result trees are never built.
+    """
+    texts = None
+    source_estimate = None
+    totals = {"strings": 0, "characters": 0, "requests": 0, "cached": 0}
+    for lang_code, translator in translators.items():
+        if args.shard:
+            lang_texts = translator.get_values_texts(
+                *get_shard_values(
+                    args,
+                    input_file=input_file,
+                    output_file=output_files[lang_code],
+                    input_data=input_data,
+                )
+            )
+        elif args.extend:
+            diff = get_diff_to_translate(
+                input_file=input_file,
+                output_file=output_files[lang_code],
+                encoding=args.encoding,
+                input_data=input_data,
+                identity_key=args.list_key,
+                only=args.only,
+            )
+            lang_texts = translator.get_values_texts(
+                diff.get_paths(), diff.get_values()
+            )
+        else:
+            # The source strings are the same for all the locales
+            if texts is None:
+                texts = translator.get_texts(input_data)
+            lang_texts = texts
+
+        if args.extend or args.shard or len(translator.memory):
+            estimate = translator.estimate(lang_texts)
+        else:
+            # Without stored translations, every locale sends the same strings
+            source_estimate = source_estimate or translator.estimate(lang_texts)
+            estimate = source_estimate
+        for key, value in estimate.items():
+            totals[key] += value
+        print(  # noqa: T201
+            f"{lang_code} ({args.service}): {estimate['strings']} strings,"
+            f" {estimate['characters']} characters, {estimate['requests']} requests"
+            f" ({estimate['cached']} cached)"
+        )
+
+    if len(translators) > 1:
+        print(  # noqa: T201
+            f"Total ({args.service}): {totals['strings']} strings,"
+            f" {totals['characters']} characters, {totals['requests']} requests"
+            f" ({totals['cached']} cached)"
+        )
+
+
+def get_rate_limiter(args) -> RateLimiter:
+    """Build the API calls rate limiter from the command arguments."""
+    requests_per_second = args.rps
+    if requests_per_second is None and args.sleep:
+        requests_per_second = 1 / args.sleep
+
+    return RateLimiter(
+        requests_per_second=requests_per_second,
+        characters_per_second=args.cps,
+        retries=args.retries,
+    )
+
+
+def project(argv: list):
+    """Execute project command.
+
+    Every source catalog found in the project is translated to each target
+    language, skipping the ones whose source didn't change. Existing
+    translations are extended, so only the changed strings are sent.
+    """
+    parser = get_project_parser()
+    args = parser.parse_args(argv)
+    lang_codes, target_pattern = get_project_settings(parser, args)
+
+    source_files = find_catalogs(args.root, args.source_pattern, args.source_locale)
+    if not source_files and not args.watch:
+        print(  # noqa: T201
+            f"No files matching {args.source_pattern} found in {args.root}"
+        )
+        exit(1)
+
+    stats = RunStats()
+    # Translators are built per catalog, sharing the memory, the rate limiter
+    # and the service connections
+    shared_kwargs = {}
+    # Watched from before the first run, not to miss the changes made meanwhile
+    watcher = get_catalog_watcher(args) if args.watch else None
+    jobs = get_catalog_jobs(args, source_files, lang_codes, target_pattern)
+    results = translate_catalogs(
+        args, jobs, stats=stats, shared_kwargs=shared_kwargs, force=args.force
+    )
+    print_catalog_results(results)
+
+    if watcher is not None:
+        watch_project(
+            args,
+            watcher,
+            lang_codes,
+            target_pattern,
+            stats=stats,
+            shared_kwargs=shared_kwargs,
+        )
+
+    if args.stats:
+        stats.write(args.stats, memory=shared_kwargs.get("memory"))
+    if not args.watch and any(result.startswith("error") for *_, result in results):
+        exit(1)
+
+
+def watch_project(
+    args,
+    watcher: FileWatcher,
+    lang_codes: list,
+    target_pattern: str,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+):
+    """Translate the changed catalogs until interrupted, then close the memory.
+
+    :param args: command arguments
+    :param watcher: watcher of the source catalogs
+    :param lang_codes: target languages
+    :param target_pattern: path pattern of the translated catalogs
+    :param stats: run metrics
+    :param shared_kwargs: resources shared by the translators
+    """
+    print(f"Watching {args.source_pattern} in {args.root}")  # noqa: T201
+    try:
+        watch_catalogs(
+            args,
+            watcher,
+            lang_codes,
+            target_pattern,
+            stats=stats,
+            shared_kwargs=shared_kwargs,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_memory(shared_kwargs)
+
+
+def get_project_settings(parser, args) -> tuple:
+    """Validate the project command arguments.
+
+    :param parser: command parser, to report errors
+    :param args: command arguments
+    :return: target language codes and target path pattern
+    """
+    if not args.locale and not args.all_supported:
+        parser.error("the following arguments are required: locale")
+
+    target_pattern = args.target_pattern or args.source_pattern
+    error = validate_patterns(args.source_pattern, target_pattern)
+    if error:
+        parser.error(f"argument --target-pattern: {error}")
+
+    lang_codes = get_target_lang_codes(
+        args.service,
+        args.locale,
+        all_supported=args.all_supported,
+        exclude=(args.source_locale,),
     )
-    data_to_translate = get_data_to_translate(
+    return lang_codes, target_pattern
+
+
+def get_catalog_jobs(
+    args, source_files: list, lang_codes: list, target_pattern: str
+) -> list:
+    """Get the (source file, language code, target file) of each catalog to translate."""
+    return [
+        (
+            source_file,
+            lang_code,
+            get_target_path(
+                source_file,
+                root=args.root,
+                source_pattern=args.source_pattern,
+                target_pattern=target_pattern,
+                source_lang=args.source_locale,
+                target_lang=lang_code,
+            ),
+        )
+        for source_file in source_files
+        for lang_code in lang_codes
+    ]
+
+
+def translate_catalogs(
+    args,
+    jobs: list,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+    force: bool = False,
+) -> list:
+    """Translate several catalogs concurrently.
+
+    :param args: command arguments
+    :param jobs: (source file, language code, target file) of each catalog
+    :param stats: run metrics
+    :param shared_kwargs: resources shared by the translators
+    :param force: translate them even if their source didn't change
+    :return: (source file, language code, target file, result) of each catalog
+    """
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as executor:
+        futures = [
+            executor.submit(
+                translate_catalog,
+                args,
+                *job,
+                stats=stats,
+                shared_kwargs=shared_kwargs,
+                force=force,
+            )
+            for job in jobs
+        ]
+
+    results = []
+    for job, future in zip(jobs, futures):
+        if future.exception() is not None:
+            result = f"error: {future.exception()}"
+        else:
+            result = future.result()
+        results.append((*job, result))
+    return results
+
+
+def print_catalog_results(results: list):
+    """Print the result of each translated catalog."""
+    for _source_file, lang_code, target_file, result in results:
+        print(f"{lang_code}: {target_file}: {result}")  # noqa: T201
+
+
+def watch_catalogs(
+    args,
+    watcher: FileWatcher,
+    lang_codes: list,
+    target_pattern: str,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+):
+    """Translate the source catalogs of a project when they change.
+
+    Only the changed strings are sent, as the existing translations are
+    extended. Runs until the watcher is stopped.
+
+    :param args: command arguments
+    :param watcher: watcher of the source catalogs
+    :param lang_codes: target languages
+    :param target_pattern: path pattern of the translated catalogs
+    :param stats: run metrics
+    :param shared_kwargs: resources shared by the translators
+    """
+
+    def on_change(source_files: list):
+        jobs = get_catalog_jobs(args, source_files, lang_codes, target_pattern)
+        print_catalog_results(
+            translate_catalogs(args, jobs, stats=stats, shared_kwargs=shared_kwargs)
+        )
+
+    watcher.watch(on_change)
+
+
+def get_catalog_watcher(args) -> FileWatcher:
+    """Build the watcher of the source catalogs of a project."""
+    return FileWatcher(
+        lambda: find_catalogs(args.root, args.source_pattern, args.source_locale),
+        interval=args.interval,
+    )
+
+
+def serve(argv: list):
+    """Execute serve command.
+
+    A local HTTP server translates json data and the catalogs of a project on
+    request, keeping the translators, the service connections and the
+    translation memory warm between requests. With --watch, the catalogs are
+    translated when their source changes too.
+    """
+    # Imported on demand, not to slow down the startup of the other commands
+    from server import JSONServer
+
+    parser = get_serve_parser()
+    args = parser.parse_args(argv)
+    lang_codes, target_pattern = get_project_settings(parser, args)
+
+    stats = RunStats()
+    shared_kwargs = {}
+    # Built once, so the service client and its connections are ready for the
+    # first request
+    with SHARED_KWARGS_LOCK:
+        get_translators(args, lang_codes, stats=stats, shared_kwargs=shared_kwargs)
+
+    server = JSONServer(
+        get_serve_routes(
+            args, lang_codes, target_pattern, stats=stats, shared_kwargs=shared_kwargs
+        ),
+        host=args.host,
+        port=args.port,
+        token=args.token,
+    )
+
+    watcher = None
+    if args.watch:
+        watcher = get_catalog_watcher(args)
+        source_files = find_catalogs(args.root, args.source_pattern, args.source_locale)
+        jobs = get_catalog_jobs(args, source_files, lang_codes, target_pattern)
+        print_catalog_results(
+            translate_catalogs(args, jobs, stats=stats, shared_kwargs=shared_kwargs)
+        )
+        threading.Thread(
+            target=watch_catalogs,
+            args=(args, watcher, lang_codes, target_pattern),
+            kwargs={"stats": stats, "shared_kwargs": shared_kwargs},
+            daemon=True,
+        ).start()
+        print(f"Watching {args.source_pattern} in {args.root}")  # noqa: T201
+
+    print(f"Serving on {server.url} with token {server.token}")  # noqa: T201
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        server.shutdown()
+        close_memory(shared_kwargs)
+        if args.stats:
+            stats.write(args.stats, memory=shared_kwargs.get("memory"))
+
+
+def get_serve_routes(
+    args,
+    lang_codes: list,
+    target_pattern: str,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+) -> dict:
+    """Get the request handlers of the serve command.
+
+    POST /translate: translate json data, like
+        {"data": {...}, "locale": "FR", "source_locale": "EN"}
+    POST /catalogs: translate the outdated catalogs of the project, like
+        {"files": ["en/common.json"], "force": false} (all of them by default)
+    GET /stats: run metrics
+    GET /health: server status
+
+    :param args: command arguments
+    :param lang_codes: target languages of the catalogs
+    :param target_pattern: path pattern of the translated catalogs
+    :param stats: run metrics
+    :param shared_kwargs: resources shared by the translators
+    :return: handlers by (method, path)
+    """
+    from server import RequestError
+
+    def translate_data(body) -> dict:
+        if not isinstance(body, dict) or not isinstance(body.get("data"), dict | list):
+            raise RequestError("data must be a json object or array")
+        locale = body.get("locale")
+        if not isinstance(locale, str) or not is_supported_lang(args.service, locale):
+            raise RequestError(f"language {locale} is not supported by {args.service}")
+
+        request_args = copy.copy(args)
+        request_args.source_locale = body.get("source_locale", args.source_locale)
+        with SHARED_KWARGS_LOCK:
+            translator = get_translators(
+                request_args, [locale], stats=stats, shared_kwargs=shared_kwargs
+            )[locale]
+        with stats.stage("translate"):
+            data = translator.translate(data=body["data"])
+        return {"data": data, "counts": translator.counts}
+
+    def translate_project(body) -> dict:
+        if not isinstance(body, dict):
+            raise RequestError("body must be a json object")
+        source_files = find_catalogs(args.root, args.source_pattern, args.source_locale)
+        files = body.get("files")
+        if files is not None:
+            if not isinstance(files, list) or not all(
+                isinstance(f, str) for f in files
+            ):
+                raise RequestError("files must be a list of paths")
+            # Only the catalogs of the project can be requested
+            catalogs = {
+                source_file.resolve(): source_file for source_file in source_files
+            }
+            source_files = []
+            for file in files:
+                path = (Path(args.root) / file).resolve()
+                if path not in catalogs:
+                    raise RequestError(f"{file} is not a source catalog of the project")
+                source_files.append(catalogs[path])
+
+        jobs = get_catalog_jobs(args, source_files, lang_codes, target_pattern)
+        results = translate_catalogs(
+            args,
+            jobs,
+            stats=stats,
+            shared_kwargs=shared_kwargs,
+            force=bool(body.get("force")),
+        )
+        return {
+            "catalogs": [
+                {
+                    "source": str(source_file),
+                    "locale": lang_code,
+                    "target": str(target_file),
+                    "result": result,
+                }
+                for source_file, lang_code, target_file, result in results
+            ]
+        }
+
+    return {
+        ("POST", "/translate"): translate_data,
+        ("POST", "/catalogs"): translate_project,
+        ("GET", "/stats"): lambda _body: stats.to_dict(
+            memory=shared_kwargs.get("memory")
+        ),
+        ("GET", "/health"): lambda _body: {"status": "ok"},
+    }
+
+
+def close_memory(shared_kwargs: dict):
+    """Close the translation memory shared by the translators, if any was built."""
+    if "memory" in shared_kwargs:
+        shared_kwargs["memory"].close()
+
+
+def translate_catalog(
+    args,
+    source_file: Path,
+    lang_code: str,
+    target_file: Path,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+    force: bool = False,
+) -> str:
+    """Translate a catalog of a project, unless its source didn't change.
+
+    :param args: command arguments
+    :param source_file: source catalog
+    :param lang_code: target language
+    :param target_file: translated catalog
+    :param stats: run metrics
+    :param shared_kwargs: resources shared by the translators
+    :param force: translate it even if the source didn't change
+    :return: result description
+    """
+    # Catalogs are locked so a watcher and a request don't translate one twice
+    with SHARED_KWARGS_LOCK:
+        lock = CATALOG_LOCKS.setdefault(Path(target_file).resolve(), threading.Lock())
+
+    with lock:
+        return _translate_catalog(
+            args,
+            source_file,
+            lang_code,
+            Path(target_file),
+            stats=stats,
+            shared_kwargs=shared_kwargs,
+            force=force,
+        )
+
+
+def _translate_catalog(
+    args,
+    source_file: Path,
+    lang_code: str,
+    target_file: Path,
+    *,
+    stats: RunStats,
+    shared_kwargs: dict,
+    force: bool,
+) -> str:
+    if not force and is_up_to_date(source_file, target_file):
+        return "up to date"
+
+    journal = Journal(get_journal_path(target_file))
+    with SHARED_KWARGS_LOCK:
+        translator = get_translators(
+            args,
+            [lang_code],
+            stats=stats,
+            journals={lang_code: journal},
+            shared_kwargs=shared_kwargs,
+        )[lang_code]
+    if args.resume:
+        journal.replay(translator.memory)
+
+    try:
+        with stats.stage("load"):
+            input_data = load_json_file(source_file, args.encoding)
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        translate_file(
+            args,
+            translator,
+            input_file=source_file,
+            output_file=target_file,
+            input_data=input_data,
+            extend=target_file.exists(),
+            stats=stats,
+        )
+    finally:
+        journal.close()
+    journal.remove()
+
+    counts = translator.counts
+    return (
+        f"{counts['translated']} translated, {counts['cached']} cached,"
+        f" {counts['failed']} failed"
+    )
+
+
+def cache(argv: list):
+    """Execute translation memory command."""
+    parser = get_cache_parser()
+    # Options can go between the action and the files to import
+    args = parser.parse_intermixed_args(argv)
+    memory = TranslationMemory(args.cache)
+
+    if args.action == "inspect":
+        print(f"{len(memory)} translations in {memory.path}")  # noqa: T201
+        for service, source, target, entries, chars in memory.stats():
+            print(  # noqa: T201
+                f"  {service} {source or '*'} -> {target}: {entries} translations"
+                f" ({chars} characters)"
+            )
+
+    elif args.action == "prune":
+        removed = memory.prune(
+            older_than=args.older_than,
+            service=args.service,
+            target_locale=args.locale,
+        )
+        print(f"{removed} translations removed from {memory.path}")  # noqa: T201
+
+    elif args.action == "vacuum":
+        memory.vacuum()
+        print(f"{memory.path} vacuumed")  # noqa: T201
+
+    elif args.action == "import":
+        if not args.files:
+            parser.error("import requires the files to import")
+        for file in args.files:
+            imported = import_translations(args, parser, memory, Path(file))
+            print(f"{imported} translations imported from {file}")  # noqa: T201
+
+    elif args.action == "export":
+        from tmx import write_tmx
+
+        entries = memory.iter_entries(service=args.service, target_locale=args.locale)
+        if args.output == "-":
+            exported = write_tmx(sys.stdout, entries)
+        else:
+            with open_atomic(args.output, encoding="utf-8") as file:
+                exported = write_tmx(file, entries)
+        print(  # noqa: T201
+            f"{exported} translations exported from {memory.path}", file=sys.stderr
+        )
+
+    memory.close()
+
+
+def import_translations(args, parser, memory: TranslationMemory, file: Path) -> int:
+    """Seed the translation memory with a translated catalog or a TMX file.
+
+    :return: number of entries imported
+    """
+    from seed import get_catalog_pairs, make_entries, iter_tmx_entries, seed_memory
+
+    services = [args.service] if args.service else get_services()
+    # Keys are built like the translators run with the same options do
+    translators = [get_translator(service) for service in services]
+    options = {
+        "glossary": args.glossary,
+        "formality": args.formality,
+        "profanity": args.profanity,
+    }
+    if file.suffix.lower() == ".tmx":
+        entries = iter_tmx_entries(
+            file,
+            translators=translators,
+            mask_placeholders=args.mask_placeholders,
+            **options,
+        )
+    else:
+        if not args.source_locale:
+            parser.error("importing catalogs requires the source locale (-sl)")
+        source_file = (
+            Path(args.source)
+            if args.source
+            else file.with_name(f"{args.source_locale.lower()}.json")
+        )
+        if not source_file.is_file():
+            parser.error(
+                f"source catalog {source_file} not found, set it with --source"
+            )
+        if source_file.resolve() == file.resolve():
+            return 0
+        target_locale = args.locale or get_file_name_without_extension(file)
+        unsupported = [
+            service
+            for service in services
+            if not is_supported_lang(service, target_locale)
+        ]
+        if unsupported and not args.locale:
+            parser.error(
+                f"{file.name} is not named after a supported language, set it with --locale"
+            )
+        if unsupported:
+            parser.error(
+                f"Language {target_locale} is not supported by {', '.join(unsupported)}"
+            )
+        pairs = get_catalog_pairs(
+            load_json_file(source_file),
+            load_json_file(file),
+            identity_key=args.list_key,
+        )
+        entries = make_entries(
+            pairs,
+            translators=translators,
+            source_locale=args.source_locale,
+            target_locale=target_locale,
+            mask_placeholders=args.mask_placeholders,
+            **options,
+        )
+
+    return seed_memory(memory, entries)
+
+
+def merge_shards(argv: list):
+    """Execute merge-shards command."""
+    parser = get_merge_shards_parser()
+    args = parser.parse_args(argv)
+
+    outputs = {}
+    try:
+        for shard_file in args.files:
+            metadata, translations = read_shard(shard_file)
+            outputs.setdefault(metadata["output"], []).append(
+                (shard_file, metadata, translations)
+            )
+
+        for shards in outputs.values():
+            check_shards([(shard_file, metadata) for shard_file, metadata, _ in shards])
+            merge_output(args, shards)
+    except ShardError as error:
+        print(f"error: {error}")  # noqa: T201
+        exit(1)
+
+
+def merge_output(args, shards: list):
+    """Merge the shards of an output file, as a single run would have saved it.
+
+    :param args: command arguments
+    :param shards: list of (shard file, metadata, translations) tuples
+    :raise ShardError: if the source or the extended file changed since the
+        shards were translated
+    """
+    metadata = shards[0][1]
+    input_file = Path(metadata["input"])
+    output_file = Path(metadata["output"])
+    if hash_file(input_file) != metadata["source"]:
+        raise ShardError(f"{input_file} changed since its shards were translated")
+    if metadata["extend"] and hash_file(output_file) != metadata["base"]:
+        raise ShardError(f"{output_file} changed since its shards were translated")
+
+    translations = {}
+    for _shard_file, _metadata, shard_translations in shards:
+        translations.update(shard_translations)
+
+    run_args = copy.copy(args)
+    run_args.list_key = metadata["list_key"]
+    run_args.only = metadata["only"]
+    translate_file(
+        run_args,
+        ShardTranslations(translations),
         input_file=input_file,
         output_file=output_file,
-        extend=args.extend,
-        encoding=args.encoding,
-    )
-    translator = get_translator(args.service)(
-        target_locale=lang_code.upper(),
-        source_locale=args.source_locale,
-        sleep=args.sleep,
-        skip=args.skip,
-        encoding=args.encoding,
-        log_translations=args.log,
-        glossary=args.glossary,
-        formality=args.formality,
-        profanity=args.profanity,
-    )
-    results = translator.translate(
-        data=data_to_translate,
-    )
-    save_results_file(
-        data=results,
-        output_file=output_file,
-        extend=args.extend,
-        indent=args.indent,
-        encoding=args.encoding,
+        input_data=load_json_file(input_file, args.encoding),
+        extend=metadata["extend"],
+        stats=RunStats(),
+    )
+    if not args.keep:
+        for shard_file, _metadata, _translations in shards:
+            Path(shard_file).unlink()
+    print(  # noqa: T201
+        f"{metadata['locale']}: {len(shards)} shards merged on {output_file}"
     )
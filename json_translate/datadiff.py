@@ -1,39 +1,258 @@
 # -*- coding: utf-8 -*-
+from paths import get_path, set_path, delete_path
+
+# Patch operations
+ADD = "add"
+REPLACE = "replace"
+REMOVE = "remove"
+REORDER = "reorder"
+
+
 class DataDiff:
-    """DataDiff class."""
+    """DataDiff class.
+
+    Compares the existing data (initial) with the new data (minus), producing
+    a patch: a list of (operation, path, value) tuples which, applied in order
+    on the initial data, add what it's missing from the new data.
+
+    Keys of initial not in minus are kept. Lists are compared element by
+    element, by position or, for lists of dicts, by the value of identity_key.
+    """
 
-    def __init__(self, initial: dict, minus: dict):
-        """Initialize DataDiff object."""
+    def __init__(self, initial: dict, minus: dict, *, identity_key: str = None):
+        """Initialize DataDiff object.
+
+        :param initial: existing data
+        :param minus: new data
+        :param identity_key: key identifying the dicts of a list
+        """
         self.initial = initial
         self.minus = minus
-        self.diff = self._get_diff(self.initial, self.minus)
+        self.identity_key = identity_key
+        self.patch = self._get_patch(self.initial, self.minus)
+        self._replaced_paths = None
+
+    @property
+    def diff(self) -> dict | list:
+        """Get the nested data added or replaced by the patch."""
+        return self._get_legacy_diff()
 
     def to_dict(self) -> dict:
-        """Convert data difference to dict."""
+        """Convert data difference to dict.
+
+        Lists with any difference are returned as a whole.
+        """
         return self.diff
 
-    def _get_diff(self, initial, minus) -> dict | list:
-        if isinstance(initial, dict):
-            return self._get_dict_diff(initial, minus)
-        if isinstance(initial, list):
-            return self._get_list_diff(initial, minus)
+    def to_patch(self) -> list:
+        """Get the patch operations."""
+        return self.patch
+
+    def get_values(self) -> list:
+        """Get the values added or replaced by the patch."""
+        return [value for op, _path, value in self.patch if op in (ADD, REPLACE)]
+
+    def get_paths(self) -> list:
+        """Get the paths of the values added or replaced by the patch."""
+        return [path for op, path, _value in self.patch if op in (ADD, REPLACE)]
+
+    def replace(self, path: tuple, value) -> None:
+        """Add a replace operation, unless the path is already replaced."""
+        if self._replaced_paths is None:
+            self._replaced_paths = set(self.get_paths())
+        if any(path[:idx] in self._replaced_paths for idx in range(len(path) + 1)):
+            return
+        self._replaced_paths.add(path)
+        self.patch.append((REPLACE, path, value))
+
+    def select(self, predicate) -> None:
+        """Keep only the added or replaced values whose path matches a predicate.
+
+        Values added to lists are kept, so the indexes of the next ones aren't
+        shifted.
+
+        :param predicate: function receiving a path and its value
+        """
+        self.patch = [
+            (op, path, value)
+            for op, path, value in self.patch
+            if op not in (ADD, REPLACE)
+            or (op == ADD and path and isinstance(path[-1], int))
+            or predicate(path, value)
+        ]
+        self._replaced_paths = None
+
+    def remove(self, path: tuple) -> None:
+        """Add a remove operation."""
+        self.patch.append((REMOVE, path, None))
+
+    def apply(self, data, values: list = None):
+        """Apply the patch on data.
+
+        :param data: data to patch (the initial data, usually)
+        :param values: values to use instead of the added or replaced ones
+        :return: patched data
+        """
+        values = iter(values) if values is not None else None
+        for op, path, value in self.patch:
+            if op in (ADD, REPLACE):
+                if values is not None:
+                    value = next(values)
+                if not path:
+                    data = value
+                else:
+                    set_path(data, path, value)
+            elif op == REMOVE:
+                delete_path(data, path)
+            elif op == REORDER:
+                items = get_path(data, path)
+                items[:] = [items[idx] if idx is not None else None for idx in value]
+
+        return data
+
+    def _get_patch(self, initial, minus) -> list:
+        if not isinstance(initial, dict | list):
+            raise Exception("Only dict and list supported")
+
+        patch = []
+        # Pending pairs of (path, initial value, minus value) to compare
+        stack = [((), initial, minus)]
+        while stack:
+            path, initial_value, minus_value = stack.pop()
+
+            if isinstance(minus_value, dict | list):
+                block_type = dict if isinstance(minus_value, dict) else list
+                if not isinstance(initial_value, block_type):
+                    patch.append((REPLACE, path, minus_value))
+                    continue
+                get_block_patch = (
+                    self._get_dict_patch if block_type is dict else self._get_list_patch
+                )
+                stack.extend(
+                    reversed(get_block_patch(path, initial_value, minus_value, patch))
+                )
+
+            elif isinstance(initial_value, dict | list):
+                # Value was a block and now it's a single value
+                patch.append((REPLACE, path, minus_value))
+
+        return patch
+
+    def _get_dict_patch(self, path: tuple, initial: dict, minus: dict, patch: list):
+        """Compare two dicts, adding the operations to the patch.
+
+        :return: list of values to compare
+        """
+        children = []
+        for key, value in minus.items():
+            if key not in initial:
+                patch.append((ADD, (*path, key), value))
+            elif isinstance(value, dict | list) or isinstance(
+                initial[key], dict | list
+            ):
+                children.append(((*path, key), initial[key], value))
+        return children
+
+    def _get_list_patch(self, path: tuple, initial: list, minus: list, patch: list):
+        """Compare two lists, adding the operations to the patch.
+
+        :return: list of elements to compare
+        """
+        order = get_identity_order(initial, minus, self.identity_key)
+        if order is not None:
+            if order != list(range(len(initial))):
+                patch.append((REORDER, path, order))
+            initial = [initial[idx] if idx is not None else None for idx in order]
+
+        # Remove from the end so indexes aren't shifted
+        for idx in range(len(initial) - 1, len(minus) - 1, -1):
+            patch.append((REMOVE, (*path, idx), None))
+
+        children = []
+        for idx, value in enumerate(minus):
+            if idx >= len(initial) or (order is not None and order[idx] is None):
+                patch.append((ADD, (*path, idx), value))
+            elif isinstance(value, dict | list) or isinstance(
+                initial[idx], dict | list
+            ):
+                children.append(((*path, idx), initial[idx], value))
+
+        return children
+
+    def _get_legacy_diff(self) -> dict | list:
+        """Build the nested data with the values added or replaced by the patch."""
+        diff = [] if isinstance(self.minus, list) else {}
+        for path in self.get_paths():
+            # Lists are returned as a whole
+            list_idx = next(
+                (idx for idx, segment in enumerate(path) if isinstance(segment, int)),
+                len(path),
+            )
+            if list_idx == 0:
+                return self.minus
+            set_path(diff, path[:list_idx], get_path(self.minus, path[:list_idx]))
+
+        return diff
+
+
+def get_identity_order(initial: list, minus: list, identity_key: str) -> list | None:
+    """Match the elements of two lists of dicts by identity key.
+
+    :return: index in initial of each element of minus (None if not found),
+        or None if the lists can't be matched by identity
+    """
+    if identity_key is None or not all(
+        isinstance(value, dict) and identity_key in value
+        for value in (*initial, *minus)
+    ):
+        return None
+
+    positions = {}
+    for idx, value in enumerate(initial):
+        positions.setdefault(repr(value[identity_key]), idx)
+
+    return [positions.get(repr(value[identity_key])) for value in minus]
+
+
+def align(source, target, *, identity_key: str = None) -> list:
+    """Pair the values found at the same path of two documents.
 
-        raise Exception("Only dict and list supported")
+    Documents are walked like DataDiff compares them: dicts by key and lists
+    element by element, by position or by the value of identity_key.
 
-    def _get_dict_diff(self, initial: dict, minus: dict) -> dict:
-        keys1 = initial.keys()
-        items2 = minus.items()
-        missing_keys = {i[0]: i[1] for i in items2 if i[0] not in keys1}
+    :param source: source document
+    :param target: translated document
+    :param identity_key: key identifying the dicts of a list
+    :return: list of (path, source value, target value) tuples, for the
+        values which aren't a dict nor a list in both documents
+    """
+    pairs = []
+    stack = [((), source, target)]
+    while stack:
+        path, source_value, target_value = stack.pop()
 
-        for key, val in initial.items():
-            if not isinstance(val, dict | list):
-                continue
-            diff = self._get_diff(initial.get(key), minus.get(key))
-            if not diff:
-                continue
-            missing_keys[key] = diff
+        if isinstance(source_value, dict) and isinstance(target_value, dict):
+            children = [
+                ((*path, key), value, target_value[key])
+                for key, value in source_value.items()
+                if key in target_value
+            ]
+        elif isinstance(source_value, list) and isinstance(target_value, list):
+            order = get_identity_order(target_value, source_value, identity_key)
+            if order is None:
+                order = range(min(len(source_value), len(target_value)))
+            children = [
+                ((*path, idx), source_value[idx], target_value[target_idx])
+                for idx, target_idx in enumerate(order)
+                if target_idx is not None
+            ]
+        else:
+            if not isinstance(source_value, dict | list) and not isinstance(
+                target_value, dict | list
+            ):
+                pairs.append((path, source_value, target_value))
+            continue
 
-        return missing_keys
+        stack.extend(reversed(children))
 
-    def _get_list_diff(self, initial: list, minus: list) -> list:
-        return minus
+    return pairs
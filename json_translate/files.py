@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 import os
 import re
-import json
 from pathlib import Path
-from mergedeep import merge
+import jsonio
+from atomic import open_atomic
 from datadiff import DataDiff
+from keypaths import KeyPathSelector, MATCHED, DEAD
+from lockfile import read_lockfile, get_changed_paths, get_removed_paths
+from paths import get_path, merge
+from stream import iter_events, JSONStreamWriter
 
 
 def get_input_dir_from_file(file: os.PathLike) -> os.PathLike:
@@ -115,12 +119,34 @@ def get_output_file(
     return output_file
 
 
+def load_json_file(file_path: os.PathLike, encoding: str = "utf8") -> dict | list:
+    """Load json file.
+
+    :param file_path: file to load
+    :param encoding: file encoding
+    :return: file data
+    """
+    return jsonio.load(file_path, encoding)
+
+
+def iter_file_events(input_file: os.PathLike, encoding: str = "utf8"):
+    """Parse a json file incrementally.
+
+    :param input_file: file to parse
+    :param encoding: file encoding
+    :return: generator of parser events
+    """
+    with Path.open(input_file, "r", encoding=encoding) as file:
+        yield from iter_events(file)
+
+
 def get_data_to_translate(
     input_file: os.PathLike,
     *,
     output_file: os.PathLike = None,
     extend: bool = False,
     encoding: str = "utf8",
+    input_data: dict | list = None,
 ) -> dict:
     """Get data to translate.
 
@@ -128,22 +154,79 @@ def get_data_to_translate(
     :param output_file: file to save
     :param extend: if output file must be extended
     :param encoding: file encoding
+    :param input_data: input file data, if it's already loaded
+    """
+    if not extend:
+        if input_data is None:
+            input_data = load_json_file(input_file, encoding)
+        return input_data
+
+    return get_diff_to_translate(
+        input_file,
+        output_file=output_file,
+        encoding=encoding,
+        input_data=input_data,
+    ).to_dict()
+
+
+def get_diff_to_translate(
+    input_file: os.PathLike,
+    *,
+    output_file: os.PathLike = None,
+    encoding: str = "utf8",
+    input_data: dict | list = None,
+    identity_key: str = None,
+    only: list = None,
+) -> DataDiff:
+    """Get the difference to translate to extend an output file.
+
+    It includes the source strings changed since the output file was written,
+    and removes the ones not in the source anymore, if it has a lockfile.
+
+    :param input_file: file to translate
+    :param output_file: file to extend
+    :param encoding: file encoding
+    :param input_data: input file data, if it's already loaded
+    :param identity_key: key identifying the dicts of a list
+    :param only: key path patterns of the values to translate (all if not set)
     """
-    if extend and (output_file is None or not output_file.exists()):
+    if output_file is None or not output_file.exists():
         print("Existing file to extend not found")  # noqa: T201
         exit(1)
 
-    with Path.open(input_file, "r", encoding=encoding) as file:
-        input_data = json.load(file)
+    if input_data is None:
+        input_data = load_json_file(input_file, encoding)
 
-    if not extend:
-        return input_data
+    existing_data = load_json_file(output_file, encoding)
+    diff = DataDiff(existing_data, input_data, identity_key=identity_key)
+
+    lock = read_lockfile(output_file, identity_key=identity_key)
+    if lock is not None:
+        for path in get_changed_paths(lock, input_data, identity_key=identity_key):
+            diff.replace(path, get_path(input_data, path))
+        for path in get_removed_paths(lock, input_data, identity_key=identity_key):
+            diff.remove(path)
+
+    if only:
+        diff.select(get_selection_predicate(KeyPathSelector(only)))
+
+    return diff
 
-    with Path.open(output_file, "r", encoding=encoding) as file:
-        existing_data = json.load(file)
 
-    diff = DataDiff(existing_data, input_data)
-    return diff.to_dict()
+def get_selection_predicate(selector: KeyPathSelector):
+    """Get the predicate keeping the patch values a selector selects.
+
+    Blocks holding any selected value are kept, the other values they hold
+    are left as they are when translated.
+    """
+
+    def predicate(path: tuple, value) -> bool:
+        state = selector.get_state(path)
+        if isinstance(value, dict | list):
+            return state is not DEAD
+        return state is MATCHED
+
+    return predicate
 
 
 def save_results_file(
@@ -153,23 +236,51 @@ def save_results_file(
     extend: bool = False,
     indent: int = 2,
     encoding: str = "utf8",
+    patch: DataDiff = None,
 ) -> None:
     """Write output file.
 
-    :param data: dict object to dump into file
+    :param data: dict object to dump into file, or the translated patch
+        values if a patch is provided
     :param output_file: output file path
     :param extend: if output file must be extended
     :param indent: json indentation
     :param encoding: file encoding
+    :param patch: difference to apply on the extended file, which holds its
+        already loaded data
     """
     if extend:
         if output_file is None or not output_file.exists():
             raise Exception("Existing file to extend not found")
 
-        with Path.open(output_file, "r", encoding=encoding) as file:
-            data = merge(json.load(file), data)
+        if patch is not None:
+            data = patch.apply(patch.initial, data)
+        else:
+            data = merge(load_json_file(output_file, encoding), data)
+
+    with open_atomic(output_file, encoding=encoding) as file:
+        jsonio.dump(data, file, indent=indent)
+
+    print(f"Results saved on {output_file}")  # noqa: T201
+
+
+def save_results_stream(
+    events,
+    output_file: os.PathLike,
+    *,
+    indent: int = 2,
+    encoding: str = "utf8",
+) -> None:
+    """Write output file incrementally.
 
-    with Path.open(output_file, "w", encoding=encoding) as file:
-        json.dump(data, file, indent=indent, ensure_ascii=False)
+    :param events: generator of parser events to write
+    :param output_file: output file path
+    :param indent: json indentation
+    :param encoding: file encoding
+    """
+    with open_atomic(output_file, encoding=encoding) as file:
+        writer = JSONStreamWriter(file, indent=indent)
+        for event, value in events:
+            writer.write(event, value)
 
     print(f"Results saved on {output_file}")  # noqa: T201
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import threading
+from pathlib import Path
+
+# Translations kept in memory before writing them to the journal
+FLUSH_SIZE = 100
+
+
+def get_journal_path(output_file: os.PathLike) -> Path:
+    """Get the journal path of an output file (fr.json -> fr.json.journal)."""
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.name}.journal")
+
+
+class Journal:
+    """Append-only log of the translations completed while translating a file.
+
+    Each line is a json list with a translation memory key and its
+    translation, so if a run is interrupted, the translations already paid
+    for can be replayed into the memory of the next one.
+    """
+
+    def __init__(self, path: os.PathLike, *, flush_size: int = FLUSH_SIZE):
+        """Initialize journal.
+
+        :param path: journal file path
+        :param flush_size: translations to buffer before writing them
+        """
+        self.path = Path(path)
+        self.flush_size = flush_size
+        self._buffer = []
+        self._file = None
+        self._lock = threading.Lock()
+
+    def append(self, items: list) -> None:
+        """Add translations to the journal.
+
+        :param items: list of (key, translation) tuples
+        """
+        with self._lock:
+            self._buffer.extend(items)
+            if len(self._buffer) >= self.flush_size:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write the buffered translations to disk."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = Path.open(self.path, "a", encoding="utf-8")
+        self._file.write(
+            "".join(
+                json.dumps([*key, translation], ensure_ascii=False) + "\n"
+                for key, translation in self._buffer
+            )
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer = []
+
+    def replay(self, memory) -> int:
+        """Store the journal translations in a translation memory.
+
+        :param memory: translation memory
+        :return: number of translations replayed
+        """
+        if not self.path.exists():
+            return 0
+
+        items = []
+        with Path.open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    *key, translation = json.loads(line)
+                except (ValueError, TypeError):
+                    # Last line of an interrupted write
+                    continue
+                items.append((tuple(key), translation))
+
+        memory.set_many(items)
+        return len(items)
+
+    def close(self) -> None:
+        """Flush and close the journal file."""
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Discard the journal, once its translations are saved."""
+        with self._lock:
+            self._buffer = []
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path.unlink(missing_ok=True)
+
+    def __repr__(self):
+        """Repr the journal."""
+        return f"{self.__class__.__name__}({self.path})"
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Catalogs are parsed and written with orjson when it's installed, falling back
+# to the standard json module whenever the results could differ, so the
+# output is the same byte by byte whatever the backend.
+import os
+import json
+from pathlib import Path
+from settings import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Integers beyond 64 bits are parsed as floats by orjson
+MAX_INTEGER = 2**63
+
+# Float representations orjson writes differently (exponents, NaN, Infinity)
+NON_PORTABLE_FLOAT_CHARS = frozenset("eni")
+
+
+def get_backend() -> str:
+    """Get the name of the json backend in use."""
+    if orjson is not None and JSON_BACKEND in ("auto", "orjson"):
+        return "orjson"
+    return "json"
+
+
+def loads(text: str):
+    """Parse a json document."""
+    if get_backend() == "orjson":
+        try:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Documents orjson rejects but json accepts (NaN, lone
+            # surrogates...) or invalid ones, to raise the usual error
+            pass
+        else:
+            if not has_float(data, lambda value: abs(value) >= MAX_INTEGER):
+                return data
+    return json.loads(text)
+
+
+def dumps(data, *, indent: int = 2) -> str:
+    """Serialize data as json.
+
+    The output is the same json.dumps writes with ensure_ascii=False.
+
+    :param data: data to serialize
+    :param indent: indentation spaces (None for a single line)
+    :return: json document
+    """
+    if (
+        get_backend() == "orjson"
+        and indent == 2
+        and not has_float(data, is_non_portable)
+    ):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONEncodeError:
+            # Data orjson can't serialize (big integers, non str keys...)
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False)
+
+
+def load(file_path: os.PathLike, encoding: str = "utf8"):
+    """Load a json file.
+
+    :param file_path: file to load
+    :param encoding: file encoding
+    :return: file data
+    """
+    with Path.open(file_path, "r", encoding=encoding) as file:
+        return loads(file.read())
+
+
+def dump(data, file, *, indent: int = 2) -> None:
+    """Write data as json to an open text file.
+
+    :param data: data to serialize
+    :param file: file to write
+    :param indent: indentation spaces (None for a single line)
+    """
+    file.write(dumps(data, indent=indent))
+
+
+def has_float(data, predicate) -> bool:
+    """Check if any float of nested data matches a predicate.
+
+    :param data: nested data
+    :param predicate: function receiving a float
+    """
+    if not isinstance(data, dict | list | tuple):
+        # Scalar documents (null, true, 3...)
+        return type(data) is float and predicate(data)
+
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        children = value.values() if isinstance(value, dict) else value
+        # Most values are strings, so the types are checked at once
+        types = set(map(type, children))
+        if float in types and any(
+            type(child) is float and predicate(child) for child in children
+        ):
+            return True
+        if not types.isdisjoint((dict, list, tuple)):
+            stack.extend(
+                child for child in children if isinstance(child, dict | list | tuple)
+            )
+    return False
+
+
+def is_non_portable(value: float) -> bool:
+    """Check if orjson writes a float differently than json."""
+    return not NON_PORTABLE_FLOAT_CHARS.isdisjoint(repr(value))
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+# Key path patterns select values of a document by their path, with the keys
+# (and list indexes) separated by dots:
+#
+#   title              key at any depth (like "**.title")
+#   meta.*.id          "id" of any child of the root "meta" key
+#   pages.**.alt       "alt" at any depth under the root "pages" key
+#   items.0.name       "name" of the first element of the root "items" list
+#   labels./^btn_\d+$/ keys of "labels" matching a regular expression
+#
+# Segments accept glob wildcards ("*", "?", "[abc]"), "**" matches any number
+# of segments, and "\." is a dot inside a key. Patterns are compiled into a
+# trie, walked as an automaton whose states are built on demand and cached,
+# so matching a key costs a dict lookup whatever the number of patterns.
+import re
+import fnmatch
+import threading
+
+DOUBLE_STAR = "**"
+
+# Automaton state of the paths matched by a pattern (and everything under them)
+MATCHED = "matched"
+
+# Automaton state of the paths no pattern can match
+DEAD = frozenset()
+
+SEGMENT_RE = re.compile(r"(?:\\.|[^.])+")
+
+
+class _Node:
+    """Trie node: the pattern segments following a prefix."""
+
+    __slots__ = ("literals", "patterns", "double_star", "is_double_star", "terminal")
+
+    def __init__(self, is_double_star: bool = False):
+        self.literals = {}
+        self.patterns = {}
+        self.double_star = None
+        self.is_double_star = is_double_star
+        self.terminal = False
+
+
+def split_pattern(pattern: str) -> list:
+    """Split a key path pattern in segments.
+
+    Patterns of a single segment match at any depth, so "**" is prepended.
+    """
+    segments = SEGMENT_RE.findall(pattern)
+    if len(segments) == 1 and segments[0] != DOUBLE_STAR:
+        segments.insert(0, DOUBLE_STAR)
+    return segments
+
+
+def compile_segment(segment: str) -> re.Pattern | str:
+    """Compile a pattern segment.
+
+    :return: the key, if the segment has no wildcards, or a regex
+    """
+    if len(segment) > 1 and segment.startswith("/") and segment.endswith("/"):
+        return re.compile(segment[1:-1])
+    key = segment.replace("\\.", ".")
+    if not any(char in key for char in "*?["):
+        return key
+    return re.compile(fnmatch.translate(key))
+
+
+def is_index(segment: str) -> bool:
+    """Check if a segment is the key of a list index."""
+    return segment.isdigit() and str(int(segment)) == segment
+
+
+class KeyPathSelector:
+    """Matcher of key paths against a list of patterns."""
+
+    def __init__(self, patterns: list = None):
+        """Compile the patterns.
+
+        :param patterns: key path patterns
+        """
+        self.patterns = list(patterns or [])
+        self._nodes = [_Node()]
+        for pattern in self.patterns:
+            self._add_pattern(pattern)
+        self._states = {}
+        self._transitions = {}
+        self.start = self._get_state({0})
+
+    def step(self, state, key):
+        """Get the state after a key (or list index) of a path.
+
+        Paths under a matched one are matched too.
+
+        :param state: state of the parent path
+        :param key: dict key or list index
+        :return: state of the path
+        """
+        if state is MATCHED or state is DEAD:
+            return state
+
+        literals, has_patterns, default = self.get_transitions(state)
+        next_state = literals.get(key)
+        if next_state is None:
+            if not has_patterns:
+                return default
+            # Keys matched against regexes are cached one by one
+            next_state = literals[key] = self._step(state, key)
+        return next_state
+
+    def get_transitions(self, state) -> tuple:
+        """Get the transitions of a state.
+
+        :return: next state by literal key (and list index), if any key may
+            match a regex, and the next state of the other keys
+        """
+        if state is MATCHED or state is DEAD:
+            return {}, False, state
+
+        transitions = self._transitions.get(state)
+        if transitions is None:
+            transitions = self._transitions[state] = self._get_transitions(state)
+        return transitions
+
+    def get_state(self, path: tuple, state=None):
+        """Get the state after a path.
+
+        :param path: keys and list indexes
+        :param state: state to start from (the root one by default)
+        """
+        state = self.start if state is None else state
+        for key in path:
+            state = self.step(state, key)
+        return state
+
+    def matches(self, path: tuple) -> bool:
+        """Check if a path, or any of its parents, matches a pattern."""
+        return self.get_state(path) is MATCHED
+
+    def _add_pattern(self, pattern: str) -> None:
+        node = self._nodes[0]
+        for segment in split_pattern(pattern):
+            if segment == DOUBLE_STAR:
+                if node.double_star is None:
+                    node.double_star = self._add_node(is_double_star=True)
+                node = self._nodes[node.double_star]
+                continue
+
+            compiled = compile_segment(segment)
+            children = node.literals if isinstance(compiled, str) else node.patterns
+            if compiled not in children:
+                children[compiled] = self._add_node()
+            node = self._nodes[children[compiled]]
+        node.terminal = True
+
+    def _add_node(self, *, is_double_star: bool = False) -> int:
+        self._nodes.append(_Node(is_double_star))
+        return len(self._nodes) - 1
+
+    def _get_state(self, node_ids: set):
+        """Build the state of a set of nodes, following the "**" ones."""
+        pending = list(node_ids)
+        while pending:
+            node = self._nodes[pending.pop()]
+            if node.double_star is not None and node.double_star not in node_ids:
+                node_ids.add(node.double_star)
+                pending.append(node.double_star)
+
+        if not node_ids:
+            return DEAD
+        if any(self._nodes[node_id].terminal for node_id in node_ids):
+            return MATCHED
+        # States are shared, so they're found in the caches by identity
+        state = frozenset(node_ids)
+        return self._states.setdefault(state, state)
+
+    def _get_transitions(self, state: frozenset) -> tuple:
+        """Build the transitions of a state.
+
+        :return: next state by literal key, if any node has regex segments, and
+            the next state of the other keys
+        """
+        nodes = [self._nodes[node_id] for node_id in state]
+        literals = {}
+        for node in nodes:
+            for segment in node.literals:
+                literals[segment] = self._step(state, segment)
+                if is_index(segment):
+                    literals[int(segment)] = literals[segment]
+        has_patterns = any(node.patterns for node in nodes)
+        default = self._get_state(
+            {node_id for node_id, node in zip(state, nodes) if node.is_double_star}
+        )
+        return literals, has_patterns, default
+
+    def _step(self, state: frozenset, key):
+        segment = key if isinstance(key, str) else str(key)
+        node_ids = set()
+        for node_id in state:
+            node = self._nodes[node_id]
+            if node.is_double_star:
+                node_ids.add(node_id)
+            if segment in node.literals:
+                node_ids.add(node.literals[segment])
+            for regex, child_id in node.patterns.items():
+                if regex.fullmatch(segment):
+                    node_ids.add(child_id)
+        return self._get_state(node_ids)
+
+    def __bool__(self):
+        """Check if there is any pattern."""
+        return bool(self.patterns)
+
+    def __repr__(self):
+        """Repr the patterns."""
+        return f"{self.__class__.__name__}({self.patterns})"
+
+
+class KeyPathFilter:
+    """Selection of the values to translate.
+
+    Values are selected if they match any of the `only` patterns (every value
+    if there are none) and none of the `skip` ones. The states of both
+    selectors are combined in a single automaton, with int states, so a walk
+    steps once per key.
+    """
+
+    def __init__(self, *, skip: list = None, only: list = None):
+        """Compile the patterns.
+
+        :param skip: key path patterns of the values to leave out
+        :param only: key path patterns of the values to translate
+        """
+        self.skip = KeyPathSelector(skip)
+        self.only = KeyPathSelector(only) if only else None
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._states = []
+        self._transitions = []
+        # Flags of each state, by state id
+        self.selected = bytearray()
+        self.excluded = bytearray()
+        self.start = self._get_id(
+            (self.skip.start, self.only.start if self.only else MATCHED)
+        )
+
+    def step(self, state: int, key) -> int:
+        """Get the state after a key (or list index) of a path."""
+        transitions = self._transitions[state]
+        if transitions is None:
+            transitions = self._get_transitions(state)
+        literals, has_patterns, default = transitions
+
+        next_state = literals.get(key)
+        if next_state is None:
+            if not has_patterns:
+                return default
+            next_state = literals[key] = self._step(state, key)
+        return next_state
+
+    def get_state(self, path: tuple, state: int = None) -> int:
+        """Get the state after a path."""
+        state = self.start if state is None else state
+        for key in path:
+            state = self.step(state, key)
+        return state
+
+    def is_selected(self, state: int) -> bool:
+        """Check if the values of a state must be translated."""
+        return bool(self.selected[state])
+
+    def is_excluded(self, state: int) -> bool:
+        """Check if no value under a state can be translated."""
+        return bool(self.excluded[state])
+
+    def _get_id(self, states: tuple) -> int:
+        state_id = self._ids.get(states)
+        if state_id is not None:
+            return state_id
+
+        with self._lock:
+            if states not in self._ids:
+                skip_state, only_state = states
+                self._states.append(states)
+                self._transitions.append(None)
+                self.selected.append(
+                    skip_state is not MATCHED and only_state is MATCHED
+                )
+                self.excluded.append(skip_state is MATCHED or only_state is DEAD)
+                self._ids[states] = len(self._states) - 1
+        return self._ids[states]
+
+    def _get_transitions(self, state: int) -> tuple:
+        skip_state, only_state = self._states[state]
+        skip_literals, skip_patterns, skip_default = self.skip.get_transitions(
+            skip_state
+        )
+        if self.only is None:
+            only_literals, only_patterns, only_default = {}, False, MATCHED
+        else:
+            only_literals, only_patterns, only_default = self.only.get_transitions(
+                only_state
+            )
+
+        literals = {
+            key: self._step(state, key) for key in (*skip_literals, *only_literals)
+        }
+        transitions = (
+            literals,
+            skip_patterns or only_patterns,
+            self._get_id((skip_default, only_default)),
+        )
+        self._transitions[state] = transitions
+        return transitions
+
+    def _step(self, state: int, key) -> int:
+        skip_state, only_state = self._states[state]
+        return self._get_id(
+            (
+                self.skip.step(skip_state, key),
+                self.only.step(only_state, key) if self.only else MATCHED,
+            )
+        )
+
+    def __bool__(self):
+        """Check if any value can be left out."""
+        return bool(self.skip) or self.only is not None
@@ -33,3 +33,53 @@ def get_target_lang_code(service: str, locale: str) -> str:
         exit(1)
 
     return lang_code
+
+
+def get_supported_langs(service: str) -> tuple:
+    """Get language codes supported by a service.
+
+    :param service: translation service to use
+    :return: supported language codes
+    """
+    if service == "aws":
+        return AWS_SUPPORTED_LANGS
+
+    return DEEPL_SUPPORTED_LANGS
+
+
+def is_supported_lang(service: str, lang_code: str) -> bool:
+    """Check if a language code is supported by a service (case insensitively)."""
+    return lang_code.lower() in {code.lower() for code in get_supported_langs(service)}
+
+
+def get_target_lang_codes(
+    service: str,
+    locales: str,
+    *,
+    all_supported: bool = False,
+    exclude: tuple = (),
+) -> list:
+    """Get language codes from a comma separated input.
+
+    :param service: translation service to use
+    :param locales: comma separated locales target to use
+    :param all_supported: use all the languages supported by the service
+    :param exclude: language codes to leave out (like the source one)
+    :return: output locale codes
+    """
+    excluded = {code.lower() for code in exclude if code}
+
+    if all_supported:
+        return [
+            code
+            for code in get_supported_langs(service)
+            if code.lower() not in excluded
+        ]
+
+    lang_codes = []
+    for locale in (locales or "").split(","):
+        lang_code = get_target_lang_code(service, locale.strip())
+        if lang_code not in lang_codes:
+            lang_codes.append(lang_code)
+
+    return lang_codes
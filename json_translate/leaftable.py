@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+from array import array
+from itertools import islice
+from keypaths import KeyPathFilter
+
+# Node kinds
+DICT = 0
+LIST = 1
+STRING = 2
+SCALAR = 3
+
+
+class LeafTable:
+    """Flattened representation of nested data.
+
+    Each node (container or value) is a row of parallel arrays, in document
+    order, so parents always come before their children. Every operation is
+    a linear pass over the rows, without recursion, whatever the nesting.
+
+    Data is walked recursively otherwise, which is faster and takes less
+    memory, so the table is only used for data nested past the recursion limit.
+    """
+
+    __slots__ = ("parents", "keys", "kinds", "values")
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.parents = array("i")
+        self.keys = []
+        self.kinds = bytearray()
+        self.values = []
+
+    @classmethod
+    def from_data(cls, data) -> "LeafTable":
+        """Flatten nested data.
+
+        :param data: nested data (dicts with string keys, lists, strings, numbers,
+            booleans, nulls)
+        :return: table
+        """
+        table = cls()
+        add_parent = table.parents.append
+        add_key = table.keys.append
+        add_kind = table.kinds.append
+        add_value = table.values.append
+        kinds = table.kinds
+        share_key = {}.setdefault
+
+        # Open containers, with their row and the iterator of their items, so
+        # only containers are pushed and leaves are added as they're found
+        stack = [(-1, iter(((None, data),)))]
+        push = stack.append
+        while stack:
+            parent, items = stack[-1]
+            for key, value in items:
+                add_parent(parent)
+                add_key(key)
+                if isinstance(value, str):
+                    add_kind(STRING)
+                    add_value(value)
+                elif isinstance(value, dict):
+                    # Keys repeated in every object of a list are stored once
+                    push(
+                        (len(kinds), zip(map(share_key, value, value), value.values()))
+                    )
+                    add_kind(DICT)
+                    add_value(None)
+                    break
+                elif isinstance(value, list):
+                    push((len(kinds), enumerate(value)))
+                    add_kind(LIST)
+                    add_value(None)
+                    break
+                elif value is None or isinstance(value, bool | int | float):
+                    add_kind(SCALAR)
+                    add_value(value)
+                else:
+                    raise Exception(f"Can't determine {value} type")
+            else:
+                stack.pop()
+
+        return table
+
+    def to_data(self, values: list = None):
+        """Rebuild nested data.
+
+        :param values: values to use instead of the table ones
+        :return: nested data
+        """
+        if not self.kinds:
+            return None
+
+        values = self.values if values is None else values
+        nodes = [
+            value if kind > LIST else {} if kind == DICT else []
+            for kind, value in zip(self.kinds, values)
+        ]
+
+        # Rows are in document order, so children are added in their order
+        children = zip(
+            islice(self.parents, 1, None),
+            islice(self.keys, 1, None),
+            islice(nodes, 1, None),
+        )
+        for parent, key, node in children:
+            container = nodes[parent]
+            if type(container) is dict:
+                container[key] = node
+            else:
+                container.append(node)
+
+        return nodes[0]
+
+    def get_path(self, idx: int) -> tuple:
+        """Get the path of a node."""
+        path = []
+        while self.parents[idx] >= 0:
+            path.append(self.keys[idx])
+            idx = self.parents[idx]
+        return tuple(reversed(path))
+
+    def get_pointers(self) -> list:
+        """Get the JSON Pointer of every node, in a single pass."""
+        pointers = [""] * len(self.kinds)
+        for idx, parent in enumerate(self.parents):
+            if parent >= 0:
+                key = str(self.keys[idx]).replace("~", "~0").replace("/", "~1")
+                pointers[idx] = f"{pointers[parent]}/{key}"
+        return pointers
+
+    def get_strings(self) -> array:
+        """Get the indexes of the string values.
+
+        They're stored as machine ints, as there's one per string of the data.
+        """
+        return array(
+            "i", [idx for idx, kind in enumerate(self.kinds) if kind == STRING]
+        )
+
+    def get_selected(
+        self, key_filter: KeyPathFilter, child_states: list = None
+    ) -> bytearray:
+        """Mark the nodes selected by a key path filter, in a single pass.
+
+        Nodes under excluded ones are not matched at all.
+
+        :param key_filter: key path filter
+        :param child_states: filter state of each child of the root, by index,
+            if the root is a list of values located somewhere else
+        :return: 1 for each selected node, 0 otherwise
+        """
+        keys = self.keys
+        step = key_filter.step
+        is_selected = key_filter.selected
+        is_excluded = key_filter.excluded
+        states = [None] * len(self.kinds)
+        selected = bytearray(len(self.kinds))
+        for idx, parent in enumerate(self.parents):
+            if parent < 0:
+                state = key_filter.start
+            elif parent == 0 and child_states is not None:
+                state = child_states[keys[idx]]
+            else:
+                state = states[parent]
+                if state is None:
+                    continue
+                state = step(state, keys[idx])
+
+            if is_excluded[state]:
+                continue
+            states[idx] = state
+            selected[idx] = is_selected[state]
+
+        return selected
+
+    def get_skipped(self, skip_keys) -> bytearray:
+        """Mark the nodes matching, or under, any of the key paths to skip.
+
+        :param skip_keys: key path patterns to skip
+        :return: 1 for each skipped node, 0 otherwise
+        """
+        selected = self.get_selected(KeyPathFilter(skip=skip_keys))
+        return selected.translate(bytes([1, 0]) + bytes(254))
+
+    def __len__(self):
+        """Get number of nodes."""
+        return len(self.kinds)
+
+    def __repr__(self):
+        """Repr the table."""
+        return f"{self.__class__.__name__}({len(self)} nodes)"
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import hashlib
+from pathlib import Path
+import jsonio
+from atomic import open_atomic
+from keypaths import KeyPathFilter
+from paths import to_pointer
+
+LOCKFILE_VERSION = 1
+
+
+def get_lockfile_path(output_file: os.PathLike) -> Path:
+    """Get the lockfile path of an output file (fr.json -> fr.json.lock)."""
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.name}.lock")
+
+
+def hash_text(text: str) -> str:
+    """Get the content hash of a source text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def hash_file(path: os.PathLike) -> str:
+    """Get the content hash of a source file."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def get_source_hashes(source_data, *, identity_key: str = None) -> dict:
+    """Get the content hash of each source string.
+
+    :param source_data: source file data
+    :param identity_key: key identifying the dicts of a list
+    :return: hashes by JSON Pointer
+    """
+    return {
+        pointer: hash_text(text)
+        for pointer, _path, text in iter_source_strings(source_data, identity_key)
+    }
+
+
+def iter_source_strings(source_data, identity_key: str = None):
+    """Walk the strings of the source data, in document order.
+
+    The dicts of a list matched by identity key are pointed to by their
+    identity (like "/items/id=3/text"), not by their position, so adding,
+    moving or removing one doesn't change the pointers of the others.
+
+    :param source_data: source file data
+    :param identity_key: key identifying the dicts of a list
+    :return: generator of (JSON Pointer, path, string) tuples
+    """
+    stack = [("", (), source_data)]
+    while stack:
+        pointer, path, value = stack.pop()
+        if isinstance(value, dict):
+            segments = value
+            children = value.values()
+        elif isinstance(value, list):
+            segments = get_list_segments(value, identity_key)
+            children = value
+        else:
+            if isinstance(value, str):
+                yield pointer, path, value
+            continue
+
+        stack.extend(
+            reversed(
+                [
+                    (f"{pointer}/{escape_segment(segment)}", (*path, key), child)
+                    for key, segment, child in zip(
+                        range(len(value)) if isinstance(value, list) else value,
+                        segments,
+                        children,
+                    )
+                ]
+            )
+        )
+
+
+def get_list_segments(values: list, identity_key: str = None) -> list:
+    """Get the pointer segment of each element of a list.
+
+    Lists of dicts with a distinct identity key are pointed to by identity,
+    the other ones by position, like DataDiff matches them.
+    """
+    if identity_key is not None and all(
+        isinstance(value, dict) and identity_key in value for value in values
+    ):
+        segments = [
+            f"{identity_key}={json.dumps(value[identity_key], sort_keys=True)}"
+            for value in values
+        ]
+        if len(set(segments)) == len(segments):
+            return segments
+    return [str(idx) for idx in range(len(values))]
+
+
+def escape_segment(segment) -> str:
+    """Escape a JSON Pointer segment."""
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_segment(segment: str) -> str:
+    """Unescape a JSON Pointer segment."""
+    return segment.replace("~1", "/").replace("~0", "~")
+
+
+def read_lockfile(output_file: os.PathLike, *, identity_key: str = None) -> dict | None:
+    """Read the source hashes used to translate an output file.
+
+    Lockfiles written with another identity key are ignored, as their list
+    elements aren't pointed to the same way.
+
+    :param output_file: output file path
+    :param identity_key: key identifying the dicts of a list
+    :return: hashes by JSON Pointer, or None if there is no lockfile
+    """
+    lockfile_path = get_lockfile_path(output_file)
+    if not lockfile_path.exists():
+        return None
+
+    lock = jsonio.load(lockfile_path, "utf-8")
+    if lock.get("version") != LOCKFILE_VERSION:
+        return None
+    if lock.get("list_key") != identity_key:
+        return None
+
+    return lock["keys"]
+
+
+def read_lockfile_source(output_file: os.PathLike) -> str | None:
+    """Read the hash of the whole source file used to translate an output file.
+
+    :param output_file: output file path
+    :return: source file hash, or None if there is no lockfile or it wasn't stored
+    """
+    lockfile_path = get_lockfile_path(output_file)
+    if not lockfile_path.exists():
+        return None
+
+    lock = jsonio.load(lockfile_path, "utf-8")
+    if lock.get("version") != LOCKFILE_VERSION:
+        return None
+
+    return lock.get("source")
+
+
+def write_lockfile(
+    output_file: os.PathLike,
+    source_data,
+    *,
+    source_file: os.PathLike = None,
+    only: list = None,
+    identity_key: str = None,
+) -> None:
+    """Write the source hashes used to translate an output file.
+
+    If only some values were translated, the others keep the hashes they had,
+    or an empty one, so they are translated by the next run extending the file.
+
+    :param output_file: output file path
+    :param source_data: source file data
+    :param source_file: source file path, to store the hash of the whole file
+    :param only: key path patterns of the values translated (all if not set)
+    :param identity_key: key identifying the dicts of a list
+    """
+    hashes = {}
+    previous = (
+        (read_lockfile(output_file, identity_key=identity_key) or {}) if only else {}
+    )
+    key_filter = KeyPathFilter(only=only)
+    for pointer, path, text in iter_source_strings(source_data, identity_key):
+        if not only or key_filter.is_selected(key_filter.get_state(path)):
+            hashes[pointer] = hash_text(text)
+        else:
+            hashes[pointer] = previous.get(pointer, "")
+
+    lock = {"version": LOCKFILE_VERSION, "keys": hashes}
+    if identity_key is not None:
+        lock["list_key"] = identity_key
+    # The source file is only up to date if all its values were translated
+    if source_file is not None and not only:
+        lock["source"] = hash_file(source_file)
+    with open_atomic(get_lockfile_path(output_file), encoding="utf-8") as file:
+        json.dump(lock, file, indent=0, sort_keys=True)
+
+
+def get_changed_paths(lock: dict, source_data, *, identity_key: str = None) -> list:
+    """Get the paths of the source strings changed since the lockfile was written.
+
+    :param lock: hashes by JSON Pointer
+    :param source_data: source file data
+    :param identity_key: key identifying the dicts of a list
+    :return: changed paths
+    """
+    changed = []
+    for pointer, path, text in iter_source_strings(source_data, identity_key):
+        text_hash = hash_text(text)
+        if lock.get(pointer, text_hash) != text_hash:
+            changed.append(path)
+    return changed
+
+
+def get_removed_paths(lock: dict, source_data, *, identity_key: str = None) -> list:
+    """Get the paths removed from the source since the lockfile was written.
+
+    If a whole block was removed, the path of the block is returned. The
+    dicts of a list matched by identity are left out, as the diff already
+    drops the ones removed.
+
+    :param lock: hashes by JSON Pointer
+    :param source_data: source file data
+    :param identity_key: key identifying the dicts of a list
+    :return: removed paths
+    """
+    removed = set()
+    list_segments = {}
+    for pointer in lock:
+        path = []
+        value = source_data
+        for segment in map(unescape_segment, pointer.split("/")[1:]):
+            if isinstance(value, list):
+                segments = list_segments.get(id(value))
+                if segments is None:
+                    segments = list_segments[id(value)] = {
+                        segment: idx
+                        for idx, segment in enumerate(
+                            get_list_segments(value, identity_key)
+                        )
+                    }
+                if segment not in segments:
+                    if segment.isdigit():
+                        removed.add((*path, int(segment)))
+                    break
+                path.append(segments[segment])
+                value = value[segments[segment]]
+            elif isinstance(value, dict) and segment in value:
+                path.append(segment)
+                value = value[segment]
+            else:
+                removed.add((*path, segment))
+                break
+
+    return sorted(removed, key=to_pointer)
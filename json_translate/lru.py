@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from collections import OrderedDict
+
+# Memory taken by an entry besides its key and value (dict slot, list node...)
+ENTRY_OVERHEAD = 100
+
+
+def get_entry_size(key: tuple, value: str) -> int:
+    """Estimate the memory taken by a translation entry.
+
+    Only the source text is measured from the key, as the other parts
+    (service, locales, options) are shared by all the entries of a run.
+    """
+    return sys.getsizeof(key[-1]) + sys.getsizeof(value) + ENTRY_OVERHEAD
+
+
+class LRUCache:
+    """Thread-safe mapping bounded by a size budget.
+
+    The least recently used entries are evicted when the total size of the
+    entries exceeds the budget.
+    """
+
+    def __init__(self, max_size: int, *, get_size=get_entry_size):
+        """Initialize an empty cache.
+
+        :param max_size: budget, in bytes (nothing is kept if 0)
+        :param get_size: function measuring the size of a key and its value
+        """
+        self.max_size = max_size
+        self.get_size = get_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get the value of a key, marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value) -> None:
+        """Store the value of a key, evicting the least recently used entries."""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: list) -> None:
+        """Store several values at once.
+
+        :param items: list of (key, value) tuples
+        """
+        with self._lock:
+            for key, value in items:
+                size = self.get_size(key, value)
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.size -= previous[1]
+                if size > self.max_size:
+                    continue
+                self._entries[key] = (value, size)
+                self.size += size
+
+            while self.size > self.max_size:
+                _key, (_value, size) = self._entries.popitem(last=False)
+                self.size -= size
+                self.evictions += 1
+
+    def update(self, items: list) -> None:
+        """Replace the values of the keys already cached.
+
+        :param items: list of (key, value) tuples, the ones not cached are ignored
+        """
+        with self._lock:
+            cached = [(key, value) for key, value in items if key in self._entries]
+        if cached:
+            self.set_many(cached)
+
+    def discard(self, keys) -> int:
+        """Remove several keys.
+
+        :param keys: keys to remove, the ones not cached are ignored
+        :return: number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.size -= entry[1]
+                    removed += 1
+        return removed
+
+    def items(self) -> list:
+        """Get a snapshot of the entries, from the least recently used.
+
+        :return: list of (key, value) tuples
+        """
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def get_counters(self) -> dict:
+        """Get the usage counters of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, key) -> bool:
+        """Check if a key is cached, without marking it as used."""
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        """Get number of entries."""
+        with self._lock:
+            return len(self._entries)
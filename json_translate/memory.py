@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+import time
+import sqlite3
+import threading
+from lru import LRUCache
+from settings import MEMORY_CACHE_SIZE
+
+IN_MEMORY = ":memory:"
+
+KEY_COLUMNS = (
+    "service",
+    "source_locale",
+    "target_locale",
+    "glossary",
+    "formality",
+    "profanity",
+    "source",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    service TEXT NOT NULL,
+    source_locale TEXT NOT NULL,
+    target_locale TEXT NOT NULL,
+    glossary TEXT NOT NULL,
+    formality TEXT NOT NULL,
+    profanity TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (
+        service, source_locale, target_locale, glossary, formality, profanity, source
+    )
+)
+"""
+
+
+class TranslationMemory:
+    """Translations cache persisted in a SQLite database.
+
+    Entries are keyed on a tuple with the values of KEY_COLUMNS, so the same
+    text translated with other service, locales or options is stored apart.
+    The entries looked up are kept in a bounded in-process cache, so
+    repeated lookups don't query the database. Without a database file, the
+    in-process cache is the only store, so memory use stays bounded and the
+    least recently used translations are dropped.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        *,
+        timeout: float = 30,
+        cache_size: int = MEMORY_CACHE_SIZE,
+    ):
+        """Initialize translation memory.
+
+        :param path: database file. Only the in-process cache is used if not provided
+        :param timeout: seconds to wait for other writers to release the lock
+        :param cache_size: budget of the in-process cache, in bytes
+        """
+        self.path = str(path) if path else IN_MEMORY
+        self.cache = LRUCache(cache_size)
+        self._lock = threading.Lock()
+        self._connection = None
+        if self.path != IN_MEMORY:
+            self._connection = sqlite3.connect(
+                self.path,
+                timeout=timeout,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            # Let readers and writers of other processes work concurrently
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(SCHEMA)
+
+    @property
+    def persistent(self) -> bool:
+        """Check if the translations are stored in a database file."""
+        return self._connection is not None
+
+    @staticmethod
+    def make_key(
+        *,
+        service: str,
+        source_locale: str,
+        target_locale: str,
+        source: str,
+        glossary: str = None,
+        formality: str = None,
+        profanity: str = None,
+    ) -> tuple:
+        """Build an entry key.
+
+        :return: tuple ordered as KEY_COLUMNS
+        """
+        return (
+            service,
+            (source_locale or "").upper(),
+            (target_locale or "").upper(),
+            glossary or "",
+            formality or "",
+            profanity or "",
+            source,
+        )
+
+    def get(self, key: tuple) -> str | None:
+        """Get the translation stored for a key."""
+        translation = self.cache.get(key)
+        if translation is not None or not self.persistent:
+            return translation
+
+        where = " AND ".join(f"{column} = ?" for column in KEY_COLUMNS)
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT translation FROM translations WHERE {where}",  # nosec
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        self.cache.set(key, row[0])
+        return row[0]
+
+    def set(self, key: tuple, translation: str) -> None:
+        """Store a translation."""
+        self.set_many([(key, translation)])
+
+    def set_many(self, items: list) -> None:
+        """Store several translations in a single transaction.
+
+        :param items: list of (key, translation) tuples
+        """
+        if not items:
+            return
+        if not self.persistent:
+            self.cache.set_many(items)
+            return
+
+        now = time.time()
+        rows = [(*key, translation, now) for key, translation in items]
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        # Entries are cached once looked up, only the cached ones are refreshed
+        self.cache.update(items)
+
+    def stats(self) -> list:
+        """Get number of entries and characters per service and locales.
+
+        :return: list of (service, source_locale, target_locale, entries, chars)
+        """
+        if not self.persistent:
+            return self._get_cached_stats()
+        with self._lock:
+            return self._connection.execute(
+                "SELECT service, source_locale, target_locale, COUNT(*),"
+                " SUM(LENGTH(source)) FROM translations"
+                " GROUP BY service, source_locale, target_locale"
+                " ORDER BY service, source_locale, target_locale"
+            ).fetchall()
+
+    def _get_cached_stats(self) -> list:
+        """Get number of entries and characters per service and locales, of the cache."""
+        groups = {}
+        for key, _translation in self.cache.items():
+            entry = dict(zip(KEY_COLUMNS, key))
+            group = (entry["service"], entry["source_locale"], entry["target_locale"])
+            entries, chars = groups.get(group, (0, 0))
+            groups[group] = (entries + 1, chars + len(entry["source"]))
+        return [(*group, *groups[group]) for group in sorted(groups)]
+
+    def prune(
+        self,
+        *,
+        older_than: float = None,
+        service: str = None,
+        target_locale: str = None,
+    ) -> int:
+        """Remove entries.
+
+        :param older_than: remove entries not updated in this number of days
+            (entries not stored in a file are kept, as they're as old as the process)
+        :param service: remove only entries of this service
+        :param target_locale: remove only entries of this target locale
+        :return: number of removed entries
+        """
+        if not self.persistent:
+            if older_than is not None:
+                return 0
+            return self.cache.discard(
+                key
+                for key, _translation in self.cache.items()
+                if self._matches(key, service=service, target_locale=target_locale)
+            )
+
+        conditions, params = self._get_conditions(
+            older_than=older_than, service=service, target_locale=target_locale
+        )
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM translations{where}",  # nosec
+                params,
+            )
+        self.cache.clear()
+        return cursor.rowcount
+
+    def iter_entries(
+        self,
+        *,
+        service: str = None,
+        target_locale: str = None,
+        batch_size: int = 1000,
+    ):
+        """Iterate over the stored translations.
+
+        They're read in batches, so other threads can use the memory meanwhile.
+
+        :param service: only entries of this service
+        :param target_locale: only entries of this target locale
+        :param batch_size: entries read at a time
+        :return: generator of (key, translation) tuples
+        """
+        if not self.persistent:
+            for key, translation in self.cache.items():
+                if self._matches(key, service=service, target_locale=target_locale):
+                    yield key, translation
+            return
+
+        conditions, params = self._get_conditions(
+            service=service, target_locale=target_locale
+        )
+        columns = ", ".join(KEY_COLUMNS)
+        where = " AND ".join(["rowid > ?", *conditions])
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT rowid, {columns}, translation FROM translations"  # nosec
+                    f" WHERE {where} ORDER BY rowid LIMIT ?",
+                    (last_rowid, *params, batch_size),
+                ).fetchall()
+            for row in rows:
+                yield tuple(row[1:-1]), row[-1]
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    @staticmethod
+    def _get_conditions(
+        *,
+        older_than: float = None,
+        service: str = None,
+        target_locale: str = None,
+    ) -> tuple:
+        """Build the SQL conditions filtering entries.
+
+        :return: tuple of (conditions, params)
+        """
+        conditions = []
+        params = []
+        if older_than is not None:
+            conditions.append("updated_at < ?")
+            params.append(time.time() - older_than * 86400)
+        if service is not None:
+            conditions.append("service = ?")
+            params.append(service)
+        if target_locale is not None:
+            conditions.append("target_locale = ?")
+            params.append(target_locale.upper())
+        return conditions, params
+
+    @staticmethod
+    def _matches(key: tuple, *, service: str = None, target_locale: str = None) -> bool:
+        """Check if an entry key matches the filters of prune and iter_entries."""
+        entry = dict(zip(KEY_COLUMNS, key))
+        return (service is None or entry["service"] == service) and (
+            target_locale is None or entry["target_locale"] == target_locale.upper()
+        )
+
+    def vacuum(self) -> None:
+        """Rebuild the database file to reclaim unused space."""
+        if not self.persistent:
+            return
+        with self._lock:
+            self._connection.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close database connection."""
+        if not self.persistent:
+            return
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        """Get number of entries."""
+        if not self.persistent:
+            return len(self.cache)
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM translations"
+            ).fetchone()[0]
+
+    def __repr__(self):
+        """Repr the translation memory."""
+        return f"{self.__class__.__name__}({self.path})"
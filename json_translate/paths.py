@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# A path is a tuple of dict keys and list indexes, like ("common", "animals", 0),
+# represented as a JSON Pointer (RFC 6901) when stored: "/common/animals/0"
+
+
+def to_pointer(path: tuple) -> str:
+    """Convert a path to a JSON Pointer."""
+    return "".join(
+        "/" + str(segment).replace("~", "~0").replace("/", "~1") for segment in path
+    )
+
+
+def from_pointer(pointer: str, data=None) -> tuple:
+    """Convert a JSON Pointer to a path.
+
+    :param pointer: JSON Pointer
+    :param data: data the pointer refers to, to tell list indexes from keys
+    :return: path
+    """
+    if not pointer:
+        return ()
+
+    path = []
+    for segment in pointer[1:].split("/"):
+        key = segment.replace("~1", "/").replace("~0", "~")
+        if isinstance(data, list):
+            key = int(key)
+        path.append(key)
+        data = get_path(data, path[-1:]) if data is not None else None
+
+    return tuple(path)
+
+
+def get_path(data, path: tuple, default=None):
+    """Get the value of a path.
+
+    :param data: nested data
+    :param path: path to get
+    :param default: value to return if the path doesn't exist
+    """
+    for segment in path:
+        if (isinstance(data, dict) and segment in data) or (
+            isinstance(data, list) and isinstance(segment, int) and segment < len(data)
+        ):
+            data = data[segment]
+        else:
+            return default
+    return data
+
+
+def set_path(data, path: tuple, value) -> None:
+    """Set the value of a path, creating the missing dicts.
+
+    :param data: nested data
+    :param path: path to set (not empty)
+    :param value: value to set
+    """
+    for segment in path[:-1]:
+        data = data.setdefault(segment, {}) if isinstance(data, dict) else data[segment]
+
+    if isinstance(data, list) and path[-1] == len(data):
+        data.append(value)
+    else:
+        data[path[-1]] = value
+
+
+def delete_path(data, path: tuple) -> bool:
+    """Delete a path, if it exists.
+
+    :param data: nested data
+    :param path: path to delete (not empty)
+    :return: if the path existed
+    """
+    parent = get_path(data, path[:-1])
+    if isinstance(parent, dict) and path[-1] in parent:
+        del parent[path[-1]]
+        return True
+    if (
+        isinstance(parent, list)
+        and isinstance(path[-1], int)
+        and path[-1] < len(parent)
+    ):
+        del parent[path[-1]]
+        return True
+    return False
+
+
+def merge(destination, source):
+    """Merge the nested dicts of source into destination, in place.
+
+    Values other than dicts (lists too) are replaced.
+
+    :param destination: nested data to update
+    :param source: nested data to add
+    :return: merged data
+    """
+    if not isinstance(destination, dict) or not isinstance(source, dict):
+        return source
+
+    stack = [(destination, source)]
+    while stack:
+        destination_dict, source_dict = stack.pop()
+        for key, value in source_dict.items():
+            if isinstance(value, dict) and isinstance(destination_dict.get(key), dict):
+                stack.append((destination_dict[key], value))
+            else:
+                destination_dict[key] = value
+
+    return destination
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import re
+from collections import Counter
+
+# Placeholder patterns, tried in order
+PATTERNS = (
+    # i18next interpolation and nesting: {{name}}, {{count, number}}, $t(key)
+    r"\{\{[^{}]+\}\}",
+    r"\$t\([^()]*\)",
+    # ICU simple arguments: {name}, {0}, {amount, number, currency}
+    r"\{\s*\w+\s*(?:,\s*(?:number|date|time|spellout|ordinal|duration)\s*(?:,[^{}]*)?)?\}",
+    # printf: %s, %d, %5.2f, %1$s, %(name)s, %%
+    r"%%",
+    r"%\(\w+\)[-+0#]*\d*(?:\.\d+)?[diouxXeEfFgGcrsa]",
+    r"%(?:\d+\$)?[-+0#]*(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:hh|h|ll|l|L|z|j|t)?[diouxXeEfFgGaAcsp@]",
+    # HTML tags: <b>, </b>, <br/>, <a href="...">
+    r"</?[A-Za-z][\w:-]*(?:\s[^<>]*)?/?>",
+)
+
+PLACEHOLDER_RE = re.compile("|".join(f"(?:{pattern})" for pattern in PATTERNS))
+
+# Canonical tokens placeholders are replaced with
+TOKEN_RE = re.compile(r"\{(\d+)\}")
+
+# Any letter, so texts without them don't need to be translated
+LETTER_RE = re.compile(r"[^\W\d_]")
+
+
+def mask(text: str) -> tuple:
+    """Replace the placeholders of a text with canonical tokens.
+
+    Tokens are numbered by position, so "Hello {name}" and "Hello {user}"
+    are both masked as "Hello {0}".
+
+    :param text: text to mask
+    :return: tuple of (masked text, placeholders replaced)
+    """
+    placeholders = []
+
+    def replace(match: re.Match) -> str:
+        placeholders.append(match.group())
+        return f"{{{len(placeholders) - 1}}}"
+
+    return PLACEHOLDER_RE.sub(replace, text), tuple(placeholders)
+
+
+def mask_translation(translation: str, placeholders: tuple) -> str | None:
+    """Replace the placeholders of a translation with the tokens of its source.
+
+    Placeholders may be in another order than in the source text, so each
+    one is replaced with the token of the same placeholder in the source.
+
+    :param translation: translation of a text
+    :param placeholders: placeholders replaced masking the source text
+    :return: masked translation, or None if its placeholders aren't the
+        same as the source ones
+    """
+    tokens = {}
+    for idx, placeholder in enumerate(placeholders):
+        tokens.setdefault(placeholder, []).append(idx)
+
+    def replace(match: re.Match) -> str:
+        indexes = tokens.get(match.group())
+        if not indexes:
+            raise LookupError(match.group())
+        return f"{{{indexes.pop(0)}}}"
+
+    try:
+        masked = PLACEHOLDER_RE.sub(replace, translation)
+    except LookupError:
+        return None
+    if any(tokens.values()):
+        return None
+    return masked
+
+
+def unmask(text: str, placeholders: tuple) -> str:
+    """Restore the placeholders of a masked text."""
+    if not placeholders:
+        return text
+
+    def replace(match: re.Match) -> str:
+        idx = int(match.group(1))
+        return placeholders[idx] if idx < len(placeholders) else match.group()
+
+    return TOKEN_RE.sub(replace, text)
+
+
+def has_same_tokens(masked_text: str, translation: str) -> bool:
+    """Check if all the tokens of a masked text survived its translation."""
+    return Counter(TOKEN_RE.findall(masked_text)) == Counter(
+        TOKEN_RE.findall(translation)
+    )
+
+
+def is_translatable(masked_text: str) -> bool:
+    """Check if a masked text has something to translate besides the tokens."""
+    return LETTER_RE.search(TOKEN_RE.sub("", masked_text)) is not None
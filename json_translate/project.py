@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Path patterns are relative to the project root, with glob wildcards ("**/",
+# "*", "?") and the language code ("{lang}"), like "locales/{lang}/**/*.json"
+import os
+import re
+from pathlib import Path
+from lockfile import hash_file, read_lockfile_source
+
+LANG = "{lang}"
+
+TOKEN_RE = re.compile(r"\*\*/|\*\*|\*|\?|\{lang\}")
+
+WILDCARD_REGEX = {
+    "**/": r"((?:[^/]+/)*)",
+    "**": r"(.*)",
+    "*": r"([^/]*)",
+    "?": r"([^/])",
+}
+
+# Directories never searched for catalogs
+IGNORED_DIRS = {"node_modules", "__pycache__"}
+
+
+def get_pattern_tokens(pattern: str) -> list:
+    """Get the wildcards and language codes of a path pattern, in order."""
+    return TOKEN_RE.findall(pattern)
+
+
+def compile_pattern(pattern: str, lang_code: str) -> re.Pattern:
+    """Compile the path pattern of a language into a regex.
+
+    The regex captures the value of each token of the pattern, in order.
+
+    :param pattern: path pattern
+    :param lang_code: language code (matched case insensitively)
+    :return: compiled regex, to use with fullmatch
+    """
+    regex = ""
+    pos = 0
+    for match in TOKEN_RE.finditer(pattern):
+        regex += re.escape(pattern[pos : match.start()])
+        token = match.group()
+        if token == LANG:
+            regex += f"((?i:{re.escape(lang_code)}))"
+        else:
+            regex += WILDCARD_REGEX[token]
+        pos = match.end()
+
+    return re.compile(regex + re.escape(pattern[pos:]))
+
+
+def find_catalogs(root: os.PathLike, pattern: str, lang_code: str) -> list:
+    """Find recursively the catalogs of a language.
+
+    Hidden directories (like .git) are skipped.
+
+    :param root: project directory
+    :param pattern: path pattern of the catalogs
+    :param lang_code: language of the catalogs
+    :return: sorted catalog paths
+    """
+    regex = compile_pattern(pattern, lang_code)
+    root = Path(root)
+    catalogs = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [
+            name
+            for name in dir_names
+            if not name.startswith(".") and name not in IGNORED_DIRS
+        ]
+        for file_name in file_names:
+            path = Path(dir_path) / file_name
+            if regex.fullmatch(path.relative_to(root).as_posix()):
+                catalogs.append(path)
+
+    return sorted(catalogs)
+
+
+def get_target_path(
+    source_file: os.PathLike,
+    *,
+    root: os.PathLike,
+    source_pattern: str,
+    target_pattern: str,
+    source_lang: str,
+    target_lang: str,
+) -> Path:
+    """Get the path of the translation of a source catalog.
+
+    The wildcards of the target pattern are replaced, in order, with the
+    values matched by the source pattern ones, and the language code is
+    written with the same case used in the source path.
+
+    :param source_file: source catalog path
+    :param root: project directory
+    :param source_pattern: path pattern of the source catalogs
+    :param target_pattern: path pattern of the translated catalogs
+    :param source_lang: source language
+    :param target_lang: target language
+    :return: translated catalog path
+    """
+    relative_path = Path(source_file).relative_to(root).as_posix()
+    match = compile_pattern(source_pattern, source_lang).fullmatch(relative_path)
+    if match is None:
+        raise Exception(f"{relative_path} doesn't match {source_pattern}")
+
+    tokens = get_pattern_tokens(source_pattern)
+    values = [value for token, value in zip(tokens, match.groups()) if token != LANG]
+    lang_sample = next(
+        (value for token, value in zip(tokens, match.groups()) if token == LANG),
+        source_lang,
+    )
+    if lang_sample.islower():
+        target_lang = target_lang.lower()
+    elif lang_sample.isupper():
+        target_lang = target_lang.upper()
+
+    values = iter(values)
+    target_path = TOKEN_RE.sub(
+        lambda token: target_lang if token.group() == LANG else next(values),
+        target_pattern,
+    )
+    return Path(root) / target_path
+
+
+def validate_patterns(source_pattern: str, target_pattern: str) -> str | None:
+    """Check a pair of path patterns can be used together.
+
+    :return: error description, or None if they are valid
+    """
+    if LANG not in source_pattern:
+        return f"the source pattern must contain {LANG}"
+    if LANG not in target_pattern:
+        return f"the target pattern must contain {LANG}"
+
+    source_wildcards = [
+        token for token in get_pattern_tokens(source_pattern) if token != LANG
+    ]
+    target_wildcards = [
+        token for token in get_pattern_tokens(target_pattern) if token != LANG
+    ]
+    if source_wildcards != target_wildcards:
+        return "the source and target patterns must have the same wildcards, in the same order"
+
+    return None
+
+
+def is_up_to_date(source_file: os.PathLike, target_file: os.PathLike) -> bool:
+    """Check if a catalog was translated from the current source.
+
+    The hash of the source is compared with the one stored in the target
+    lockfile, as modification times change on every checkout.
+    """
+    return Path(target_file).exists() and read_lockfile_source(
+        target_file
+    ) == hash_file(source_file)
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+
+class RetryableError(Exception):
+    """Temporary API error (throttling, unavailability) worth retrying."""
+
+    def __init__(self, message: str, *, retry_after: float = None, status: str = None):
+        """Initialize error.
+
+        :param message: error description
+        :param retry_after: seconds the service asked to wait before retrying
+        :param status: error status (like "429" or "ThrottlingException")
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+
+class CircuitOpenError(Exception):
+    """The API failed too many times in a row, so calls are not being sent."""
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Parse a Retry-After header value.
+
+    :param value: delay in seconds or HTTP date
+    :return: seconds to wait
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens are refilled continuously at the given rate, up to its capacity,
+    so short bursts are sent without waiting.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Initialize bucket.
+
+        :param rate: tokens added per second
+        :param capacity: maximum tokens stored. Defaults to one second of rate
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """Take tokens from the bucket, waiting until there are enough.
+
+        :param amount: tokens to take (capped to the bucket capacity)
+        :return: seconds waited
+        """
+        amount = min(amount, self.capacity)
+        waited = 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.rate,
+                )
+                self.updated_at = now
+                if now >= self.paused_until and self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                wait = max(
+                    self.paused_until - now,
+                    (amount - self.tokens) / self.rate,
+                )
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for some time."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Stop calling an API after too many consecutive failures.
+
+    Once open, calls are rejected until reset_timeout passes. Then a single
+    call is let through: the circuit closes if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """Initialize circuit breaker.
+
+        :param failure_threshold: consecutive failures to open the circuit
+        :param reset_timeout: seconds to wait before trying again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls must not be sent."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit open after {self.failures} consecutive failures"
+                )
+            # Half-open: let this call through and keep rejecting the rest
+            self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """Rate limit and retry API calls.
+
+    Calls wait for the requests/sec and characters/sec budgets, and
+    temporary errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: float = None,
+        characters_per_second: float = None,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 60,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ):
+        """Initialize rate limiter.
+
+        :param requests_per_second: API calls budget. Unlimited if not set
+        :param characters_per_second: characters budget. Unlimited if not set
+        :param retries: maximum retries of a call
+        :param backoff: base seconds to wait between retries
+        :param max_backoff: maximum seconds to wait between retries
+        :param failure_threshold: consecutive failures to stop calling the API
+        :param reset_timeout: seconds to wait before calling a failing API again
+        """
+        self.requests = (
+            TokenBucket(requests_per_second) if requests_per_second else None
+        )
+        self.characters = (
+            TokenBucket(characters_per_second) if characters_per_second else None
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def call(self, func, *args, characters: int = 0, **kwargs):
+        """Call a function respecting the budgets and retrying temporary errors.
+
+        :param func: function calling the API
+        :param characters: characters sent in the call
+        :return: function result
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            self.wait(characters)
+
+            try:
+                result = func(*args, **kwargs)
+            except RetryableError as exc:
+                self.circuit_breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                delay = self.get_backoff(attempt, exc.retry_after)
+                if exc.retry_after and self.requests is not None:
+                    # The service is throttling us, so slow down every worker
+                    self.requests.pause(delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.circuit_breaker.record_success()
+            return result
+
+    def wait(self, characters: int = 0) -> None:
+        """Wait until there is budget for a call."""
+        if self.requests is not None:
+            self.requests.acquire()
+        if self.characters is not None and characters:
+            self.characters.acquire(characters)
+
+    def get_backoff(self, attempt: int, retry_after: float = None) -> float:
+        """Get seconds to wait before a retry.
+
+        :param attempt: number of retries already done
+        :param retry_after: seconds the service asked to wait
+        """
+        delay = random.uniform(  # nosec
+            0, min(self.max_backoff, self.backoff * 2**attempt)
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
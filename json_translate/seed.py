@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# The translation memory is seeded with translations already made, like the
+# human reviewed catalogs of a project or the TMX export of another memory,
+# so the strings they hold are never sent to the translation service.
+from datadiff import align
+from memory import TranslationMemory
+from placeholders import mask, mask_translation, is_translatable
+from tmx import read_tmx
+
+# Entries stored in a single transaction
+BATCH_SIZE = 10000
+
+
+def get_catalog_pairs(source_data, target_data, *, identity_key: str = None) -> list:
+    """Pair the source and translated strings of a catalog by key path.
+
+    :param source_data: source catalog data
+    :param target_data: translated catalog data
+    :param identity_key: key identifying the dicts of a list
+    :return: list of (source, target) tuples
+    """
+    return [
+        (source, target)
+        for _path, source, target in align(
+            source_data, target_data, identity_key=identity_key
+        )
+    ]
+
+
+def make_entries(
+    pairs,
+    *,
+    translators: list,
+    source_locale: str,
+    target_locale: str,
+    mask_placeholders: bool = True,
+    **options,
+) -> list:
+    """Build the translation memory entries of translated texts.
+
+    Texts not translated (empty, other types or the same as the source) and
+    translations whose placeholders aren't the same as the source ones are
+    left out. Keys are the ones the translators look the texts up with.
+
+    :param pairs: iterable of (source, target) tuples
+    :param translators: translator classes to store the translations for
+    :param source_locale: language of the sources
+    :param target_locale: language of the targets
+    :param mask_placeholders: if texts are stored with their placeholders
+        masked, like translators look them up by default
+    :param options: translator arguments of the translations, like glossary
+    :return: list of (key, translation) tuples
+    """
+    entries = []
+    for pair in pairs:
+        texts = get_entry_texts(*pair, mask_placeholders=mask_placeholders)
+        if texts is None:
+            continue
+
+        source, target = texts
+        for translator in translators:
+            keys = translator.get_seed_keys(
+                source,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                **options,
+            )
+            entries.extend((key, target) for key in keys)
+
+    return entries
+
+
+def get_entry_texts(source, target, *, mask_placeholders: bool = True) -> tuple | None:
+    """Get the texts to store for a translation.
+
+    :param source: source text
+    :param target: translated text
+    :param mask_placeholders: if texts are stored with their placeholders masked
+    :return: (source, target) tuple, or None if the text isn't translated
+    """
+    if not isinstance(source, str) or not isinstance(target, str):
+        return None
+    if not source.strip() or not target.strip() or source == target:
+        return None
+
+    if mask_placeholders:
+        source, placeholders = mask(source)
+        if placeholders:
+            target = mask_translation(target, placeholders)
+            if target is None or not is_translatable(source):
+                return None
+
+    return source, target
+
+
+def iter_tmx_entries(
+    file, *, translators: list, mask_placeholders: bool = True, **options
+):
+    """Read the translation memory entries of a TMX document.
+
+    Units with a service property (as written by export) keep the key they
+    were exported with. The other ones are stored for the translators.
+
+    :param file: path or open binary file
+    :param translators: translator classes to store the other translations for
+    :param mask_placeholders: if texts are stored with their placeholders masked
+    :param options: translator arguments of the other translations
+    :return: generator of (key, translation) tuples
+    """
+    for source_locale, target_locale, source, target, properties in read_tmx(file):
+        if "x-service" not in properties:
+            yield from make_entries(
+                [(source, target)],
+                translators=translators,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                mask_placeholders=mask_placeholders,
+                **options,
+            )
+            continue
+
+        texts = get_entry_texts(source, target, mask_placeholders=mask_placeholders)
+        if texts is not None:
+            key = TranslationMemory.make_key(
+                service=properties["x-service"],
+                source_locale=source_locale,
+                target_locale=target_locale,
+                source=texts[0],
+                glossary=properties.get("x-glossary"),
+                formality=properties.get("x-formality"),
+                profanity=properties.get("x-profanity"),
+            )
+            yield key, texts[1]
+
+
+def seed_memory(
+    memory: TranslationMemory, entries, *, batch_size: int = BATCH_SIZE
+) -> int:
+    """Store entries in the translation memory, in batches.
+
+    :param memory: translation memory
+    :param entries: iterable of (key, translation) tuples
+    :param batch_size: entries stored in a single transaction
+    :return: number of entries stored
+    """
+    stored = 0
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            memory.set_many(batch)
+            stored += len(batch)
+            batch = []
+    memory.set_many(batch)
+    return stored + len(batch)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import hmac
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Maximum request body size
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+# Host names of the loopback addresses
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "[::1]")
+
+
+class RequestError(Exception):
+    """Invalid request, answered with a 400 error."""
+
+    status = 400
+
+
+class ForbiddenError(RequestError):
+    """Request from an unexpected host or origin, answered with a 403 error."""
+
+    status = 403
+
+
+class UnauthorizedError(RequestError):
+    """Request without the session token, answered with a 401 error."""
+
+    status = 401
+
+
+class UnsupportedMediaError(RequestError):
+    """Request body which isn't json, answered with a 415 error."""
+
+    status = 415
+
+
+class JSONServer:
+    """Local HTTP server answering json requests.
+
+    Routes map (method, path) tuples to functions receiving the json body of
+    the request (None for GET requests) and returning the json response.
+
+    Requests must send the session token in an `Authorization: Bearer` header,
+    be addressed to the bound address (not to another host name resolving to
+    it), come from no origin or from that address, and POST an
+    application/json body.
+    """
+
+    def __init__(
+        self,
+        routes: dict,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        token: str = None,
+    ):
+        """Initialize server.
+
+        :param routes: functions by (method, path)
+        :param host: address to listen on
+        :param port: port to listen on (0 for a free one)
+        :param token: token the requests must send (a random one if not set)
+        """
+        self.routes = routes
+        self.token = token or secrets.token_urlsafe(32)
+        self.httpd = ThreadingHTTPServer((host, port), JSONRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.json_server = self
+
+    @property
+    def url(self) -> str:
+        """Get the server URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{format_host(host)}:{port}"
+
+    def serve_forever(self) -> None:
+        """Handle requests until the server is shut down."""
+        self.httpd.serve_forever()
+
+    def start(self) -> "JSONServer":
+        """Handle requests in a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stop handling requests and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """Handler of the requests of a JSONServer."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        """Handle a GET request."""
+        self.handle_route("GET")
+
+    def do_POST(self):  # noqa: N802
+        """Handle a POST request."""
+        self.handle_route("POST")
+
+    def handle_route(self, method: str) -> None:
+        """Check a request, and answer it with the result of its route."""
+        try:
+            self.check_request(method)
+            route = self.server.json_server.routes.get(
+                (method, self.path.split("?")[0])
+            )
+            if route is None:
+                self.send_json(404, {"error": "not found"})
+                return
+            body = self.read_json() if method == "POST" else None
+            self.send_json(200, route(body))
+        except RequestError as exc:
+            self.send_json(exc.status, {"error": str(exc)})
+        except Exception as exc:  # noqa: BLE001
+            self.send_json(500, {"error": str(exc)})
+
+    def check_request(self, method: str) -> None:
+        """Reject the requests sent to another host, or without the token.
+
+        Browsers let any page send requests to local addresses, so checking
+        the host and the origin keeps DNS rebinding and cross-site requests
+        out, and the token keeps out the other local users.
+        """
+        hosts = self.get_allowed_hosts()
+        if self.headers.get("Host", "").lower() not in hosts:
+            raise ForbiddenError("unexpected host")
+        origin = self.headers.get("Origin")
+        if origin is not None and origin.lower() not in {f"http://{h}" for h in hosts}:
+            raise ForbiddenError("unexpected origin")
+
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.strip().encode(), self.server.json_server.token.encode()
+        ):
+            raise UnauthorizedError("missing or invalid token")
+
+        if method == "POST" and self.headers.get_content_type() != "application/json":
+            raise UnsupportedMediaError("content type must be application/json")
+
+    def get_allowed_hosts(self) -> set:
+        """Get the Host headers addressing the server, with its port.
+
+        The address the connection was accepted on is used, so servers bound
+        to all the interfaces only accept their addresses too.
+        """
+        host, port = self.connection.getsockname()[:2]
+        hosts = {f"{format_host(host)}:{port}"}
+        if host in ("127.0.0.1", "::1"):
+            hosts.update(f"{loopback}:{port}" for loopback in LOOPBACK_HOSTS)
+        return hosts
+
+    def read_json(self):
+        """Read the json body of the request."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            raise RequestError("request body too large")
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as exc:
+            raise RequestError(f"invalid json: {exc}") from exc
+
+    def send_json(self, status: int, data) -> None:
+        """Send a json response."""
+        body = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status >= 400:
+            # The body of rejected requests may not have been read
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Don't log requests."""
+
+
+def format_host(host: str) -> str:
+    """Format an address for a URL or a Host header."""
+    return f"[{host}]" if ":" in host else host
@@ -15,12 +15,50 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 # Seconds to sleep between API calls
 SLEEP_BETWEEN_API_CALLS = float(os.getenv("SLEEP_BETWEEN_API_CALLS", 0.01))
 
+# API calls and characters sent per second (unlimited if not defined)
+REQUESTS_PER_SECOND = os.getenv("REQUESTS_PER_SECOND")
+CHARACTERS_PER_SECOND = os.getenv("CHARACTERS_PER_SECOND")
+
+# Retries of throttled or failed API calls
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", 5))
+
+# Number of API calls to run concurrently
+WORKERS = int(os.getenv("WORKERS", 1))
+
+# Maximum number of connections kept open to the translation service
+POOL_SIZE = int(os.getenv("POOL_SIZE", 10))
+
 # Default indentation to output the json file
 INDENTATION_DEFAULT = int(os.getenv("INDENTATION_DEFAULT", 2))
 
 # Default input file encoding
 ENCODING = os.getenv("ENCODING", "utf-8")
 
+# Json library to load and write the files: auto (orjson if installed) or json
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+# Translation memory database file (kept in memory if not defined)
+TRANSLATION_CACHE = os.getenv("TRANSLATION_CACHE")
+
+# Budget of the in-process cache of the translation memory (megabytes)
+MEMORY_CACHE_SIZE = int(float(os.getenv("MEMORY_CACHE_SIZE", 64)) * 2**20)
+
+# Path pattern of the source catalogs in project mode ({lang} is the language code)
+PROJECT_SOURCE_PATTERN = os.getenv("PROJECT_SOURCE_PATTERN", "{lang}/**/*.json")
+
+# Number of catalogs to translate concurrently in project mode
+PROJECT_JOBS = int(os.getenv("PROJECT_JOBS", 4))
+
+# Seconds between checks of the source catalogs when watching them
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", 1.0))
+
+# Address of the local server of the serve command
+SERVE_HOST = os.getenv("SERVE_HOST", "127.0.0.1")
+SERVE_PORT = int(os.getenv("SERVE_PORT", 8765))
+
+# Token the requests to the local server must send (a random one if not defined)
+SERVE_TOKEN = os.getenv("SERVE_TOKEN")
+
 # Supported language codes
 # fmt: off
 DEEPL_SUPPORTED_LANGS = ( # https://www.deepl.com/docs-api/translate-text
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# A run can be split in shards translated by different nodes (like the jobs
+# of a CI matrix), each one translating the strings whose key path hashes to
+# its shard. Shards are saved as partial files holding their translations by
+# JSON Pointer, which merge-shards combines into the output file.
+import os
+import re
+import hashlib
+from pathlib import Path
+import jsonio
+from atomic import open_atomic
+from leaftable import LeafTable
+from paths import to_pointer
+
+SHARD_RE = re.compile(r"(\d+)/(\d+)")
+
+SHARD_FILE_VERSION = 1
+
+
+class ShardError(Exception):
+    """Shards which can't be merged (missing, duplicated or inconsistent)."""
+
+
+def parse_shard(value: str) -> tuple:
+    """Parse a shard argument, like "2/4" for the second shard of four.
+
+    :return: tuple of (index, count), the index starting at 1
+    """
+    match = SHARD_RE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"invalid shard {value!r}, use INDEX/COUNT (like 1/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(
+            f"invalid shard {value!r}, the index must be from 1 to {count}"
+        )
+    return index, count
+
+
+def get_shard(pointer: str, count: int) -> int:
+    """Get the shard of a key path.
+
+    The hash is stable across processes, machines and Python versions.
+
+    :param pointer: JSON Pointer of the value
+    :param count: number of shards
+    :return: shard index, from 1 to count
+    """
+    digest = hashlib.blake2b(pointer.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def get_shard_path(output_file: os.PathLike, index: int, count: int) -> Path:
+    """Get the partial file of a shard (fr.json -> fr.shard-1-of-4.json)."""
+    output_file = Path(output_file)
+    return output_file.with_name(
+        f"{output_file.stem}.shard-{index}-of-{count}{output_file.suffix}"
+    )
+
+
+def get_shard_leaves(paths: list, values: list, index: int, count: int) -> tuple:
+    """Get the strings of a shard, from values located at paths of a document.
+
+    :param paths: path of each value
+    :param values: values (strings or blocks of values)
+    :param index: shard index, from 1
+    :param count: number of shards
+    :return: tuple of (paths, strings) of the shard
+    """
+    shard_paths = []
+    shard_values = []
+    for path, value in zip(paths, values):
+        for leaf_path, text in get_strings(value, path):
+            if get_shard(to_pointer(leaf_path), count) == index:
+                shard_paths.append(leaf_path)
+                shard_values.append(text)
+    return shard_paths, shard_values
+
+
+def get_strings(data, path: tuple = ()) -> list:
+    """Get the strings of nested data, with their path.
+
+    Data nested past the recursion limit is walked through a flat table.
+
+    :param data: nested data
+    :param path: path of data
+    :return: list of (path, string) tuples, in document order
+    """
+    strings = []
+    try:
+        _collect_strings(data, path, strings)
+    except RecursionError:
+        table = LeafTable.from_data(data)
+        strings = [
+            ((*path, *table.get_path(idx)), table.values[idx])
+            for idx in table.get_strings()
+        ]
+    return strings
+
+
+def _collect_strings(data, path: tuple, strings: list) -> None:
+    """Collect the strings of nested data recursively, with their path."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            _collect_strings(value, (*path, key), strings)
+    elif isinstance(data, list):
+        for idx, value in enumerate(data):
+            _collect_strings(value, (*path, idx), strings)
+    elif isinstance(data, str):
+        strings.append((path, data))
+
+
+def write_shard(shard_file: os.PathLike, translations: dict, **metadata) -> None:
+    """Write the translations of a shard.
+
+    :param shard_file: partial file path
+    :param translations: translations by JSON Pointer
+    :param metadata: shard index and count, and the options of the run
+    """
+    with open_atomic(shard_file, encoding="utf-8") as file:
+        jsonio.dump(
+            {
+                "version": SHARD_FILE_VERSION,
+                "shard": metadata,
+                "translations": translations,
+            },
+            file,
+        )
+
+
+def read_shard(shard_file: os.PathLike) -> tuple:
+    """Read the partial file of a shard.
+
+    :return: tuple of (metadata, translations by JSON Pointer)
+    """
+    shard = jsonio.load(shard_file, "utf-8")
+    if not isinstance(shard, dict) or shard.get("version") != SHARD_FILE_VERSION:
+        raise ShardError(f"{shard_file} is not a shard file")
+    return shard["shard"], shard["translations"]
+
+
+def check_shards(shards: list) -> None:
+    """Check the shards of an output file are complete and consistent.
+
+    :param shards: list of (shard file, metadata) tuples
+    :raise ShardError: if any shard is missing or duplicated, or they were
+        translated from other sources or with other options
+    """
+    first_file, first = shards[0]
+    options = {key: value for key, value in first.items() if key != "index"}
+    found = {}
+    for shard_file, metadata in shards:
+        for key, value in options.items():
+            if metadata.get(key) != value:
+                raise ShardError(
+                    f"{shard_file} and {first_file} differ in {key}:"
+                    f" {metadata.get(key)!r} != {value!r}"
+                )
+        index = metadata["index"]
+        if index in found:
+            raise ShardError(
+                f"duplicate shard {index}/{first['count']}: {found[index]} and {shard_file}"
+            )
+        found[index] = shard_file
+
+    missing = [
+        str(index) for index in range(1, first["count"] + 1) if index not in found
+    ]
+    if missing:
+        raise ShardError(
+            f"missing shards of {first['output']}: {', '.join(missing)} of {first['count']}"
+        )
+
+
+class ShardTranslations:
+    """Stand-in translator returning the translations of merged shards.
+
+    It replays a run with the translations the shards made, so the output is
+    built (and extended) as if it had been translated by a single node.
+    """
+
+    def __init__(self, translations: dict):
+        """Initialize the translations.
+
+        :param translations: translations by JSON Pointer, of all the shards
+        """
+        self.translations = translations
+
+    def translate(self, data):
+        """Translate the strings of a document."""
+        return self.translate_values([()], [data])[0]
+
+    def translate_values(self, paths: list, values: list) -> list:
+        """Translate values located at paths of a document.
+
+        Values nested past the recursion limit are rebuilt from a flat table.
+        """
+        results = []
+        for path, value in zip(paths, values):
+            try:
+                results.append(self._rebuild(value, to_pointer(path)))
+            except RecursionError:
+                table = LeafTable.from_data(value)
+                leaves = list(table.values)
+                for idx in table.get_strings():
+                    pointer = to_pointer((*path, *table.get_path(idx)))
+                    leaves[idx] = self.translations.get(pointer, leaves[idx])
+                results.append(table.to_data(leaves))
+        return results
+
+    def _rebuild(self, data, pointer: str):
+        """Rebuild data recursively, with the translations of its strings.
+
+        :param data: nested data
+        :param pointer: JSON Pointer of data
+        :return: translation
+        """
+        if isinstance(data, dict):
+            return {
+                key: self._rebuild(value, pointer + to_pointer((key,)))
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [
+                self._rebuild(value, f"{pointer}/{idx}")
+                for idx, value in enumerate(data)
+            ]
+        if isinstance(data, str):
+            return self.translations.get(pointer, data)
+        return data
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import sys
+import json
+import time
+import bisect
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+# Upper bounds (milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RunStats:
+    """Thread-safe metrics of a translation run.
+
+    Counters are plain integers updated under a lock, and latencies are
+    bucketed in a fixed histogram, so they are cheap enough to always keep.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.retries = 0
+        self.billable_characters = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors = {}
+        # One count per bucket, plus one for the slower requests
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.stages = {}
+
+    def record_request(
+        self,
+        seconds: float,
+        *,
+        characters: int = 0,
+        error: str = None,
+    ) -> None:
+        """Record an API call.
+
+        :param seconds: call duration
+        :param characters: characters sent, billed if the call succeeded
+        :param error: error status of a failed call (like "429")
+        """
+        milliseconds = seconds * 1000
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, milliseconds)
+        with self.lock:
+            self.requests += 1
+            self.latency_counts[bucket] += 1
+            self.latency_sum += milliseconds
+            self.latency_max = max(self.latency_max, milliseconds)
+            if error is None:
+                self.billable_characters += characters
+            else:
+                self.errors[error] = self.errors.get(error, 0) + 1
+
+    def record_retries(self, retries: int) -> None:
+        """Record retried API calls."""
+        if retries:
+            with self.lock:
+                self.retries += retries
+
+    def record_cache(self, *, hits: int = 0, misses: int = 0) -> None:
+        """Record translation memory lookups."""
+        with self.lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the wall time of a run stage.
+
+        Stages running concurrently (like in several locales) are summed up.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def get_latency_percentile(self, percentile: float) -> float | None:
+        """Estimate a latency percentile, as the upper bound of its bucket.
+
+        :param percentile: percentile, from 0 to 100
+        :return: milliseconds (the maximum latency for the slowest bucket)
+        """
+        if not self.requests:
+            return None
+        rank = self.requests * percentile / 100
+        total = 0
+        for bucket, count in enumerate(self.latency_counts):
+            total += count
+            if total >= rank and count:
+                if bucket < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[bucket], round(self.latency_max, 3))
+                break
+        return round(self.latency_max, 3)
+
+    def to_dict(self, translators: dict = None, *, memory=None) -> dict:
+        """Get the metrics as json serializable data.
+
+        :param translators: translators by language code, to add their counts
+        :param memory: translation memory, to add its cache counters (the one
+            of the translators by default)
+        :return: metrics
+        """
+        with self.lock:
+            histogram = {
+                f"le_{bound}": count
+                for bound, count in zip(LATENCY_BUCKETS, self.latency_counts)
+            }
+            histogram["le_inf"] = self.latency_counts[-1]
+            data = {
+                "wall_seconds": round(time.perf_counter() - self.started, 3),
+                "stages": {
+                    name: round(seconds, 3) for name, seconds in self.stages.items()
+                },
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": dict(sorted(self.errors.items())),
+                "billable_characters": self.billable_characters,
+                "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+                "latency_ms": {
+                    "mean": round(self.latency_sum / self.requests, 3)
+                    if self.requests
+                    else None,
+                    "max": round(self.latency_max, 3),
+                    "histogram": histogram,
+                },
+            }
+
+        for percentile in (50, 90, 99):
+            data["latency_ms"][f"p{percentile}"] = self.get_latency_percentile(
+                percentile
+            )
+
+        if translators is not None:
+            data["locales"] = {
+                lang_code: dict(translator.counts)
+                for lang_code, translator in translators.items()
+            }
+            if memory is None and translators:
+                # Translators share the translation memory
+                memory = next(iter(translators.values())).memory
+
+        if memory is not None:
+            data["memory_cache"] = memory.cache.get_counters()
+
+        return data
+
+    def write(self, output: str, translators: dict = None, *, memory=None) -> None:
+        """Write the metrics as json.
+
+        :param output: file path, or "-" for the standard error
+        :param translators: translators by language code, to add their counts
+        :param memory: translation memory, to add its cache counters
+        """
+        report = json.dumps(self.to_dict(translators, memory=memory), indent=2)
+        if output == "-":
+            sys.stderr.write(report + "\n")
+            return
+
+        with Path.open(output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+import re
+import json
+
+# Parser events
+START_MAP = "start_map"
+END_MAP = "end_map"
+MAP_KEY = "map_key"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+VALUE = "value"
+
+NUMBER_RE = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+LITERALS = (
+    ("true", True),
+    ("false", False),
+    ("null", None),
+    ("NaN", float("nan")),
+    ("Infinity", float("inf")),
+    ("-Infinity", float("-inf")),
+)
+WHITESPACE = " \t\n\r"
+
+# Parser states
+_EXPECT_VALUE = 0
+_EXPECT_KEY = 1
+_EXPECT_FIRST_KEY = 2
+_EXPECT_FIRST_VALUE = 3
+_AFTER_VALUE = 4
+
+
+class _Buffer:
+    """Chunked reader keeping in memory only the text not parsed yet."""
+
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self, size: int = None) -> bool:
+        """Read more text, returning False at the end of the file."""
+        if self.eof:
+            return False
+
+        if self.pos >= self.chunk_size:
+            # Drop the text already parsed
+            self.offset += self.pos
+            self.text = self.text[self.pos :]
+            self.pos = 0
+
+        chunk = self.file.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.text += chunk
+        return True
+
+    def peek(self) -> str:
+        """Get next non whitespace character, or an empty string at the end."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(
+            f"{message} (char {self.offset + self.pos})", self.text, self.pos
+        )
+
+    def read_string(self) -> str:
+        while True:
+            try:
+                value, self.pos = json.decoder.scanstring(self.text, self.pos + 1)
+                return value
+            except json.JSONDecodeError:
+                # Double the text read, so long strings aren't scanned too often
+                if not self.fill(max(self.chunk_size, len(self.text) - self.pos)):
+                    raise
+
+    def read_scalar(self):
+        while True:
+            char = self.text[self.pos]
+            if char == '"':
+                return self.read_string()
+
+            match = NUMBER_RE.match(self.text, self.pos)
+            if match and match.group() != "-":
+                # Numbers may continue in the next chunk (like "1" of "1e+10")
+                if len(self.text) - match.end() < 3 and self.fill():
+                    continue
+                integer, frac, exp = match.groups()
+                self.pos = match.end()
+                if frac or exp:
+                    return float(integer + (frac or "") + (exp or ""))
+                return int(integer)
+
+            if len(self.text) - self.pos < 9 and self.fill():
+                continue
+            for literal, value in LITERALS:
+                if self.text.startswith(literal, self.pos):
+                    self.pos += len(literal)
+                    return value
+
+            raise self.error("Expecting value")
+
+
+def iter_events(file, chunk_size: int = 2**16):
+    """Parse a json file incrementally.
+
+    Only the chunk being parsed is kept in memory, whatever the file size.
+
+    :param file: text file object
+    :param chunk_size: characters to read at a time
+    :return: generator of (event, value) tuples
+    """
+    buffer = _Buffer(file, chunk_size)
+    stack = []
+    state = _EXPECT_VALUE
+
+    while True:
+        char = buffer.peek()
+        if state == _AFTER_VALUE and not stack:
+            if char != "":
+                raise buffer.error("Extra data")
+            return
+
+        state, event = _STATE_HANDLERS[state](buffer, stack, char)
+        if event is not None:
+            yield event
+
+
+def _parse_value(buffer: _Buffer, stack: list, char: str) -> tuple:
+    """Parse a value, or the start of a container.
+
+    :return: tuple of (next state, event or None)
+    """
+    if char == "{":
+        buffer.pos += 1
+        stack.append(START_MAP)
+        return _EXPECT_FIRST_KEY, (START_MAP, None)
+    if char == "[":
+        buffer.pos += 1
+        stack.append(START_ARRAY)
+        return _EXPECT_FIRST_VALUE, (START_ARRAY, None)
+    if char == "":
+        raise buffer.error("Expecting value")
+    return _AFTER_VALUE, (VALUE, buffer.read_scalar())
+
+
+def _parse_key(buffer: _Buffer, stack: list, char: str) -> tuple:
+    """Parse a map key and its delimiter."""
+    if char != '"':
+        raise buffer.error("Expecting property name enclosed in double quotes")
+    key = buffer.read_string()
+    if buffer.peek() != ":":
+        raise buffer.error("Expecting ':' delimiter")
+    buffer.pos += 1
+    return _EXPECT_VALUE, (MAP_KEY, key)
+
+
+def _parse_first_key(buffer: _Buffer, stack: list, char: str) -> tuple:
+    """Parse the first map key, or the end of an empty map."""
+    if char == "}":
+        buffer.pos += 1
+        stack.pop()
+        return _AFTER_VALUE, (END_MAP, None)
+    return _parse_key(buffer, stack, char)
+
+
+def _parse_first_value(buffer: _Buffer, stack: list, char: str) -> tuple:
+    """Parse the end of an empty array, or go on with its first value."""
+    if char == "]":
+        buffer.pos += 1
+        stack.pop()
+        return _AFTER_VALUE, (END_ARRAY, None)
+    return _EXPECT_VALUE, None
+
+
+def _parse_after_value(buffer: _Buffer, stack: list, char: str) -> tuple:
+    """Parse the delimiter after a value of a container, or its end."""
+    in_map = stack[-1] == START_MAP
+    if char == ",":
+        buffer.pos += 1
+        return (_EXPECT_KEY if in_map else _EXPECT_VALUE), None
+    if char == ("}" if in_map else "]"):
+        buffer.pos += 1
+        stack.pop()
+        return _AFTER_VALUE, (END_MAP if in_map else END_ARRAY, None)
+    raise buffer.error("Expecting ',' delimiter")
+
+
+_STATE_HANDLERS = {
+    _EXPECT_VALUE: _parse_value,
+    _EXPECT_KEY: _parse_key,
+    _EXPECT_FIRST_KEY: _parse_first_key,
+    _EXPECT_FIRST_VALUE: _parse_first_value,
+    _AFTER_VALUE: _parse_after_value,
+}
+
+
+class JSONStreamWriter:
+    """Write parser events as json incrementally.
+
+    The output is the same json.dump writes with ensure_ascii=False.
+    """
+
+    def __init__(self, file, indent: int = None):
+        """Initialize writer.
+
+        :param file: text file object
+        :param indent: json indentation
+        """
+        self.file = file
+        self.indent = " " * indent if isinstance(indent, int) else indent
+        self.item_separator = ", " if indent is None else ","
+        # Number of items written in each open container
+        self.counts = []
+        self.after_key = False
+
+    def _newline(self, depth: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + self.indent * depth
+
+    def _start_item(self) -> None:
+        if self.after_key or not self.counts:
+            self.after_key = False
+            return
+
+        depth = len(self.counts)
+        separator = self.item_separator if self.counts[-1] else ""
+        self.counts[-1] += 1
+        self.file.write(separator + self._newline(depth))
+
+    def write(self, event: str, value=None) -> None:
+        """Write a parser event."""
+        if event in (START_MAP, START_ARRAY):
+            self._start_item()
+            self.file.write("{" if event == START_MAP else "[")
+            self.counts.append(0)
+
+        elif event in (END_MAP, END_ARRAY):
+            count = self.counts.pop()
+            closing = "}" if event == END_MAP else "]"
+            self.file.write(
+                (self._newline(len(self.counts)) if count else "") + closing
+            )
+
+        elif event == MAP_KEY:
+            self._start_item()
+            self.file.write(json.dumps(value, ensure_ascii=False) + ": ")
+            self.after_key = True
+
+        else:
+            self._start_item()
+            self.file.write(json.dumps(value, ensure_ascii=False))
+
+
+def translate_events(translator, events, *, window: int = 1000):
+    """Translate the string values of a stream of parser events.
+
+    Events are buffered until `window` strings are collected, so strings are
+    still deduplicated and batched, but memory is bounded by the window size.
+
+    :param translator: translator instance
+    :param events: generator of (event, value) tuples
+    :param window: number of strings to translate at a time
+    :return: generator of translated (event, value) tuples
+    """
+    buffered = []
+    texts = []
+    key_filter = translator.key_filter
+    # Key filter state of each open container, and its next list index
+    stack = []
+    key = None
+
+    for event, value in events:
+        translatable = False
+        if event in (END_MAP, END_ARRAY):
+            stack.pop()
+        elif event == MAP_KEY:
+            key = value
+        else:
+            state = _get_child_state(key_filter, stack, key)
+            if event == START_MAP:
+                stack.append([state, None])
+            elif event == START_ARRAY:
+                stack.append([state, 0])
+            else:
+                translatable = isinstance(value, str) and key_filter.is_selected(state)
+
+        buffered.append((event, value, translatable))
+        if translatable:
+            texts.append(value)
+
+        if len(texts) >= window or len(buffered) >= 10 * window:
+            yield from _flush_events(translator, buffered, texts)
+            buffered = []
+            texts = []
+
+    yield from _flush_events(translator, buffered, texts)
+
+
+def _get_child_state(key_filter, stack: list, key: str):
+    """Get the key filter state of the value starting in the open container."""
+    if not stack:
+        return key_filter.start
+
+    container = stack[-1]
+    state, index = container
+    if index is None:
+        return key_filter.step(state, key)
+    container[1] += 1
+    return key_filter.step(state, index)
+
+
+def _flush_events(translator, buffered: list, texts: list):
+    translations = translator.translate_texts(texts)
+    for event, value, translatable in buffered:
+        yield event, translations.get(value, value) if translatable else value
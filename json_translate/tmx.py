@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Translation memories are exchanged as TMX 1.4 files: a translation unit per
+# entry, with the service and the options of the entry as properties, so
+# other tools can read them and the memory can be seeded back without calls.
+import re
+from html import escape
+from defusedxml import ElementTree
+from memory import KEY_COLUMNS
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+# Language of the entries translated with the source language detected
+UNDETERMINED = "und"
+
+# Key columns stored as "x-<column>" properties
+PROPERTIES = ("service", "glossary", "formality", "profanity")
+
+# Characters not allowed in XML 1.0 documents
+INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def write_tmx(file, entries) -> int:
+    """Write translation memory entries as a TMX document.
+
+    :param file: open text file
+    :param entries: iterable of (key, translation) tuples, keys ordered as KEY_COLUMNS
+    :return: number of translation units written
+    """
+    file.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<tmx version="1.4">\n'
+        '  <header creationtool="json-translate" creationtoolversion="1"'
+        ' segtype="sentence" o-tmf="json-translate" adminlang="en"'
+        ' srclang="*all*" datatype="plaintext"/>\n'
+        "  <body>\n"
+    )
+    written = 0
+    for key, translation in entries:
+        entry = dict(zip(KEY_COLUMNS, key))
+        if INVALID_XML_RE.search(entry["source"] + translation):
+            continue
+
+        source_locale = entry["source_locale"] or UNDETERMINED
+        lines = [f'    <tu srclang="{escape(source_locale)}">']
+        lines.extend(
+            f'      <prop type="x-{name}">{escape(entry[name], quote=False)}</prop>'
+            for name in PROPERTIES
+            if entry[name]
+        )
+        for locale, text in (
+            (source_locale, entry["source"]),
+            (entry["target_locale"], translation),
+        ):
+            lines.append(
+                f'      <tuv xml:lang="{escape(locale)}">'
+                f"<seg>{escape(text, quote=False)}</seg></tuv>"
+            )
+        lines.append("    </tu>\n")
+        file.write("\n".join(lines))
+        written += 1
+
+    file.write("  </body>\n</tmx>\n")
+    return written
+
+
+def read_tmx(file):
+    """Read the translation units of a TMX document incrementally.
+
+    :param file: path or open binary file
+    :return: generator of (source_locale, target_locale, source, target,
+        properties) tuples, a tuple per target language of each unit
+    """
+    header_srclang = None
+    # Documents with a DTD are rejected, not to expand their entities
+    events = ElementTree.iterparse(file, events=("start", "end"), forbid_dtd=True)
+    for event, element in events:
+        if event == "start":
+            if element.tag == "header":
+                header_srclang = element.get("srclang")
+            continue
+        if element.tag != "tu":
+            continue
+
+        properties = {
+            prop.get("type", ""): prop.text or "" for prop in element.findall("prop")
+        }
+        variants = [
+            (
+                tuv.get(XML_LANG) or tuv.get("lang") or "",
+                "".join(tuv.find("seg").itertext()),
+            )
+            for tuv in element.findall("tuv")
+            if tuv.find("seg") is not None
+        ]
+        srclang = (element.get("srclang") or header_srclang or "").lower()
+        element.clear()
+        if len(variants) < 2:
+            continue
+
+        source_idx = next(
+            (
+                idx
+                for idx, (lang, _text) in enumerate(variants)
+                if lang.lower() == srclang
+            ),
+            0,
+        )
+        source_locale, source = variants[source_idx]
+        if source_locale.lower() == UNDETERMINED:
+            source_locale = ""
+        for idx, (target_locale, target) in enumerate(variants):
+            if idx != source_idx:
+                yield source_locale, target_locale, source, target, properties
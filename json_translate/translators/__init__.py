@@ -1,11 +1,78 @@
 # -*- coding: utf-8 -*-
-from .deepl import DeepLTranslator
-from .aws import AWSTranslator
+"""Translators of each service.
+
+Translators are registered by service name as "module:Class" import paths, so
+a service module (and its client library, like boto3) is only imported when
+the service is used. Other packages can add services with an entry point in
+the "json_translate.translators" group of their pyproject.toml, mapping the
+service name to the import path of their translator class, like
+myservice = "my_package.translator:MyTranslator".
+"""
+import importlib
+
+ENTRY_POINT_GROUP = "json_translate.translators"
+
+# Translator classes or import paths (relative to this package), by service
+TRANSLATORS = {
+    "deepl": ".deepl:DeepLTranslator",
+    "aws": ".aws:AWSTranslator",
+}
+
+
+def register_translator(service: str, translator) -> None:
+    """Register a translator for a service.
+
+    :param service: service name, as used in the command line
+    :param translator: translator class, or its "module:Class" import path
+    """
+    TRANSLATORS[service] = translator
+
+
+def get_services() -> list:
+    """Get the names of the available services, registered ones included."""
+    from importlib import metadata
+
+    services = list(TRANSLATORS)
+    for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in services:
+            services.append(entry_point.name)
+    return services
+
+
+def has_translator(service: str) -> bool:
+    """Check if a service is available, without importing it."""
+    return service in TRANSLATORS or _get_entry_point(service) is not None
 
 
 def get_translator(service: str):
-    """Get translator service class."""
-    if service == "aws":
-        return AWSTranslator
+    """Get translator service class.
+
+    :param service: service name
+    :return: translator class
+    :raises ValueError: if the service is not available
+    """
+    translator = TRANSLATORS.get(service)
+    if translator is None:
+        entry_point = _get_entry_point(service)
+        if entry_point is None:
+            raise ValueError(
+                f"Unknown translation service: {service}"
+                f" (available: {', '.join(get_services())})"
+            )
+        translator = entry_point.load()
+
+    if isinstance(translator, str):
+        module_name, class_name = translator.split(":")
+        module = importlib.import_module(module_name, package=__name__)
+        translator = getattr(module, class_name)
+
+    TRANSLATORS[service] = translator
+    return translator
+
+
+def _get_entry_point(service: str):
+    # Imported on demand, only needed for services not registered already
+    from importlib import metadata
 
-    return DeepLTranslator
+    entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP, name=service)
+    return next(iter(entry_points), None)
@@ -1,43 +1,180 @@
 # -*- coding: utf-8 -*-
+import re
+from html import escape
+from html.parser import HTMLParser
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from .base import BaseTranslator
+from placeholders import has_same_tokens
+from ratelimit import RetryableError
 from settings import (
     AWS_REGION_NAME,
     AWS_ACCESS_KEY_ID,
     AWS_SECRET_ACCESS_KEY,
+    POOL_SIZE,
 )
 
 
+# Error codes of temporary errors
+RETRYABLE_ERRORS = (
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+)
+
+# https://docs.aws.amazon.com/translate/latest/dg/sync-document.html
+DOCUMENT_MAX_SIZE = 100 * 1024  # Bytes of the html document
+DOCUMENT_MAX_TEXTS = 10000
+DOCUMENT_HEADER = '<!DOCTYPE html>\n<html><head><meta charset="utf-8"></head><body>\n'
+DOCUMENT_FOOTER = "</body></html>\n"
+# Size of the element wrapping each text, with an id of up to 5 digits
+ELEMENT_OVERHEAD = len('<div id="00000"></div>\n')
+
+# Characters html collapses, unlike other spaces like NBSP or U+202F
+HTML_WHITESPACE = " \t\n\r\f"
+HTML_WHITESPACE_RE = re.compile(r"[ \t\n\r\f]+")
+
+# Texts whose whitespace html would collapse, or XML can't hold, are sent alone
+UNPACKABLE_RE = re.compile(
+    r"^[ \t\n\r\f]|[ \t\n\r\f]$|[ \t\n\r\f]{2}|[\n\r\t\x00-\x08\x0b\x0c\x0e-\x1f]"
+)
+
+# Result of a text not found back in the translated document
+NOT_ROUND_TRIPPED = object()
+
+
+class DocumentParser(HTMLParser):
+    """Parser of the texts of a translated document, by element id.
+
+    Elements holding markup, or found more than once, are left out.
+    """
+
+    def __init__(self):
+        """Initialize parser state."""
+        super().__init__(convert_charrefs=True)
+        self.texts = {}
+        self.broken = set()
+        self._current = None
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        """Start collecting the text of a packed element."""
+        if self._current is not None:
+            self.broken.add(self._current)
+            return
+        element_id = dict(attrs).get("id")
+        if tag == "div" and element_id is not None:
+            self._current = element_id
+            self._parts = []
+
+    def handle_endtag(self, tag):
+        """Store the text of a packed element."""
+        if tag != "div" or self._current is None:
+            return
+        if self._current in self.texts:
+            self.broken.add(self._current)
+        self.texts[self._current] = "".join(self._parts)
+        self._current = None
+
+    def handle_data(self, data):
+        """Collect the text of the current element."""
+        if self._current is not None:
+            self._parts.append(data)
+
+    def get_text(self, element_id: str) -> str | None:
+        """Get the text of an element, if it was found once and without markup."""
+        if element_id in self.broken:
+            return None
+        text = self.texts.get(element_id)
+        if text is None or not text.strip(HTML_WHITESPACE):
+            return None
+        return HTML_WHITESPACE_RE.sub(" ", text).strip(HTML_WHITESPACE)
+
+
+def is_packable(text: str) -> bool:
+    """Check if a text keeps its whitespace when packed in a html document."""
+    return UNPACKABLE_RE.search(text) is None
+
+
 class AWSTranslator(BaseTranslator):
     """AWS translator class."""
 
+    service = "aws"
+
+    # https://docs.aws.amazon.com/translate/latest/dg/what-is-limits.html
+    max_text_size = 10000  # Bytes of utf-8 text
+
     def __init__(self, *args, **kwargs):
         """Initialize AWS translator instance.
 
         :param **kwargs:
             formality: level of formality for translations
             profanity: mask profane words and phrases
+            pool_size: maximum number of connections to the API
+            client: AWS Translate client to reuse
+            documents: pack the strings of a batch in a html document
+                translated in a single call
         """
-        self.client = boto3.client(
+        self.client = kwargs.get("client") or boto3.client(
             "translate",
             region_name=AWS_REGION_NAME,
             aws_access_key_id=AWS_ACCESS_KEY_ID,
             aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+            config=Config(
+                max_pool_connections=kwargs.get("pool_size") or POOL_SIZE,
+                tcp_keepalive=True,
+                # Retries are handled by the rate limiter
+                retries={"total_max_attempts": 1},
+            ),
         )
-        self.formality = "FORMAL" if kwargs.get("formality") else "INFORMAL"
-        self.profanity = "MASK" if kwargs.get("profanity") else None
+        options = self.get_key_options(**kwargs)
+        self.formality = options["formality"]
+        self.profanity = options["profanity"]
 
         if kwargs.get("source_locale") is None:
             raise Exception("Param 'source_locale' is required in AWSTranslator")
 
+        # Documents can't be translated detecting their source language
+        self.documents = (
+            bool(kwargs.get("documents")) and kwargs["source_locale"].lower() != "auto"
+        )
+        if self.documents:
+            self.max_batch_texts = DOCUMENT_MAX_TEXTS
+            self.max_batch_size = (
+                DOCUMENT_MAX_SIZE - len(DOCUMENT_HEADER) - len(DOCUMENT_FOOTER)
+            )
+            # Texts are html escaped ("&" -> "&amp;") and wrapped in an element
+            self.max_char_size = 5
+            self.text_size_overhead = ELEMENT_OVERHEAD
+
         super().__init__(*args, **kwargs)
 
-    def translate_string(self, text: str) -> str:
-        """Translate a specific string.
+    def get_shared_kwargs(self) -> dict:
+        """Get the resources other instances of this translator can reuse."""
+        return {"client": self.client}
 
-        :param text: string to translate
-        :return: string translation
-        """
+    def get_cache_options(self) -> dict:
+        """Get the translator options which change the translation results."""
+        return {"formality": self.formality, "profanity": self.profanity}
+
+    @classmethod
+    def get_key_options(cls, **kwargs) -> dict:
+        """Get the cache options of the translators built with some arguments."""
+        return {
+            "formality": "FORMAL" if kwargs.get("formality") else "INFORMAL",
+            "profanity": "MASK" if kwargs.get("profanity") else None,
+        }
+
+    def get_text_size(self, text: str) -> int:
+        """Get the size a text takes in the request payload."""
+        if not self.documents:
+            return super().get_text_size(text)
+        return self.text_size_overhead + len(escape(text, quote=False).encode("utf-8"))
+
+    def get_settings(self) -> dict:
+        """Get the translation settings of the API calls."""
         settings = {}
 
         if self.formality is not None:
@@ -46,12 +183,130 @@ class AWSTranslator(BaseTranslator):
         if self.profanity is not None:
             settings["Profanity"] = self.profanity.upper()
 
-        response = self.client.translate_text(
-            Text=text,
-            SourceLanguageCode=self.source_locale,
-            TargetLanguageCode=self.target_locale,
-            Settings=settings,
+        return settings
+
+    def call(self, method, **params) -> dict:
+        """Call an AWS Translate method, raising RetryableError on temporary errors."""
+        try:
+            return method(
+                SourceLanguageCode=self.source_locale,
+                TargetLanguageCode=self.target_locale,
+                Settings=self.get_settings(),
+                **params,
+            )
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code")
+            if code not in RETRYABLE_ERRORS:
+                raise
+            raise RetryableError(code, status=code) from exc
+
+    def _request_translations(self, texts: list) -> list:
+        """Call the translation API with a batch of strings.
+
+        In documents mode, the texts which don't round-trip the document
+        (or can't be packed in it) are sent in calls of their own.
+        """
+        if not self.documents or len(texts) == 1:
+            return super()._request_translations(texts)
+
+        packed = [idx for idx, text in enumerate(texts) if is_packable(text)]
+        results = [NOT_ROUND_TRIPPED] * len(texts)
+        if len(packed) > 1:
+            packed_results = super()._request_translations(
+                [texts[idx] for idx in packed]
+            )
+            for idx, result in zip(packed, packed_results):
+                results[idx] = result
+
+        for idx, result in enumerate(results):
+            if result is NOT_ROUND_TRIPPED:
+                results[idx] = super()._request_translations([texts[idx]])[0]
+        return results
+
+    def translate_batch(self, texts: list) -> list:
+        """Translate several strings, in a single html document in documents mode.
+
+        :param texts: strings to translate
+        :return: string translations, in the same order (NOT_ROUND_TRIPPED for
+            the ones not found back in the translated document)
+        """
+        if not self.documents or len(texts) == 1:
+            return super().translate_batch(texts)
+        return self.translate_document(texts)
+
+    def translate_document(self, texts: list) -> list:
+        """Translate several strings packed in a html document.
+
+        :param texts: strings to translate, without line breaks nor
+            leading, trailing or repeated spaces
+        :return: string translations, in the same order (NOT_ROUND_TRIPPED for
+            the ones not found back in the translated document)
+        """
+        content = "".join(
+            [
+                DOCUMENT_HEADER,
+                *(
+                    f'<div id="{idx}">{escape(text, quote=False)}</div>\n'
+                    for idx, text in enumerate(texts)
+                ),
+                DOCUMENT_FOOTER,
+            ]
         )
+        try:
+            response = self.call(
+                self.client.translate_document,
+                Document={
+                    "Content": content.encode("utf-8"),
+                    "ContentType": "text/html",
+                },
+            )
+        except ClientError as exc:
+            # The texts may still be translated on their own
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=f"document not translated: {exc}",
+                    status=self.Status.warning,
+                )
+            return [NOT_ROUND_TRIPPED] * len(texts)
+
+        meta = response.get("ResponseMetadata", {})
+        document = response.get("TranslatedDocument", {}).get("Content")
+        if meta.get("HTTPStatusCode") != 200 or not document:
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=f"document not translated: {meta.get('HTTPStatusCode')}",
+                    status=self.Status.warning,
+                )
+            return [NOT_ROUND_TRIPPED] * len(texts)
+
+        parser = DocumentParser()
+        parser.feed(document.decode("utf-8", errors="replace"))
+        parser.close()
+
+        results = []
+        for idx, text in enumerate(texts):
+            result = parser.get_text(str(idx))
+            if result is None or (
+                self.mask_placeholders and not has_same_tokens(text, result)
+            ):
+                self.log_translation(
+                    input_text=text,
+                    result=f"not found back in the document: {result}",
+                    status=self.Status.warning,
+                )
+                result = NOT_ROUND_TRIPPED
+            results.append(result)
+        return results
+
+    def translate_string(self, text: str) -> str:
+        """Translate a specific string.
+
+        :param text: string to translate
+        :return: string translation, or None if it failed
+        """
+        response = self.call(self.client.translate_text, Text=text)
 
         meta = response.get("ResponseMetadata")
 
@@ -61,7 +316,7 @@ class AWSTranslator(BaseTranslator):
                 result=f"response status: {meta.get('HTTPStatusCode')}",
                 status=self.Status.error,
             )
-            return text
+            return None
 
         if not response.get("TranslatedText"):
             self.log_translation(
@@ -69,6 +324,6 @@ class AWSTranslator(BaseTranslator):
                 result=f"response empty: {response}",
                 status=self.Status.error,
             )
-            return text
+            return None
 
         return response.get("TranslatedText")
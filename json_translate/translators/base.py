@@ -1,7 +1,16 @@
 # -*- coding: utf-8 -*-
 import time
 from abc import ABC, abstractmethod
-from settings import ENCODING, SLEEP_BETWEEN_API_CALLS
+from concurrent.futures import ThreadPoolExecutor
+from chunks import split_text
+from leaftable import LeafTable
+from journal import Journal
+from keypaths import KeyPathFilter
+from memory import TranslationMemory
+from placeholders import mask, unmask, has_same_tokens, is_translatable
+from ratelimit import RateLimiter, RetryableError, CircuitOpenError
+from settings import ENCODING, SLEEP_BETWEEN_API_CALLS, WORKERS
+from stats import RunStats
 
 
 class BaseTranslator(ABC):
@@ -10,7 +19,26 @@ class BaseTranslator(ABC):
     Use this class to implement translators
     """
 
-    cached = {}
+    # Service name used to identify its translations in the memory
+    service: str = None
+
+    # If the service detects the source language when it's not set
+    detects_source_locale: bool = False
+
+    # Maximum number of texts sent in a single API call
+    max_batch_texts: int = 1
+
+    # Maximum payload size (as measured by get_text_size) of a single API call
+    max_batch_size: int = None
+
+    # Maximum size (as measured by get_text_size) of a single text, longer
+    # ones are split in chunks
+    max_text_size: int = None
+
+    # Maximum size of a character, and constant size of a text, as measured
+    # by get_text_size
+    max_char_size: int = 4
+    text_size_overhead: int = 0
 
     class Status:
         """Translation result status."""
@@ -25,85 +53,566 @@ class BaseTranslator(ABC):
         *,
         source_locale: str = None,
         skip: list = None,
+        only: list = None,
         sleep: float = SLEEP_BETWEEN_API_CALLS,
         encoding: str = ENCODING,
         log_translations: bool = False,
+        memory: TranslationMemory = None,
+        workers: int = WORKERS,
+        rate_limiter: RateLimiter = None,
+        stats: RunStats = None,
+        mask_placeholders: bool = True,
+        journal: Journal = None,
         **kwargs,
     ):
         """Initialize base translator instance.
 
         :param target_locale: locale to translate
-        :param skip: list of keys to ignore
-        :param sleep: sleep time between API calls
+        :param skip: key path patterns of the values to leave as they are
+        :param only: key path patterns of the values to translate (all if not set)
+        :param sleep: minimum time between API calls, if no rate_limiter is given
         :param encoding: encoding (utf-8, latin-1 etc)
         :param log_translations: if print translation results
+        :param memory: translation memory to look up before calling the API
+        :param workers: number of API calls to run concurrently
+        :param rate_limiter: rate limiter shared by the API calls
+        :param stats: run metrics to record the API calls and cache lookups on
+        :param mask_placeholders: if replace placeholders (like {name} or %d)
+            with canonical tokens before looking up and sending the strings
+        :param journal: journal to log the completed translations on
         """
         self.skip_keys = skip or []
+        self.only_keys = only or []
+        self.key_filter = KeyPathFilter(skip=skip, only=only)
         self.target_locale = target_locale
         self.source_locale = source_locale
         self.sleep = sleep
         self.encoding = encoding
         self.log_translations = log_translations
+        self.memory = memory if memory is not None else TranslationMemory()
+        self.counts = {"cached": 0, "translated": 0, "failed": 0}
+        self.workers = max(workers or 1, 1)
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_second=1 / sleep if sleep else None,
+        )
+        self.stats = stats if stats is not None else RunStats()
+        self.mask_placeholders = mask_placeholders
+        self.journal = journal
 
     def translate(self, data: dict) -> dict:
         """Translate nested data.
 
+        All the translatable strings are collected first, so they can be
+        deduplicated and sent in batches, and then data is rebuilt with the
+        translations.
+
         :param data: data to translate
         :return: translation
         """
-        return self._iterate_over_keys(data)
+        translations = self.translate_texts(self.get_texts(data))
+        state = self.key_filter.start if self.key_filter else None
+        return self._rebuild(data, translations, state)
+
+    def translate_values(self, paths: list, values: list) -> list:
+        """Translate values located at paths of a document.
+
+        :param paths: path of each value
+        :param values: values to translate
+        :return: translated values, in the same order
+        """
+        translations = self.translate_texts(self.get_values_texts(paths, values))
+        if not self.key_filter:
+            return [self._rebuild(value, translations) for value in values]
+        return [
+            self._rebuild(value, translations, self.key_filter.get_state(path))
+            for path, value in zip(paths, values)
+        ]
+
+    def _rebuild(self, data, translations: dict, state: int = None):
+        """Rebuild data with the translations of its selected strings.
+
+        Data nested past the recursion limit is rebuilt from a flat table.
+
+        :param data: data to rebuild
+        :param translations: translations by string
+        :param state: key filter state of data, if there's a key filter
+        :return: translation
+        """
+        try:
+            return self._rebuild_value(data, translations, state)
+        except RecursionError:
+            pass
+
+        # Data is the only child of the table root, to start from its state
+        table = LeafTable.from_data([data])
+        strings = table.get_strings()
+        if state is not None:
+            selected = table.get_selected(self.key_filter, [state])
+            strings = [idx for idx in strings if selected[idx]]
 
-    def _iterate_over_keys(self, data) -> list | dict | str:
-        """Iterate on data and translate the corresponding values.
+        values = list(table.values)
+        for idx in strings:
+            values[idx] = translations.get(values[idx], values[idx])
 
-        :param data: data to iterate
-        :return: translated block
+        return table.to_data(values)[0]
+
+    def _rebuild_value(self, data, translations: dict, state: int = None):
+        """Rebuild data recursively, with the translations of its selected strings.
+
+        :param data: data to rebuild
+        :param translations: translations by string
+        :param state: key filter state of data, if there's a key filter
+        :return: translation
         """
+        if state is not None and self.key_filter.is_excluded(state):
+            return data
+
         if isinstance(data, dict):
-            # Value is hierarchical, so iterate it
-            return self._get_dict_iteration(data)
+            if state is None:
+                return {
+                    key: self._rebuild_value(value, translations)
+                    for key, value in data.items()
+                }
+            step = self.key_filter.step
+            return {
+                key: self._rebuild_value(value, translations, step(state, key))
+                for key, value in data.items()
+            }
 
         if isinstance(data, list):
-            # Value is multiple, so iterate it
-            return [self._iterate_over_keys(value) for value in data]
+            if state is None:
+                return [self._rebuild_value(value, translations) for value in data]
+            step = self.key_filter.step
+            return [
+                self._rebuild_value(value, translations, step(state, idx))
+                for idx, value in enumerate(data)
+            ]
 
         if isinstance(data, str):
-            # Value is string, so translate it
-            return self._get_string_iteration(data)
+            if state is None or self.key_filter.is_selected(state):
+                return translations.get(data, data)
+            return data
 
-        if isinstance(data, (bool | int | float)):
-            # Value is boolean or numerical, return same value
+        if data is None or isinstance(data, bool | int | float):
             return data
 
         raise Exception(f"Can't determine {data} type")
 
-    def _get_dict_iteration(self, data: dict) -> dict:
-        result = {}
-        for key, value in data.items():
-            if key in self.skip_keys:
-                result[key] = value
+    def get_texts(self, data) -> list:
+        """Get the unique strings of data which would be translated.
+
+        :param data: data to translate
+        :return: strings, not skipped nor empty
+        """
+        if self.key_filter:
+            return self._get_selected_texts([(data, self.key_filter.start)])
+
+        # Only strings are collected, without building a table nor a tree
+        texts = {}
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(reversed(value.values()))
+            elif isinstance(value, list):
+                stack.extend(reversed(value))
+            elif isinstance(value, str) and value:
+                texts[value] = None
+
+        return list(texts)
+
+    def get_values_texts(self, paths: list, values: list) -> list:
+        """Get the unique strings of values located at paths of a document.
+
+        :param paths: path of each value
+        :param values: values to translate
+        :return: strings, not skipped nor empty
+        """
+        if self.key_filter:
+            return self._get_selected_texts(
+                [
+                    (value, self.key_filter.get_state(path))
+                    for path, value in zip(paths, values)
+                ]
+            )
+        return self.get_texts(values)
+
+    def _get_selected_texts(self, items: list) -> list:
+        """Get the unique strings selected by the key filter.
+
+        :param items: (value, key filter state) tuples
+        :return: strings, in order
+        """
+        step = self.key_filter.step
+        is_excluded = self.key_filter.is_excluded
+        texts = {}
+        stack = list(reversed(items))
+        while stack:
+            value, state = stack.pop()
+            if is_excluded(state):
+                continue
+            if isinstance(value, dict):
+                stack.extend(
+                    (child, step(state, key)) for key, child in reversed(value.items())
+                )
+            elif isinstance(value, list):
+                stack.extend(
+                    (value[idx], step(state, idx))
+                    for idx in range(len(value) - 1, -1, -1)
+                )
+            elif (
+                isinstance(value, str) and value and self.key_filter.is_selected(state)
+            ):
+                texts[value] = None
+
+        return list(texts)
+
+    def estimate(self, texts: list) -> dict:
+        """Estimate the API usage of translating strings, without calling the API.
+
+        :param texts: unique strings to translate
+        :return: number of strings, characters and API calls to send, and of
+            strings found in the translation memory
+        """
+        # Avoid a lookup per string when there is nothing to find
+        use_memory = len(self.memory) > 0
+        pending = []
+        cached = 0
+        masked_texts = {}
+        for text in texts:
+            masked_text, placeholders = self.mask(text)
+            if placeholders and not is_translatable(masked_text):
+                continue
+            chunks = self.get_chunks(masked_text)
+            for chunk in chunks:
+                if len(chunks) == 1 or chunk.strip():
+                    masked_texts[chunk] = None
+
+        for text in masked_texts:
+            if use_memory and self.memory.get(self.get_cache_key(text)) is not None:
+                cached += 1
             else:
-                result[key] = self._iterate_over_keys(value)
-        return result
+                pending.append(text)
+
+        return {
+            "strings": len(pending),
+            "characters": sum(len(text) for text in pending),
+            "requests": sum(1 for _batch in self._get_batches(pending)),
+            "cached": cached,
+        }
+
+    def translate_texts(self, texts: list) -> dict:
+        """Translate a list of strings.
+
+        :param texts: strings to translate (may be repeated)
+        :return: translations by string
+        """
+        masked_texts = {text: self.mask(text) for text in texts}
+        # Translations of this call, the memory keeps them for the next ones
+        translated = {}
+        pending = {}
+        chunked = {}
+        for masked_text, placeholders in masked_texts.values():
+            if placeholders and not is_translatable(masked_text):
+                continue
+            chunks = self.get_chunks(masked_text)
+            if len(chunks) == 1:
+                self._collect_string(masked_text, pending, translated)
+                continue
+            chunked[masked_text] = chunks
+            for chunk in chunks:
+                # The whitespace between chunks is kept as it is
+                if chunk.strip():
+                    self._collect_string(chunk, pending, translated)
+        self._translate_pending(list(pending), translated)
+
+        for masked_text, chunks in chunked.items():
+            # Texts are only translated if all their chunks are
+            if all(chunk in translated for chunk in chunks if chunk.strip()):
+                translated[masked_text] = "".join(
+                    translated.get(chunk, chunk) for chunk in chunks
+                )
+
+        translations = {}
+        for text, (masked_text, placeholders) in masked_texts.items():
+            if placeholders and not is_translatable(masked_text):
+                # Only placeholders, nothing to translate
+                translations[text] = text
+            else:
+                # Failed translations keep the source text
+                translations[text] = unmask(
+                    translated.get(masked_text, masked_text), placeholders
+                )
+        return translations
+
+    def get_chunks(self, text: str) -> list:
+        """Split a text too long for an API call in chunks to translate on their own.
+
+        :param text: text to split
+        :return: chunks to translate and the whitespace between them, or the
+            text alone if it fits in a call
+        """
+        if (
+            self.max_text_size is None
+            or not isinstance(text, str)
+            # Short texts fit whatever their characters, without measuring them
+            or len(text) * self.max_char_size + self.text_size_overhead
+            <= self.max_text_size
+            or self.get_text_size(text) <= self.max_text_size
+        ):
+            return [text]
+        return split_text(text, self.max_text_size, self.get_text_size)
 
-    def _get_string_iteration(self, text: str) -> str:
-        if not isinstance(text, str) or text == "":
-            return text
+    def mask(self, text: str) -> tuple:
+        """Replace the placeholders of a text with canonical tokens.
 
-        cached_result = self.cached.get(text)
+        :param text: text to mask
+        :return: tuple of (masked text, placeholders replaced)
+        """
+        if not self.mask_placeholders or not isinstance(text, str):
+            return text, ()
+        return mask(text)
+
+    def _translate_pending(self, texts: list, translated: dict) -> None:
+        """Translate not cached strings in batches.
+
+        :param texts: unique strings to translate
+        :param translated: mapping where the translations are stored
+        """
+        batches = list(self._get_batches(texts))
+
+        if self.workers == 1 or len(batches) <= 1:
+            for batch in batches:
+                self._translate_texts(batch, translated)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                # Results are stored in submission order to keep runs deterministic
+                responses = executor.map(self._request_translations, batches)
+                for batch, results in zip(batches, responses):
+                    self._store_translations(batch, results, translated)
+
+    def translate_batch(self, texts: list) -> list:
+        """Translate a list of strings.
+
+        Translators supporting several texts per request should override it.
+
+        :param texts: strings to translate
+        :return: string translations, in the same order (None for the ones
+            that failed, which are never stored)
+        """
+        return [self.translate_string(text) for text in texts]
+
+    def get_shared_kwargs(self) -> dict:
+        """Get the resources other instances of this translator can reuse.
+
+        :return: keyword arguments for other translator instances
+        """
+        return {}
+
+    def get_cache_options(self) -> dict:
+        """Get the translator options which change the translation results.
+
+        :return: keyword arguments for TranslationMemory.make_key
+        """
+        return {}
+
+    @classmethod
+    def get_key_options(cls, **kwargs) -> dict:
+        """Get the cache options of the translators built with some arguments.
+
+        Same as get_cache_options, without building a translator.
+
+        :param kwargs: translator arguments, like glossary or formality
+        :return: keyword arguments for TranslationMemory.make_key
+        """
+        return {}
+
+    @classmethod
+    def get_seed_keys(
+        cls, text: str, *, source_locale: str, target_locale: str, **kwargs
+    ) -> list:
+        """Get the keys the translators built with some arguments look a text up with.
+
+        Translators which can detect the source language look texts up without
+        it when they're run without a source locale.
+
+        :param text: text to look up
+        :param source_locale: language of the text
+        :param target_locale: language of the translation
+        :param kwargs: translator arguments, like glossary or formality
+        :return: translation memory keys
+        """
+        source_locales = [source_locale]
+        if cls.detects_source_locale:
+            source_locales.append(None)
+        return [
+            TranslationMemory.make_key(
+                service=cls.service,
+                source_locale=locale,
+                target_locale=target_locale,
+                source=text,
+                **cls.get_key_options(**kwargs),
+            )
+            for locale in source_locales
+        ]
+
+    def get_cache_key(self, text: str) -> tuple:
+        """Get the translation memory key of a text."""
+        return TranslationMemory.make_key(
+            service=self.service,
+            source_locale=self.source_locale,
+            target_locale=self.target_locale,
+            source=text,
+            **self.get_cache_options(),
+        )
+
+    def get_text_size(self, text: str) -> int:
+        """Get the size a text takes in the request payload."""
+        return len(text.encode("utf-8"))
+
+    def _collect_string(self, data, pending: dict, translated: dict) -> None:
+        """Collect a string if it's not cached yet.
+
+        :param data: value to collect
+        :param pending: ordered mapping where the strings are collected
+        :param translated: mapping where the cached translations are stored
+        """
+        if (
+            not isinstance(data, str)
+            or data == ""
+            or data in pending
+            or data in translated
+        ):
+            return
+
+        cached_result = self.memory.get(self.get_cache_key(data))
         if cached_result:
-            self.log_translation(text, f"{cached_result} (cached)")
-            return cached_result
+            self.log_translation(data, f"{cached_result} (cached)")
+            translated[data] = cached_result
+            self.counts["cached"] += 1
+            self.stats.record_cache(hits=1)
+            return
 
-        time.sleep(self.sleep)
+        self.stats.record_cache(misses=1)
+        pending[data] = None
+
+    def _get_batches(self, texts: list):
+        """Split texts in batches respecting the translator request limits.
+
+        :param texts: strings to translate
+        :return: generator of lists of strings
+        """
+        batch = []
+        batch_size = 0
+        for text in texts:
+            size = self.get_text_size(text)
+            if batch and (
+                len(batch) >= self.max_batch_texts
+                or (
+                    self.max_batch_size is not None
+                    and batch_size + size > self.max_batch_size
+                )
+            ):
+                yield batch
+                batch = []
+                batch_size = 0
+            batch.append(text)
+            batch_size += size
 
-        result = self.translate_string(text)
-        self.log_translation(text, result)
+        if batch:
+            yield batch
 
-        decoded = self.decode(result)
-        self.cached[text] = decoded
+    def _translate_texts(self, texts: list, translated: dict) -> list:
+        """Translate a batch of strings and cache the results.
+
+        :param texts: strings to translate
+        :param translated: mapping where the translations are stored
+        :return: decoded translations
+        """
+        return self._store_translations(
+            texts, self._request_translations(texts), translated
+        )
+
+    def _request_translations(self, texts: list) -> list:
+        """Call the translation API with a batch of strings.
+
+        It can run in a worker thread, so it must not change the translator.
+
+        :param texts: strings to translate
+        :return: raw translations (None for the ones that failed)
+        """
+        characters = sum(len(text) for text in texts)
+        attempts = 0
+
+        def send(texts: list) -> list:
+            nonlocal attempts
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                results = self.translate_batch(texts)
+            except Exception as exc:
+                # Error status of RetryableError, or HTTP status of HTTPError
+                status = getattr(exc, "status", None) or getattr(exc, "code", None)
+                self.stats.record_request(
+                    time.perf_counter() - start,
+                    error=str(status or type(exc).__name__),
+                )
+                raise
+            self.stats.record_request(
+                time.perf_counter() - start, characters=characters
+            )
+            return results
+
+        try:
+            return self.rate_limiter.call(send, texts, characters=characters)
+        except (RetryableError, CircuitOpenError) as exc:
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=str(exc),
+                    status=self.Status.error,
+                )
+            return [None] * len(texts)
+        finally:
+            self.stats.record_retries(max(attempts - 1, 0))
+
+    def _store_translations(self, texts: list, results: list, translated: dict) -> list:
+        """Log, decode and cache the translations of a batch.
+
+        :param texts: translated strings
+        :param results: raw translations
+        :param translated: mapping where the translations are stored
+        :return: decoded translations
+        """
+        decoded_results = []
+        cache_items = []
+        for text, result in zip(texts, results):
+            if result is None:
+                # Failed translations are kept as they are, but never cached
+                decoded_results.append(text)
+                self.counts["failed"] += 1
+                continue
+            if self.mask_placeholders and not has_same_tokens(text, result):
+                # Placeholders were lost or mangled, so keep the source text
+                self.log_translation(
+                    input_text=text,
+                    result=f"placeholders mangled: {result}",
+                    status=self.Status.error,
+                )
+                decoded_results.append(text)
+                self.counts["failed"] += 1
+                continue
+            self.log_translation(text, result)
+            decoded = self.decode(result)
+            decoded_results.append(decoded)
+            translated[text] = decoded
+            cache_items.append((self.get_cache_key(text), decoded))
+            self.counts["translated"] += 1
 
-        return decoded
+        self.memory.set_many(cache_items)
+        if self.journal is not None:
+            self.journal.append(cache_items)
+        return decoded_results
 
     def decode(self, text: str) -> str:
         """Decode text."""
@@ -1,9 +1,21 @@
 # -*- coding: utf-8 -*-
 import os
 import json
-from urllib import request, parse
+from urllib import parse, error
 from .base import BaseTranslator
-from settings import DEEPL_API_ENDPOINT
+from ratelimit import RetryableError, parse_retry_after
+from settings import DEEPL_API_ENDPOINT, POOL_SIZE
+from transport import HTTPConnectionPool, Response
+
+
+# Status codes of temporary errors (429: too many requests, 529: too many
+# requests in DeepL Free)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504, 529)
+
+# Bytes kept as a single byte when urlencoding (spaces are encoded as "+")
+URLENCODE_SAFE_BYTES = (
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~ "
+)
 
 
 class DeepLTranslator(BaseTranslator):
@@ -14,20 +26,68 @@ class DeepLTranslator(BaseTranslator):
 
         :param **kwargs:
             glossary: Glossary ID to use when translating
+            pool_size: maximum number of connections to the API
+            transport: HTTP connection pool to reuse
         """
         self.glossary = kwargs.get("glossary")
+        self.transport = kwargs.get("transport") or HTTPConnectionPool(
+            DEEPL_API_ENDPOINT,
+            pool_size=kwargs.get("pool_size") or POOL_SIZE,
+        )
         super().__init__(*args, **kwargs)
 
+    service = "deepl"
+    detects_source_locale = True
+
+    # https://developers.deepl.com/docs/resources/usage-limits
+    max_batch_texts = 50
+    max_batch_size = 128 * 1024 - 1024  # Leave room for the rest of the params
+    max_text_size = max_batch_size
+    max_char_size = 12  # Percent-encoded 4 bytes characters
+    text_size_overhead = len("&text=")
+
     def translate_string(self, text: str) -> str:
         """Translate a specific string.
 
         :param text: string to translate
-        :return: string translation
+        :return: string translation, or None if it failed
+        """
+        return self.translate_batch([text])[0]
+
+    def get_shared_kwargs(self) -> dict:
+        """Get the resources other instances of this translator can reuse."""
+        return {"transport": self.transport}
+
+    def get_cache_options(self) -> dict:
+        """Get the translator options which change the translation results."""
+        return {"glossary": self.glossary}
+
+    @classmethod
+    def get_key_options(cls, **kwargs) -> dict:
+        """Get the cache options of the translators built with some arguments."""
+        return {"glossary": kwargs.get("glossary")}
+
+    def get_text_size(self, text: str) -> int:
+        """Get the size a text takes in the urlencoded request body.
+
+        Same as len(parse.urlencode({"text": text})) + 1, but much faster.
+        """
+        encoded = text.encode("utf-8")
+        # Unsafe bytes are percent-encoded (3 bytes)
+        escaped = len(encoded.translate(None, URLENCODE_SAFE_BYTES))
+        return self.text_size_overhead + len(encoded) + 2 * escaped
+
+    def translate_batch(self, texts: list) -> list:
+        """Translate several strings in a single request.
+
+        :param texts: strings to translate
+        :return: string translations, in the same order (None for the ones
+            that failed)
         """
         data = {
             "target_lang": self.target_locale,
             "auth_key": os.environ.get("DEEPL_AUTH_KEY"),
-            "text": text,
+            "text": texts,
             "preserve_formatting": "1",
         }
 
@@ -37,34 +97,96 @@ class DeepLTranslator(BaseTranslator):
         if self.glossary is not None:
             data["glossary_id"] = self.glossary
 
-        data = parse.urlencode(data).encode()
+        results = self._parse_response(
+            texts, self._post(parse.urlencode(data, doseq=True).encode())
+        )
+        if results is None:
+            return [None] * len(texts)
+        return results
 
-        req = request.Request(DEEPL_API_ENDPOINT, data=data)
-        response = request.urlopen(req)  # nosec
+    def _post(self, body: bytes) -> Response:
+        """Send a translation request, raising on temporary and client errors.
 
-        if response.status != 200:
-            self.log_translation(
-                input_text=text,
-                result=f"response status: {response.status}",
-                status=self.Status.error,
+        :param body: urlencoded request body
+        :return: API response
+        """
+        try:
+            response = self.transport.request(
+                "POST",
+                body=body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+        except OSError as exc:
+            raise RetryableError(
+                f"connection error: {exc}", status="connection"
+            ) from exc
+
+        if response.status in RETRYABLE_STATUS:
+            raise RetryableError(
+                f"response status: {response.status}",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                status=str(response.status),
             )
-            return text
+
+        if response.status >= 400:
+            raise error.HTTPError(
+                DEEPL_API_ENDPOINT,
+                response.status,
+                response.read().decode(errors="replace"),
+                response.headers,
+                None,
+            )
+
+        return response
+
+    def _parse_response(self, texts: list, response: Response) -> list | None:
+        """Get the translations of a response.
+
+        :param texts: strings sent
+        :param response: API response
+        :return: string translations, in the same order (None for the ones
+            missing), or None if the response holds no translations
+        """
+        if response.status != 200:
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=f"response status: {response.status}",
+                    status=self.Status.error,
+                )
+            return None
 
         response_data = json.loads(response.read())
 
         if "translations" not in response_data:
-            self.log_translation(
-                input_text=text,
-                result=f"response empty: {response_data}",
-                status=self.Status.error,
-            )
-            return text
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=f"response empty: {response_data}",
+                    status=self.Status.error,
+                )
+            return None
 
-        if len(response_data["translations"]) > 1:
-            self.log_translation(
-                input_text=text,
-                result=f"more than 1 translation: {response_data['translations']})",
-                status=self.Status.warning,
-            )
+        translations = response_data["translations"]
+
+        if len(translations) > len(texts):
+            for text in texts:
+                self.log_translation(
+                    input_text=text,
+                    result=f"more than {len(texts)} translation: {translations})",
+                    status=self.Status.warning,
+                )
+
+        results = []
+        for idx, text in enumerate(texts):
+            if idx >= len(translations):
+                self.log_translation(
+                    input_text=text,
+                    result=f"translation missing: {translations}",
+                    status=self.Status.error,
+                )
+                results.append(None)
+                continue
+            results.append(translations[idx]["text"])
 
-        return response_data["translations"][0]["text"]
+        return results
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+import queue
+import threading
+from http import client
+from urllib import parse
+
+# Errors raised when a kept-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    client.RemoteDisconnected,
+    client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class Response:
+    """HTTP response, already read."""
+
+    def __init__(self, status: int, headers, body: bytes):
+        """Initialize response."""
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def read(self) -> bytes:
+        """Get response body."""
+        return self.body
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of persistent (keep-alive) HTTP connections to a host.
+
+    Connections are reused between requests, so the TCP and TLS handshakes
+    are paid once per connection instead of once per request.
+    """
+
+    def __init__(self, url: str, *, pool_size: int = 10, timeout: float = 60):
+        """Initialize connection pool.
+
+        :param url: endpoint requests are sent to
+        :param pool_size: maximum number of open connections
+        :param timeout: connection timeout in seconds
+        """
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        parsed_url = parse.urlsplit(url)
+        self.scheme = parsed_url.scheme
+        self.host = parsed_url.hostname
+        self.port = parsed_url.port
+        self.path = parsed_url.path or "/"
+        if parsed_url.query:
+            self.path += f"?{parsed_url.query}"
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _new_connection(self) -> client.HTTPConnection:
+        if self.scheme == "https":
+            return client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _get_connection(self) -> tuple:
+        """Get an idle connection, or a new one if there are none.
+
+        :return: tuple of (connection, if it was reused)
+        """
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def request(
+        self,
+        method: str,
+        body: bytes = None,
+        headers: dict = None,
+    ) -> Response:
+        """Send a request to the pool endpoint.
+
+        Waits for a free connection if all of them are in use.
+
+        :param method: HTTP method
+        :param body: request body
+        :param headers: request headers
+        :return: response
+        """
+        with self._slots:
+            connection, reused = self._get_connection()
+            try:
+                response = self._send(connection, method, body, headers)
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, so open a new one
+                connection = self._new_connection()
+                try:
+                    response = self._send(connection, method, body, headers)
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+            if response.headers.get("Connection", "").lower() == "close":
+                connection.close()
+            else:
+                self._idle.put(connection)
+
+            return response
+
+    def _send(
+        self,
+        connection: client.HTTPConnection,
+        method: str,
+        body: bytes,
+        headers: dict,
+    ) -> Response:
+        connection.request(method, self.path, body=body, headers=headers or {})
+        http_response = connection.getresponse()
+        # The body must be fully read before reusing the connection
+        return Response(
+            status=http_response.status,
+            headers=http_response.headers,
+            body=http_response.read(),
+        )
+
+    def close(self) -> None:
+        """Close idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __repr__(self):
+        """Repr the connection pool."""
+        return f"{self.__class__.__name__}({self.url}, pool_size={self.pool_size})"
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import threading
+from pathlib import Path
+
+
+class FileWatcher:
+    """Detect changes in a set of files by polling their modification times.
+
+    Polling works the same on every platform and filesystem (including
+    network and container mounts), at the cost of a stat call per file.
+    """
+
+    def __init__(self, get_files, *, interval: float = 1.0):
+        """Initialize watcher.
+
+        :param get_files: function returning the files to watch, called on
+            every poll so new files are detected too
+        :param interval: seconds between polls
+        """
+        self.get_files = get_files
+        self.interval = interval
+        self._snapshot = self._get_snapshot()
+        self._stop = threading.Event()
+
+    def _get_snapshot(self) -> dict:
+        snapshot = {}
+        for path in self.get_files():
+            try:
+                stat = Path(path).stat()
+            except OSError:
+                continue
+            snapshot[Path(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self) -> list:
+        """Get the files added or modified since the last poll."""
+        snapshot = self._get_snapshot()
+        changed = [
+            path
+            for path, signature in snapshot.items()
+            if self._snapshot.get(path) != signature
+        ]
+        self._snapshot = snapshot
+        return sorted(changed)
+
+    def watch(self, callback) -> None:
+        """Call a function with the changed files until the watcher is stopped.
+
+        :param callback: function receiving the list of changed files
+        """
+        while not self._stop.wait(self.interval):
+            changed = self.poll()
+            if changed:
+                callback(changed)
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
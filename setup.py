@@ -31,6 +31,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     python_requires=">=3.10",
     install_requires=reqs,
+    extras_require={"fast": ["orjson>=3.8"]},
     classifiers=[
         "Intended Audience :: Developers",
         "Operating System :: OS Independent",
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate.atomic import open_atomic
+
+
+class AtomicTest(unittest.TestCase):
+    """Tests for atomic module."""
+
+    def setUp(self):
+        """Create a file in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "fr.json"
+        self.path.write_text('{"old": "good"}', encoding="utf-8")
+        self.path.chmod(0o640)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def test_replaces_file(self):
+        """It replaces the file keeping its permissions."""
+        with open_atomic(self.path) as file:
+            file.write('{"new": "good"}')
+        self.assertEqual(self.path.read_text(encoding="utf-8"), '{"new": "good"}')
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o640)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_keeps_file_on_error(self):
+        """It leaves the file untouched if the write is interrupted."""
+        with self.assertRaises(KeyboardInterrupt), open_atomic(self.path) as file:
+            file.write('{"new": ')
+            raise KeyboardInterrupt
+        self.assertEqual(self.path.read_text(encoding="utf-8"), '{"old": "good"}')
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate.chunks import split_text, get_utf8_size
+
+
+class ChunksTest(unittest.TestCase):
+    """Tests for chunks module."""
+
+    def assert_chunks(self, text: str, max_size: int, get_size=get_utf8_size) -> list:
+        """Split a text, checking the parts join back and the chunks fit."""
+        parts = split_text(text, max_size, get_size)
+        self.assertEqual("".join(parts), text)
+        for part in parts:
+            if part.strip():
+                self.assertLessEqual(get_size(part), max_size)
+        return [part for part in parts if part.strip()]
+
+    def test_short_text_is_not_split(self):
+        """It returns the text alone if it fits."""
+        self.assertEqual(split_text("Hello world", 11), ["Hello world"])
+
+    def test_split_paragraphs(self):
+        """It splits each paragraph in a chunk, keeping the whitespace between them."""
+        text = "First one.\n\n  Second one.\n \nThird."
+        self.assertEqual(
+            split_text(text, 20),
+            ["First one.", "\n\n  ", "Second one.", "\n \n", "Third."],
+        )
+
+    def test_pack_sentences(self):
+        """It packs as many sentences of a long paragraph as fit."""
+        text = "One. Two! Three? Four is longer. Five."
+        self.assertEqual(
+            self.assert_chunks(text, 16),
+            ["One. Two! Three?", "Four is longer.", "Five."],
+        )
+
+    def test_split_cjk_sentences(self):
+        """It splits sentences without spaces after the punctuation."""
+        self.assertEqual(self.assert_chunks("東京です。大阪です。", 16), ["東京です。", "大阪です。"])
+
+    def test_split_words_and_characters(self):
+        """It splits at words, and at characters if a word doesn't fit."""
+        self.assertEqual(
+            self.assert_chunks("aa bb cc dddddddd", 5), ["aa bb", "cc", "ddddd", "ddd"]
+        )
+
+    def test_size_depends_on_encoding(self):
+        """It measures the chunks with the given function, like the utf-8 bytes."""
+        self.assertEqual(self.assert_chunks("éé éé", 4), ["éé", "éé"])
+        self.assertEqual(self.assert_chunks("éé éé", 5, len), ["éé éé"])
+
+    def test_size_overhead(self):
+        """It takes the constant overhead of the size function into account."""
+        chunks = self.assert_chunks("ab cd", 7, lambda text: len(text) + 5)
+        self.assertEqual(chunks, ["ab", "cd"])
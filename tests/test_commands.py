@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate.commands import cache
+from json_translate.memory import TranslationMemory
+
+TMX_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<tmx version="1.4"><header srclang="en" datatype="plaintext"/><body>
+  <tu><tuv xml:lang="en"><seg>Hello</seg></tuv><tuv xml:lang="fr"><seg>Bonjour</seg></tuv></tu>
+</body></tmx>"""
+
+
+class CacheCommandTest(unittest.TestCase):
+    """Tests for the cache command."""
+
+    def setUp(self):
+        """Create a temporary folder for the catalogs and the database."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.db = str(self.path / "tm.db")
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def write_json(self, name: str, data: dict) -> str:
+        """Write a catalog to the temporary directory."""
+        file = self.path / name
+        file.write_text(json.dumps(data), encoding="utf-8")
+        return str(file)
+
+    def run_cache(self, *argv):
+        """Run the cache command, leaving out its output."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            cache(["--cache", self.db, *argv])
+
+    def get_usage_error(self, *argv) -> str:
+        """Run the cache command, expecting a usage error.
+
+        :return: error output
+        """
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(stderr):
+            self.run_cache(*argv)
+        return stderr.getvalue()
+
+    def count_translations(self) -> int:
+        """Count the translations in the memory."""
+        memory = TranslationMemory(self.db)
+        count = len(memory)
+        memory.close()
+        return count
+
+    def test_options_between_action_and_files(self):
+        """It parses the options given between the action and the files."""
+        file = self.path / "memory.tmx"
+        file.write_text(TMX_DOCUMENT, encoding="utf-8")
+        self.run_cache("import", "--service", "deepl", str(file))
+        # Stored with the source locale and without it, as DeepL detects it
+        self.assertEqual(self.count_translations(), 2)
+
+    def test_import_without_source_catalog(self):
+        """It reports the missing source catalog as a usage error."""
+        file = self.write_json("fr.json", {"a": "Bonjour"})
+        self.assertIn(
+            "en.json not found", self.get_usage_error("import", "-sl", "EN", file)
+        )
+        self.assertIn(
+            "x.json not found",
+            self.get_usage_error("import", "-sl", "EN", "--source", "x.json", file),
+        )
+
+    def test_import_requires_a_supported_locale(self):
+        """It requires --locale unless the file is named after a language."""
+        self.write_json("en.json", {"a": "Hello"})
+        file = self.write_json("messages.json", {"a": "Bonjour"})
+        self.assertIn(
+            "set it with --locale", self.get_usage_error("import", "-sl", "EN", file)
+        )
+        self.assertIn(
+            "XX is not supported",
+            self.get_usage_error("import", "-sl", "EN", "--locale", "XX", file),
+        )
+
+        self.run_cache(
+            "import", "-sl", "EN", "--service", "deepl", "--locale", "FR", file
+        )
+        self.assertEqual(self.count_translations(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import unittest
-from json_translate.datadiff import DataDiff
+from json_translate.datadiff import DataDiff, align
 
 
 class DataDiffTest(unittest.TestCase):
@@ -60,3 +60,99 @@ class DataDiffTest(unittest.TestCase):
         }
         diff = DataDiff(data1, data2)
         self.assertEqual(diff.to_dict(), expected_diff)
+
+    def test_list_patch_is_element_by_element(self):
+        """It patches only the list elements which are missing."""
+        diff = DataDiff({"list": ["uno", "dos", "tres"]}, {"list": ["one", "two"]})
+        self.assertEqual(diff.to_patch(), [("remove", ("list", 2), None)])
+
+        diff = DataDiff({"list": ["uno"]}, {"list": ["one", "two", {"a": "b"}]})
+        self.assertEqual(diff.get_values(), ["two", {"a": "b"}])
+        self.assertEqual(
+            diff.apply({"list": ["uno"]}, ["dos", {"a": "be"}]),
+            {"list": ["uno", "dos", {"a": "be"}]},
+        )
+
+    def test_select(self):
+        """It keeps the added and replaced values matching a predicate, and list additions."""
+        diff = DataDiff(
+            {"a": "x", "list": []}, {"a": {"b": "y"}, "c": "z", "list": ["w"]}
+        )
+        diff.select(lambda path, value: path == ("c",))
+        self.assertEqual(diff.get_paths(), [("c",), ("list", 0)])
+
+    def test_align(self):
+        """It pairs the values at the same path, matching lists by identity key."""
+        source = {
+            "a": "x",
+            "b": {"c": "y"},
+            "d": ["z"],
+            "items": [{"id": 1, "t": "one"}],
+        }
+        target = {
+            "a": "X",
+            "b": "Y",
+            "d": ["Z", "W"],
+            "items": [{"id": 2}, {"id": 1, "t": "ONE"}],
+        }
+        self.assertEqual(
+            align(source, target, identity_key="id"),
+            [
+                (("a",), "x", "X"),
+                (("d", 0), "z", "Z"),
+                (("items", 0, "id"), 1, 1),
+                (("items", 0, "t"), "one", "ONE"),
+            ],
+        )
+
+    def test_list_patch_by_identity_key(self):
+        """It matches the dicts of a list by identity key."""
+        initial = {"items": [{"id": 1, "name": "uno"}, {"id": 2, "name": "dos"}]}
+        minus = {
+            "items": [
+                {"id": 3, "name": "three"},
+                {"id": 1, "name": "one", "help": "first"},
+            ]
+        }
+        diff = DataDiff(initial, minus, identity_key="id")
+        self.assertEqual(diff.get_values(), [{"id": 3, "name": "three"}, "first"])
+        self.assertEqual(
+            diff.apply(initial, [{"id": 3, "name": "tres"}, "primero"]),
+            {
+                "items": [
+                    {"id": 3, "name": "tres"},
+                    {"id": 1, "name": "uno", "help": "primero"},
+                ]
+            },
+        )
+
+    def test_type_changes_are_replaced(self):
+        """It replaces values whose type changed."""
+        initial = {"a": "uno", "b": {"c": "dos"}, "c": ["tres"]}
+        minus = {"a": {"x": "one"}, "b": "two", "c": {"d": "three"}}
+        diff = DataDiff(initial, minus)
+        self.assertEqual(
+            diff.to_patch(),
+            [
+                ("replace", ("a",), {"x": "one"}),
+                ("replace", ("b",), "two"),
+                ("replace", ("c",), {"d": "three"}),
+            ],
+        )
+        self.assertEqual(diff.to_dict(), minus)
+
+    def test_deeply_nested_data(self):
+        """It doesn't reach the recursion limit with deeply nested data."""
+        initial = {}
+        minus = {}
+        initial_level = initial
+        minus_level = minus
+        for _ in range(5000):
+            initial_level["a"] = {}
+            minus_level["a"] = {}
+            initial_level = initial_level["a"]
+            minus_level = minus_level["a"]
+        minus_level["b"] = "c"
+
+        diff = DataDiff(initial, minus)
+        self.assertEqual(diff.to_patch(), [("add", ("a",) * 5000 + ("b",), "c")])
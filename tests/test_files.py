@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import json
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -59,3 +61,34 @@ class FilesTest(unittest.TestCase):
             files.get_input_file(["lorem.json"], "ipsum/dolor"),
             "lorem.json",
         )
+
+    def test_save_results_file_extend_merges_nested_dicts(self):
+        """It merges the results into the existing file, replacing lists."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = Path(tmp_dir) / "fr.json"
+            output_file.write_text(
+                json.dumps({"a": {"b": "B", "c": "C"}, "list": ["x", "y"], "kept": "K"})
+            )
+            files.save_results_file(
+                {"a": {"c": "C2", "d": "D"}, "list": ["z"]}, output_file, extend=True
+            )
+            self.assertEqual(
+                json.loads(output_file.read_text()),
+                {"a": {"b": "B", "c": "C2", "d": "D"}, "list": ["z"], "kept": "K"},
+            )
+
+    def test_save_results_file_patch_reuses_loaded_data(self):
+        """It applies the patch on the output data loaded to diff it, without reading it again."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = Path(tmp_dir) / "en.json"
+            output_file = Path(tmp_dir) / "fr.json"
+            input_file.write_text(json.dumps({"kept": "Bye", "added": "Thanks"}))
+            output_file.write_text(json.dumps({"kept": "Au revoir"}))
+            diff = files.get_diff_to_translate(input_file, output_file=output_file)
+            with patch.object(files, "load_json_file") as load_json_file_mock:
+                files.save_results_file(["Merci"], output_file, extend=True, patch=diff)
+            load_json_file_mock.assert_not_called()
+            self.assertEqual(
+                output_file.read_text(),
+                json.dumps({"kept": "Au revoir", "added": "Merci"}, indent=2),
+            )
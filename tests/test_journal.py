@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate.journal import Journal, get_journal_path
+from json_translate.memory import TranslationMemory
+
+
+def make_key(source: str) -> tuple:
+    """Build a translation memory key."""
+    return TranslationMemory.make_key(
+        service="deepl", source_locale="EN", target_locale="FR", source=source
+    )
+
+
+class JournalTest(unittest.TestCase):
+    """Tests for journal module."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = get_journal_path(Path(self.tmp_dir.name) / "fr.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def test_get_journal_path(self):
+        """It stores the journal next to the output file."""
+        self.assertEqual(
+            get_journal_path(Path("locales/fr.json")), Path("locales/fr.json.journal")
+        )
+
+    def test_append_flushes_in_batches(self):
+        """It writes the translations once the buffer is full."""
+        journal = Journal(self.path, flush_size=2)
+        journal.append([(make_key("Hello"), "Bonjour")])
+        self.assertFalse(self.path.exists())
+        journal.append([(make_key("Bye"), "Au revoir")])
+        self.assertEqual(len(self.path.read_text(encoding="utf-8").splitlines()), 2)
+        journal.close()
+
+    def test_replay(self):
+        """It stores the journaled translations in a memory."""
+        journal = Journal(self.path)
+        journal.append([(make_key("Hello"), "Bonjour"), (make_key("Bye"), "Au revoir")])
+        journal.close()
+        # Interrupted write
+        with Path.open(self.path, "a", encoding="utf-8") as file:
+            file.write('["deepl", "EN"')
+
+        memory = TranslationMemory()
+        self.assertEqual(Journal(self.path).replay(memory), 2)
+        self.assertEqual(memory.get(make_key("Hello")), "Bonjour")
+        self.assertEqual(memory.get(make_key("Bye")), "Au revoir")
+
+    def test_replay_without_journal(self):
+        """It replays nothing if there is no journal."""
+        self.assertEqual(Journal(self.path).replay(TranslationMemory()), 0)
+
+    def test_remove(self):
+        """It discards the journal."""
+        journal = Journal(self.path, flush_size=1)
+        journal.append([(make_key("Hello"), "Bonjour")])
+        journal.remove()
+        journal.close()
+        self.assertFalse(self.path.exists())
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+from unittest.mock import patch
+from json_translate import jsonio
+
+DATA = {
+    "text": 'Héllo   \x00 "quoted" 😀',
+    "nested": {"empty_dict": {}, "empty_list": [], "list": [1, -2, None, True, False]},
+    "floats": [0.1, -0.0, 1.5, 100.0, 12345678.9],
+}
+
+
+class JsonIOTest(unittest.TestCase):
+    """Tests for jsonio module."""
+
+    def test_dumps_is_the_same_as_json(self):
+        """It writes byte by byte the same json.dumps does, whatever the backend."""
+        for backend in ("auto", "json"):
+            for indent in (None, 0, 2, 4):
+                with self.subTest(backend=backend, indent=indent), patch.object(
+                    jsonio, "JSON_BACKEND", backend
+                ):
+                    self.assertEqual(
+                        jsonio.dumps(DATA, indent=indent),
+                        json.dumps(DATA, indent=indent, ensure_ascii=False),
+                    )
+
+    def test_dumps_non_portable_values(self):
+        """It writes the values orjson formats differently like json.dumps."""
+        for data in (
+            [1e16, 1e-05, 2.5e-300],
+            [float("nan"), float("inf")],
+            {"big": 2**70},
+            {"surrogate": "\ud800"},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(
+                    jsonio.dumps(data), json.dumps(data, indent=2, ensure_ascii=False)
+                )
+
+    def test_loads_is_the_same_as_json(self):
+        """It parses the same data json.loads does, whatever the backend."""
+        for text in (
+            json.dumps(DATA),
+            "[123456789012345678901234567890, -98765432109876543210]",
+            '{"a": 1, "a": 2}',
+            "[NaN, 1E400]",
+            '"\\ud800"',
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(repr(jsonio.loads(text)), repr(json.loads(text)))
+
+    def test_scalar_documents(self):
+        """It parses and writes documents whose root isn't a container."""
+        for data in (None, True, 3, "text", 1.5, 1e20):
+            for backend in ("auto", "json"):
+                with self.subTest(data=data, backend=backend), patch.object(
+                    jsonio, "JSON_BACKEND", backend
+                ):
+                    text = json.dumps(data, indent=2, ensure_ascii=False)
+                    self.assertEqual(jsonio.dumps(data), text)
+                    self.assertEqual(repr(jsonio.loads(text)), repr(data))
+
+    def test_loads_raises_json_errors(self):
+        """It raises the usual json errors on invalid documents."""
+        with self.assertRaises(json.JSONDecodeError):
+            jsonio.loads("{invalid")
+
+    def test_dump_writes_to_file(self):
+        """It writes the json document to a text file."""
+        file = io.StringIO()
+        jsonio.dump(DATA, file, indent=2)
+        self.assertEqual(
+            file.getvalue(), json.dumps(DATA, indent=2, ensure_ascii=False)
+        )
+
+    def test_has_float(self):
+        """It finds the floats matching the predicate in nested data."""
+        self.assertFalse(jsonio.has_float(DATA, jsonio.is_non_portable))
+        self.assertTrue(jsonio.has_float({"a": [{"b": 1e-7}]}, jsonio.is_non_portable))
+        self.assertTrue(jsonio.has_float([float("-inf")], jsonio.is_non_portable))
+        self.assertTrue(jsonio.has_float(1e20, jsonio.is_non_portable))
+        self.assertFalse(jsonio.has_float(None, jsonio.is_non_portable))
+        self.assertFalse(jsonio.has_float(["1e20", 20], jsonio.is_non_portable))
+
+    @patch.object(jsonio, "JSON_BACKEND", "json")
+    def test_get_backend_forced(self):
+        """It uses the json module when configured."""
+        self.assertEqual(jsonio.get_backend(), "json")
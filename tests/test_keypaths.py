@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate.keypaths import (
+    KeyPathSelector,
+    KeyPathFilter,
+    MATCHED,
+    DEAD,
+    split_pattern,
+)
+
+
+class KeyPathsTest(unittest.TestCase):
+    """Tests for keypaths module."""
+
+    def test_split_pattern(self):
+        """It splits patterns at unescaped dots, matching single keys at any depth."""
+        self.assertEqual(split_pattern("meta.*.id"), ["meta", "*", "id"])
+        self.assertEqual(split_pattern("title"), ["**", "title"])
+        self.assertEqual(split_pattern(r"a\.b.c"), [r"a\.b", "c"])
+
+    def test_matches(self):
+        """It matches the paths of each kind of segment."""
+        selector = KeyPathSelector(
+            [
+                "title",
+                "meta.*.id",
+                "pages.**.alt",
+                "items.0.name",
+                r"labels./^btn_\d+$/",
+            ]
+        )
+        for path in (
+            ("title",),
+            ("a", "b", "title"),
+            ("meta", "x", "id"),
+            ("pages", "alt"),
+            ("pages", "a", 3, "alt"),
+            ("items", 0, "name"),
+            ("labels", "btn_12"),
+            ("title", "under", "a", "match"),
+        ):
+            with self.subTest(path=path):
+                self.assertTrue(selector.matches(path))
+        for path in (
+            ("titles",),
+            ("meta", "id"),
+            ("meta", "x", "y", "id"),
+            ("alt",),
+            ("items", 1, "name"),
+            ("labels", "btn_a"),
+        ):
+            with self.subTest(path=path):
+                self.assertFalse(selector.matches(path))
+
+    def test_escaped_dot(self):
+        """It matches keys holding dots."""
+        selector = KeyPathSelector([r"errors.not\.found"])
+        self.assertTrue(selector.matches(("errors", "not.found")))
+        self.assertFalse(selector.matches(("errors", "not", "found")))
+
+    def test_dead_state(self):
+        """It stops matching once no pattern can match."""
+        selector = KeyPathSelector(["meta.id"])
+        self.assertIs(selector.get_state(("other",)), DEAD)
+        self.assertIs(selector.get_state(("other", "meta", "id")), DEAD)
+        self.assertIsNot(selector.get_state(("meta",)), DEAD)
+        self.assertIs(selector.get_state(("meta", "id", "x")), MATCHED)
+
+    def test_transitions_are_cached(self):
+        """It builds each state transition once."""
+        selector = KeyPathSelector(["**.id"])
+        state = selector.step(selector.start, "a")
+        self.assertIs(selector.step(selector.start, "a"), state)
+        transitions = selector.get_transitions(selector.start)
+        self.assertIs(selector.get_transitions(selector.start), transitions)
+        # Keys matching no literal nor regex go to the default state
+        self.assertIs(transitions[2], state)
+
+    def test_filter(self):
+        """It selects the values matching only patterns and no skip ones."""
+        key_filter = KeyPathFilter(skip=["id"], only=["meta.**"])
+        self.assertTrue(key_filter.is_selected(key_filter.get_state(("meta", "text"))))
+        self.assertFalse(key_filter.is_selected(key_filter.get_state(("meta", "id"))))
+        self.assertTrue(key_filter.is_excluded(key_filter.get_state(("text",))))
+        self.assertFalse(key_filter.is_excluded(key_filter.get_state(("meta",))))
+
+    def test_empty_filter(self):
+        """It selects every value without patterns."""
+        key_filter = KeyPathFilter()
+        self.assertFalse(key_filter)
+        self.assertTrue(key_filter.is_selected(key_filter.get_state(("a", 0, "b"))))
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate import languages
+
+
+class LanguagesTest(unittest.TestCase):
+    """Tests for languages module."""
+
+    def test_get_target_lang_codes_splits_locales(self):
+        """It returns each comma separated locale once."""
+        self.assertEqual(
+            languages.get_target_lang_codes("deepl", "de, FR,de"),
+            ["de", "FR"],
+        )
+
+    def test_get_target_lang_codes_exits_on_unsupported_locale(self):
+        """It exits if any of the locales is not supported."""
+        with self.assertRaises(SystemExit):
+            languages.get_target_lang_codes("deepl", "de,xx")
+
+    def test_get_target_lang_codes_all_supported_excludes_source(self):
+        """It returns all the supported languages but the excluded ones."""
+        lang_codes = languages.get_target_lang_codes(
+            "deepl", None, all_supported=True, exclude=("en", None)
+        )
+        self.assertNotIn("EN", lang_codes)
+        self.assertIn("EN-GB", lang_codes)
+        self.assertEqual(len(lang_codes), len(languages.DEEPL_SUPPORTED_LANGS) - 1)
+
+    def test_is_supported_lang_ignores_case(self):
+        """It checks the language codes case insensitively."""
+        self.assertTrue(languages.is_supported_lang("deepl", "pt-br"))
+        self.assertTrue(languages.is_supported_lang("aws", "ZH-TW"))
+        self.assertFalse(languages.is_supported_lang("deepl", "xx"))
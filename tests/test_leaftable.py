@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate.keypaths import KeyPathFilter
+from json_translate.leaftable import LeafTable, STRING
+from json_translate.translators.base import BaseTranslator
+
+
+class UpperTranslator(BaseTranslator):
+    """Translator upper casing the texts."""
+
+    service = "upper"
+
+    def translate_string(self, text: str) -> str:
+        """Upper case a text."""
+        return text.upper()
+
+
+def get_nested_data(depth: int):
+    """Nest a string in `depth` alternating lists and dicts."""
+    data = "leaf"
+    for idx in range(depth):
+        data = {"key": data} if idx % 2 else [data]
+    return data
+
+
+class LeafTableTest(unittest.TestCase):
+    """Tests for leaftable module."""
+
+    def assert_round_trip(self, data):
+        """Assert data is rebuilt as it was from its table."""
+        self.assertEqual(LeafTable.from_data(data).to_data(), data)
+
+    def test_round_trip(self):
+        """Test nested data is rebuilt as it was."""
+        self.assert_round_trip(
+            {
+                "lorem": "ipsum",
+                "dolor": {"sit": ["amet", {"one": "two"}, [1, 2.5]]},
+                "empty": {"dict": {}, "list": []},
+                "scalars": [None, True, False, 0, -1, 1e10],
+                "": "empty key",
+            }
+        )
+
+    def test_round_trip_root_values(self):
+        """Test non dict roots are rebuilt as they were."""
+        for data in ([], {}, ["one", ["two"]], "text", 1, None):
+            with self.subTest(data=data):
+                self.assert_round_trip(data)
+
+    def test_round_trip_keeps_key_order(self):
+        """Test dict keys keep their order."""
+        data = {"b": "one", "a": {"d": "two", "c": "three"}}
+        result = LeafTable.from_data(data).to_data()
+        self.assertEqual(list(result), ["b", "a"])
+        self.assertEqual(list(result["a"]), ["d", "c"])
+
+    def test_round_trip_deeply_nested(self):
+        """Test deeply nested data doesn't hit the recursion limit."""
+        data = get_nested_data(5000)
+        table = LeafTable.from_data(data)
+        self.assertEqual(len(table), 5001)
+        # Compare the leaf path, as comparing the data would recurse
+        result = table.to_data()
+        for idx in range(5000):
+            result = result["key"] if isinstance(result, dict) else result[0]
+        self.assertEqual(result, "leaf")
+
+    def test_to_data_with_values(self):
+        """Test values can be replaced when rebuilding."""
+        table = LeafTable.from_data({"lorem": ["ipsum", 1]})
+        values = [
+            value.upper() if isinstance(value, str) else value for value in table.values
+        ]
+        self.assertEqual(table.to_data(values), {"lorem": ["IPSUM", 1]})
+
+    def test_unknown_type(self):
+        """Test values of unknown type raise."""
+        with self.assertRaises(Exception):
+            LeafTable.from_data({"lorem": object()})
+
+    def test_get_path_and_pointers(self):
+        """Test node paths and JSON Pointers."""
+        table = LeafTable.from_data({"lo/rem": ["ipsum", {"a~b": "dolor"}]})
+        strings = table.get_strings()
+        self.assertEqual([table.kinds[idx] for idx in strings], [STRING, STRING])
+        self.assertEqual(
+            [table.get_path(idx) for idx in strings],
+            [("lo/rem", 0), ("lo/rem", 1, "a~b")],
+        )
+        pointers = table.get_pointers()
+        self.assertEqual(
+            [pointers[idx] for idx in strings], ["/lo~1rem/0", "/lo~1rem/1/a~0b"]
+        )
+
+    def test_keys_are_shared(self):
+        """Test repeated keys are stored once."""
+        data = [{"".join(["na", "me"]): str(idx)} for idx in range(3)]
+        table = LeafTable.from_data(data)
+        keys = [table.keys[idx] for idx in table.get_strings()]
+        self.assertTrue(all(key is keys[0] for key in keys))
+
+    def test_get_selected(self):
+        """Test nodes selected by key paths are marked, with the states of the root children."""
+        data = {
+            "meta": {"id": "one", "text": "two"},
+            "list": [{"text": "three"}, "four"],
+        }
+        table = LeafTable.from_data(data)
+        selected = table.get_selected(
+            KeyPathFilter(skip=["id"], only=["meta", "list.1"])
+        )
+        self.assertEqual(
+            [table.values[idx] for idx in table.get_strings() if selected[idx]],
+            ["two", "four"],
+        )
+
+        key_filter = KeyPathFilter(only=["meta.text"])
+        table = LeafTable.from_data(["two", {"text": "three"}])
+        selected = table.get_selected(
+            key_filter,
+            [key_filter.get_state(("meta", "text")), key_filter.get_state(("meta",))],
+        )
+        self.assertEqual(
+            [table.values[idx] for idx in table.get_strings() if selected[idx]],
+            ["two", "three"],
+        )
+
+    def test_get_skipped(self):
+        """Test nodes under skipped keys are marked."""
+        table = LeafTable.from_data(
+            {"id": "one", "text": "two", "meta": {"text": "three"}, "list": ["id"]}
+        )
+        skipped = table.get_skipped(["id", "meta"])
+        self.assertEqual(
+            [table.values[idx] for idx in table.get_strings() if not skipped[idx]],
+            ["two", "id"],
+        )
+
+    def test_translate_deeply_nested(self):
+        """Test translating deeply nested data doesn't hit the recursion limit."""
+        translator = UpperTranslator("ES", source_locale="EN", skip=[], sleep=0)
+        result = translator.translate(get_nested_data(5000))
+        for idx in range(5000):
+            result = result["key"] if isinstance(result, dict) else result[0]
+        self.assertEqual(result, "LEAF")
+
+    def test_translate_deeply_nested_with_key_filter(self):
+        """Test deeply nested data is translated with the key filter states."""
+        translator = UpperTranslator("ES", source_locale="EN", skip=["id"], sleep=0)
+        data = get_nested_data(5000)
+        result = translator.translate({"id": data, "text": data})
+        for key, text in (("id", "leaf"), ("text", "LEAF")):
+            value = result[key]
+            for idx in range(5000):
+                value = value["key"] if isinstance(value, dict) else value[0]
+            self.assertEqual(value, text)
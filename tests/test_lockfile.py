@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate import files, lockfile
+
+
+class LockfileTest(unittest.TestCase):
+    """Tests for lockfile module."""
+
+    def setUp(self):
+        """Create a temporary folder with a translated file and its lockfile."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_file = Path(self.tmp_dir.name) / "en.json"
+        self.output_file = Path(self.tmp_dir.name) / "fr.json"
+        source = {
+            "edited": "Hello",
+            "kept": "Bye",
+            "removed": "Yes",
+            "block": {"removed": "No"},
+            "list": ["One", "Two"],
+        }
+        lockfile.write_lockfile(self.output_file, source)
+        self.output_file.write_text(
+            json.dumps(
+                {
+                    "edited": "Bonjour",
+                    "kept": "Au revoir",
+                    "removed": "Oui",
+                    "block": {"removed": "Non"},
+                    "list": ["Un", "Deux"],
+                }
+            )
+        )
+        self.source = {
+            "edited": "Hello!",
+            "kept": "Bye",
+            "list": ["One", "Three"],
+            "added": "Thanks",
+        }
+        self.input_file.write_text(json.dumps(self.source))
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def test_lockfile_is_written_next_to_output(self):
+        """It writes the lockfile next to the output file."""
+        self.assertTrue(Path(f"{self.output_file}.lock").exists())
+
+    def test_get_changed_paths(self):
+        """It returns the paths of the strings with other hash."""
+        lock = lockfile.read_lockfile(self.output_file)
+        self.assertEqual(
+            lockfile.get_changed_paths(lock, self.source),
+            [("edited",), ("list", 1)],
+        )
+
+    def test_get_removed_paths(self):
+        """It returns the highest removed paths."""
+        lock = lockfile.read_lockfile(self.output_file)
+        self.assertEqual(
+            lockfile.get_removed_paths(lock, self.source),
+            [("block",), ("removed",)],
+        )
+
+    def test_extend_translates_added_and_changed_strings(self):
+        """It returns the added and changed strings to translate."""
+        data = files.get_data_to_translate(
+            self.input_file, output_file=self.output_file, extend=True
+        )
+        self.assertEqual(
+            data,
+            {"edited": "Hello!", "list": ["One", "Three"], "added": "Thanks"},
+        )
+
+    def test_extend_patches_output_file(self):
+        """It adds, replaces and removes the changed paths."""
+        diff = files.get_diff_to_translate(
+            self.input_file, output_file=self.output_file
+        )
+        self.assertEqual(diff.get_values(), ["Thanks", "Hello!", "Three"])
+        files.save_results_file(
+            ["Merci", "Bonjour !", "Trois"],
+            self.output_file,
+            extend=True,
+            patch=diff,
+        )
+        self.assertEqual(
+            json.loads(self.output_file.read_text()),
+            {
+                "edited": "Bonjour !",
+                "kept": "Au revoir",
+                "list": ["Un", "Trois"],
+                "added": "Merci",
+            },
+        )
+
+    def test_extend_only_selected_paths(self):
+        """It translates the selected paths and leaves the others for a later run."""
+        diff = files.get_diff_to_translate(
+            self.input_file, output_file=self.output_file, only=["edited", "list"]
+        )
+        self.assertEqual(diff.get_values(), ["Hello!", "Three"])
+        files.save_results_file(
+            ["Bonjour !", "Trois"], self.output_file, extend=True, patch=diff
+        )
+        lockfile.write_lockfile(
+            self.output_file,
+            self.source,
+            source_file=self.input_file,
+            only=["edited", "list"],
+        )
+        self.assertIsNone(lockfile.read_lockfile_source(self.output_file))
+
+        diff = files.get_diff_to_translate(
+            self.input_file, output_file=self.output_file
+        )
+        self.assertEqual(diff.get_paths(), [("added",)])
+
+    def test_unselected_strings_are_translated_later(self):
+        """It doesn't store the hash of the strings left in the source language."""
+        lockfile.get_lockfile_path(self.output_file).unlink()
+        self.output_file.write_text(json.dumps({**self.source, "edited": "Bonjour !"}))
+        lockfile.write_lockfile(self.output_file, self.source, only=["edited"])
+        lock = lockfile.read_lockfile(self.output_file)
+        self.assertEqual(
+            lockfile.get_changed_paths(lock, self.source),
+            [("kept",), ("list", 0), ("list", 1), ("added",)],
+        )
+
+    def test_list_elements_are_hashed_by_identity(self):
+        """It doesn't mark the strings after a removed list element as changed."""
+        source = {
+            "items": [
+                {"id": 1, "text": "One"},
+                {"id": 2, "text": "Two"},
+                {"id": 3, "text": "Three"},
+            ]
+        }
+        lockfile.write_lockfile(self.output_file, source, identity_key="id")
+        lock = lockfile.read_lockfile(self.output_file, identity_key="id")
+        self.assertIn("/items/id=2/text", lock)
+        self.assertIsNone(lockfile.read_lockfile(self.output_file))
+
+        edited = {
+            "items": [
+                {"id": 3, "text": "Three"},
+                {"id": 2, "text": "Two!"},
+            ]
+        }
+        self.assertEqual(
+            lockfile.get_changed_paths(lock, edited, identity_key="id"),
+            [("items", 1, "text")],
+        )
+        self.assertEqual(
+            lockfile.get_removed_paths(lock, edited, identity_key="id"), []
+        )
+
+    def test_extend_list_by_identity(self):
+        """It only translates the changed elements of a reordered list."""
+        source = {"items": [{"id": 1, "text": "One"}, {"id": 2, "text": "Two"}]}
+        lockfile.write_lockfile(self.output_file, source, identity_key="id")
+        self.output_file.write_text(
+            json.dumps({"items": [{"id": 1, "text": "Un"}, {"id": 2, "text": "Deux"}]})
+        )
+        self.input_file.write_text(
+            json.dumps(
+                {"items": [{"id": 2, "text": "Two"}, {"id": 3, "text": "Three"}]}
+            )
+        )
+        diff = files.get_diff_to_translate(
+            self.input_file, output_file=self.output_file, identity_key="id"
+        )
+        self.assertEqual(diff.get_values(), [{"id": 3, "text": "Three"}])
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from json_translate.lru import LRUCache
+
+
+def get_size(key: str, value: str) -> int:
+    """Measure entries by their value length."""
+    return len(value)
+
+
+class LRUCacheTest(unittest.TestCase):
+    """Tests for lru module."""
+
+    def test_discard_and_items(self):
+        """It lists the entries from the least recently used, and removes them."""
+        cache = LRUCache(100, get_size=get_size)
+        cache.set_many([("a", "aa"), ("b", "bb"), ("c", "cc")])
+        cache.get("a")
+        self.assertEqual(cache.items(), [("b", "bb"), ("c", "cc"), ("a", "aa")])
+        self.assertEqual(cache.discard(["a", "b", "d"]), 2)
+        self.assertEqual(cache.items(), [("c", "cc")])
+        self.assertEqual(cache.size, 2)
+
+    def test_evicts_least_recently_used(self):
+        """It evicts the least recently used entries beyond the budget."""
+        cache = LRUCache(10, get_size=get_size)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        self.assertEqual(cache.get("a"), "aaaa")
+        cache.set("c", "cccc")
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(
+            cache.get_counters(),
+            {
+                "entries": 2,
+                "bytes": 8,
+                "max_bytes": 10,
+                "hits": 1,
+                "misses": 1,
+                "evictions": 1,
+            },
+        )
+
+    def test_replaced_and_oversized_values(self):
+        """It updates the size of replaced entries and never keeps values beyond the budget."""
+        cache = LRUCache(10, get_size=get_size)
+        cache.set("a", "aaaa")
+        cache.set("a", "aa")
+        cache.set("b", "b" * 11)
+        self.assertEqual((len(cache), cache.size), (1, 2))
+
+    def test_concurrent_access(self):
+        """It keeps its size consistent with several threads."""
+        cache = LRUCache(1000, get_size=get_size)
+
+        def work(thread: int):
+            for idx in range(500):
+                cache.set((thread, idx % 50), "x" * (idx % 7))
+                cache.get((thread, (idx * 3) % 50))
+
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(cache.size, 1000)
+        self.assertEqual(
+            cache.size, sum(get_size(key, value) for key, value in cache.items())
+        )
+        self.assertEqual(cache.get_counters()["entries"], len(cache.items()))
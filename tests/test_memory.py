@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from json_translate.memory import TranslationMemory
+
+
+def make_key(source: str, target_locale: str = "ES", **kwargs) -> tuple:
+    """Build a translation memory key for tests."""
+    return TranslationMemory.make_key(
+        service="deepl",
+        source_locale="EN",
+        target_locale=target_locale,
+        source=source,
+        **kwargs,
+    )
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    """Tests for memory module."""
+
+    def setUp(self):
+        """Create a temporary folder for the database."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "memory.sqlite"
+
+    def tearDown(self):
+        """Remove the temporary folder."""
+        self.tmp_dir.cleanup()
+
+    def test_get_returns_none_if_not_stored(self):
+        """It returns None for unknown keys."""
+        self.assertIsNone(TranslationMemory().get(make_key("Hello")))
+
+    def test_translations_are_kept_between_instances(self):
+        """It persists translations in the database file."""
+        memory = TranslationMemory(self.path)
+        memory.set(make_key("Hello"), "Hola")
+        memory.close()
+        self.assertEqual(TranslationMemory(self.path).get(make_key("Hello")), "Hola")
+
+    def test_options_are_part_of_the_key(self):
+        """It stores translations with different options apart."""
+        memory = TranslationMemory()
+        memory.set(make_key("Hello", glossary="abc"), "Hola")
+        self.assertIsNone(memory.get(make_key("Hello")))
+        self.assertIsNone(memory.get(make_key("Hello", target_locale="FR")))
+        self.assertEqual(memory.get(make_key("Hello", glossary="abc")), "Hola")
+
+    def test_prune_filters_by_locale(self):
+        """It removes only the entries matching the filters."""
+        memory = TranslationMemory()
+        memory.set(make_key("Hello"), "Hola")
+        memory.set(make_key("Hello", target_locale="FR"), "Bonjour")
+        self.assertEqual(memory.prune(target_locale="fr"), 1)
+        self.assertEqual(len(memory), 1)
+        self.assertEqual(memory.prune(older_than=1), 0)
+
+    def test_iter_entries(self):
+        """It iterates over the entries in batches, filtered by target locale."""
+        memory = TranslationMemory()
+        memory.set_many([(make_key(f"Text {idx}"), f"Texto {idx}") for idx in range(5)])
+        memory.set(make_key("Hello", "FR"), "Bonjour")
+        entries = list(memory.iter_entries(target_locale="es", batch_size=2))
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(entries[0], (make_key("Text 0"), "Texto 0"))
+
+    def test_lookups_are_cached(self):
+        """It serves repeated lookups from the in-process cache, until pruned."""
+        memory = TranslationMemory(self.path)
+        memory.set(make_key("Hello"), "Hola")
+        self.assertEqual(memory.get(make_key("Hello")), "Hola")
+        memory.set(make_key("Hello"), "¡Hola!")
+        self.assertEqual(memory.get(make_key("Hello")), "¡Hola!")
+        self.assertEqual(memory.cache.get_counters()["hits"], 1)
+        memory.prune(target_locale="ES")
+        self.assertIsNone(memory.get(make_key("Hello")))
+
+    def test_cache_is_bounded(self):
+        """It keeps the entries beyond the cache budget in the database."""
+        memory = TranslationMemory(self.path, cache_size=1000)
+        memory.set_many(
+            [(make_key(f"Text {idx}"), f"Texto {idx}") for idx in range(100)]
+        )
+        for idx in range(100):
+            memory.get(make_key(f"Text {idx}"))
+        self.assertLessEqual(memory.cache.size, 1000)
+        self.assertGreater(memory.cache.evictions, 0)
+        self.assertEqual(memory.get(make_key("Text 0")), "Texto 0")
+
+    def test_memory_without_file_is_bounded(self):
+        """It keeps the translations in the in-process cache only, within its budget."""
+        memory = TranslationMemory(cache_size=1000)
+        self.assertFalse(memory.persistent)
+        memory.set_many(
+            [(make_key(f"Text {idx}"), f"Texto {idx}") for idx in range(100)]
+        )
+        self.assertLessEqual(memory.cache.size, 1000)
+        self.assertEqual(len(memory), len(memory.cache))
+        self.assertLess(len(memory), 100)
+        self.assertIsNone(memory.get(make_key("Text 0")))
+        self.assertEqual(memory.get(make_key("Text 99")), "Texto 99")
+        self.assertEqual(
+            memory.stats(), [("deepl", "EN", "ES", len(memory), 7 * len(memory))]
+        )
+
+    def test_concurrent_writers(self):
+        """It supports several connections writing to the same file."""
+        memories = [TranslationMemory(self.path) for _ in range(4)]
+
+        def write(idx: int, memory: TranslationMemory):
+            memory.set_many([(make_key(f"{idx}-{num}"), str(num)) for num in range(50)])
+
+        threads = [
+            threading.Thread(target=write, args=(idx, memory))
+            for idx, memory in enumerate(memories)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(TranslationMemory(self.path)), 200)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate.placeholders import (
+    mask,
+    mask_translation,
+    unmask,
+    has_same_tokens,
+    is_translatable,
+)
+
+
+class PlaceholdersTest(unittest.TestCase):
+    """Tests for placeholders module."""
+
+    def test_mask(self):
+        """It replaces each placeholder syntax with numbered tokens."""
+        cases = (
+            ("Hello {name}", "Hello {0}", ("{name}",)),
+            ("{{count}} items $t(more)", "{0} items {1}", ("{{count}}", "$t(more)")),
+            (
+                "Total: {amount, number, currency}",
+                "Total: {0}",
+                ("{amount, number, currency}",),
+            ),
+            (
+                "%s has %d items, %.2f%%",
+                "{0} has {1} items, {2}{3}",
+                ("%s", "%d", "%.2f", "%%"),
+            ),
+            ("%(name)s and %1$s", "{0} and {1}", ("%(name)s", "%1$s")),
+            (
+                '<a href="/x">Link</a><br/>',
+                "{0}Link{1}{2}",
+                ('<a href="/x">', "</a>", "<br/>"),
+            ),
+            ("100% sure, 1 < 2 > 0", "100% sure, 1 < 2 > 0", ()),
+            (
+                "{n, plural, one {# item} other {# items}}",
+                "{n, plural, one {# item} other {# items}}",
+                (),
+            ),
+        )
+        for text, masked_text, placeholders in cases:
+            with self.subTest(text=text):
+                self.assertEqual(mask(text), (masked_text, placeholders))
+                self.assertEqual(unmask(masked_text, placeholders), text)
+
+    def test_same_mask_for_same_template(self):
+        """It masks strings differing only in their placeholders the same way."""
+        self.assertEqual(mask("Hello {name}")[0], mask("Hello {user}")[0])
+
+    def test_mask_translation(self):
+        """It masks a translation with the tokens of the same source placeholders."""
+        _masked, placeholders = mask("<b>{count}</b> items of {name}")
+        self.assertEqual(
+            mask_translation("{name} a <b>{count}</b> éléments", placeholders),
+            "{3} a {0}{1}{2} éléments",
+        )
+        self.assertIsNone(mask_translation("{name} a des éléments", placeholders))
+        self.assertIsNone(
+            mask_translation("<b>{count}</b> {user} {name}", placeholders)
+        )
+
+    def test_unmask_reordered_tokens(self):
+        """It restores placeholders moved by the translation."""
+        self.assertEqual(unmask("{1} de {0}", ("{a}", "{b}")), "{b} de {a}")
+
+    def test_has_same_tokens(self):
+        """It checks all the tokens survived the translation."""
+        self.assertTrue(has_same_tokens("{0} and {1}", "{1} y {0}"))
+        self.assertFalse(has_same_tokens("{0} and {1}", "{0} y"))
+        self.assertFalse(has_same_tokens("{0}", "{ 0 }"))
+
+    def test_is_translatable(self):
+        """It checks there is text besides the tokens."""
+        self.assertTrue(is_translatable("Hello {0}"))
+        self.assertFalse(is_translatable("{0}: {1}"))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate.lockfile import write_lockfile
+from json_translate.project import (
+    find_catalogs,
+    get_target_path,
+    is_up_to_date,
+    validate_patterns,
+)
+
+
+class ProjectTest(unittest.TestCase):
+    """Tests for project module."""
+
+    def setUp(self):
+        """Create a project in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        for path in (
+            "locales/en/common.json",
+            "locales/en/admin/users.json",
+            "locales/en/.drafts/draft.json",
+            "locales/fr/common.json",
+            "src/app/en.json",
+            "src/app/fr.json",
+            "node_modules/lib/locales/en/common.json",
+        ):
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_text('{"hello": "Hello"}', encoding="utf-8")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def test_find_catalogs(self):
+        """It finds the source catalogs recursively, skipping hidden directories."""
+        self.assertEqual(
+            find_catalogs(self.root, "locales/{lang}/**/*.json", "EN"),
+            [
+                self.root / "locales/en/admin/users.json",
+                self.root / "locales/en/common.json",
+            ],
+        )
+        self.assertEqual(
+            find_catalogs(self.root, "**/{lang}.json", "en"),
+            [self.root / "src/app/en.json"],
+        )
+
+    def test_get_target_path(self):
+        """It replaces the language and keeps the wildcard values."""
+        kwargs = {"root": self.root, "source_lang": "EN", "target_lang": "PT-BR"}
+        self.assertEqual(
+            get_target_path(
+                self.root / "locales/en/admin/users.json",
+                source_pattern="locales/{lang}/**/*.json",
+                target_pattern="locales/{lang}/**/*.json",
+                **kwargs,
+            ),
+            self.root / "locales/pt-br/admin/users.json",
+        )
+        self.assertEqual(
+            get_target_path(
+                self.root / "src/app/en.json",
+                source_pattern="src/**/{lang}.json",
+                target_pattern="dist/**/{lang}.json",
+                **kwargs,
+            ),
+            self.root / "dist/app/pt-br.json",
+        )
+
+    def test_validate_patterns(self):
+        """It requires the language and the same wildcards in both patterns."""
+        self.assertIsNone(validate_patterns("{lang}/**/*.json", "out/{lang}/**/*.json"))
+        self.assertIsNotNone(validate_patterns("**/*.json", "{lang}/**/*.json"))
+        self.assertIsNotNone(validate_patterns("{lang}/**/*.json", "{lang}/*.json"))
+
+    def test_is_up_to_date(self):
+        """It compares the source hash with the one of the target lockfile."""
+        source_file = self.root / "locales/en/common.json"
+        target_file = self.root / "locales/fr/common.json"
+        self.assertFalse(is_up_to_date(source_file, target_file))
+
+        write_lockfile(target_file, {"hello": "Hello"}, source_file=source_file)
+        self.assertTrue(is_up_to_date(source_file, target_file))
+
+        source_file.write_text(json.dumps({"hello": "Hi"}), encoding="utf-8")
+        self.assertFalse(is_up_to_date(source_file, target_file))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from json_translate.ratelimit import (
+    RateLimiter,
+    RetryableError,
+    CircuitOpenError,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Tests for TokenBucket."""
+
+    def test_burst_does_not_wait(self):
+        """It doesn't wait while there are tokens."""
+        bucket = TokenBucket(10)
+        self.assertEqual(sum(bucket.acquire() for _ in range(10)), 0)
+
+    def test_waits_when_empty(self):
+        """It waits for tokens to be refilled."""
+        bucket = TokenBucket(100, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+
+class RateLimiterTest(unittest.TestCase):
+    """Tests for RateLimiter."""
+
+    def test_parse_retry_after(self):
+        """It parses seconds and dates."""
+        self.assertEqual(parse_retry_after("3"), 3)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after(None))
+
+    @patch("time.sleep")
+    def test_retries_retryable_errors(self, sleep: MagicMock):
+        """It retries temporary errors, waiting at least Retry-After."""
+        func = MagicMock(side_effect=[RetryableError("429", retry_after=2), "ok"])
+        limiter = RateLimiter(backoff=0.1)
+        self.assertEqual(limiter.call(func, "text"), "ok")
+        func.assert_called_with("text")
+        self.assertGreaterEqual(sleep.call_args.args[0], 2)
+
+    @patch("time.sleep")
+    def test_raises_when_retries_are_exhausted(self, _sleep: MagicMock):
+        """It raises the error after the last retry."""
+        func = MagicMock(side_effect=RetryableError("429"))
+        with self.assertRaises(RetryableError):
+            RateLimiter(retries=2).call(func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_other_errors_are_not_retried(self):
+        """It doesn't retry other exceptions."""
+        func = MagicMock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            RateLimiter().call(func)
+        self.assertEqual(func.call_count, 1)
+
+    @patch("time.sleep")
+    def test_circuit_opens_after_consecutive_failures(self, _sleep: MagicMock):
+        """It stops calling the API after too many consecutive failures."""
+        func = MagicMock(side_effect=RetryableError("503"))
+        limiter = RateLimiter(retries=0, failure_threshold=2)
+        for _ in range(2):
+            with self.assertRaises(RetryableError):
+                limiter.call(func)
+        with self.assertRaises(CircuitOpenError):
+            limiter.call(func)
+        self.assertEqual(func.call_count, 2)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import unittest
+from json_translate.memory import TranslationMemory
+from json_translate.seed import get_catalog_pairs, make_entries, seed_memory
+from json_translate.translators.aws import AWSTranslator
+from json_translate.translators.deepl import DeepLTranslator
+
+
+def make_key(
+    source: str, service: str = "deepl", source_locale="EN", **options
+) -> tuple:
+    """Build a translation memory key for tests."""
+    return TranslationMemory.make_key(
+        service=service,
+        source_locale=source_locale,
+        target_locale="FR",
+        source=source,
+        **options,
+    )
+
+
+class SeedTest(unittest.TestCase):
+    """Tests for seed module."""
+
+    def test_get_catalog_pairs(self):
+        """It pairs the source and translated values by key path."""
+        self.assertEqual(
+            get_catalog_pairs(
+                {"a": "Hello", "b": {"c": "Bye"}, "d": "New"},
+                {"a": "Bonjour", "b": {"c": "Au revoir"}},
+            ),
+            [("Hello", "Bonjour"), ("Bye", "Au revoir")],
+        )
+
+    def test_make_entries(self):
+        """It stores translated texts masked, leaving out the untranslated ones."""
+        entries = make_entries(
+            [
+                ("Hello {name}", "Bonjour {name}"),
+                ("OK", "OK"),
+                ("Empty", ""),
+                ("{count} items", "éléments"),
+                (1, 1),
+            ],
+            translators=[DeepLTranslator, AWSTranslator],
+            source_locale="en",
+            target_locale="fr",
+        )
+        self.assertEqual(
+            entries,
+            [
+                (make_key("Hello {0}"), "Bonjour {0}"),
+                (make_key("Hello {0}", source_locale=None), "Bonjour {0}"),
+                (make_key("Hello {0}", "aws", formality="INFORMAL"), "Bonjour {0}"),
+            ],
+        )
+
+    def test_make_entries_with_options(self):
+        """It stores the translations with the options of each translator."""
+        entries = make_entries(
+            [("Hello", "Bonjour")],
+            translators=[DeepLTranslator, AWSTranslator],
+            source_locale="en",
+            target_locale="fr",
+            glossary="g1",
+            formality=True,
+            profanity=True,
+        )
+        self.assertEqual(
+            [key for key, _translation in entries],
+            [
+                make_key("Hello", glossary="g1"),
+                make_key("Hello", source_locale=None, glossary="g1"),
+                make_key("Hello", "aws", formality="FORMAL", profanity="MASK"),
+            ],
+        )
+
+    def test_seeded_memory_is_used_by_translators(self):
+        """It stores the entries translators look up."""
+        memory = TranslationMemory()
+        entries = make_entries(
+            [("Hello {name}", "Bonjour {name}")],
+            translators=[AWSTranslator],
+            source_locale="en",
+            target_locale="fr",
+        )
+        self.assertEqual(seed_memory(memory, entries, batch_size=1), 1)
+        translator = AWSTranslator(
+            "fr", source_locale="en", client=object(), memory=memory, sleep=0
+        )
+        self.assertEqual(
+            translator.translate({"a": "Hello {name}"}), {"a": "Bonjour {name}"}
+        )
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+from urllib import request, error
+from json_translate.server import JSONServer, RequestError
+
+
+def fail(_body):
+    """Raise an unexpected error."""
+    raise ValueError("boom")
+
+
+def reject(_body):
+    """Raise a request error."""
+    raise RequestError("bad request")
+
+
+class JSONServerTest(unittest.TestCase):
+    """Tests for server module."""
+
+    def setUp(self):
+        """Start a server on a free port."""
+        self.server = JSONServer(
+            {
+                ("GET", "/health"): lambda _body: {"status": "ok"},
+                ("POST", "/echo"): lambda body: {"body": body},
+                ("GET", "/fail"): fail,
+                ("POST", "/reject"): reject,
+            },
+            port=0,
+            token="secret",
+        ).start()
+
+    def tearDown(self):
+        """Stop the server."""
+        self.server.shutdown()
+
+    def send(self, path: str, body=None, **headers) -> tuple:
+        """Send a request with the token and get the response status and data."""
+        data = None if body is None else body.encode()
+        headers = {
+            "Authorization": "Bearer secret",
+            "Content-Type": "application/json",
+            **headers,
+        }
+        req = request.Request(
+            self.server.url + path,
+            data=data,
+            headers={
+                name: value for name, value in headers.items() if value is not None
+            },
+        )
+        try:
+            with request.urlopen(req, timeout=5) as response:  # noqa: S310
+                return response.status, json.loads(response.read())
+        except error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    def test_get(self):
+        """It answers GET requests with the route result."""
+        self.assertEqual(self.send("/health"), (200, {"status": "ok"}))
+
+    def test_post_passes_json_body(self):
+        """It passes the json body of POST requests to the route."""
+        status, data = self.send("/echo", '{"text": "Héllo"}')
+        self.assertEqual(status, 200)
+        self.assertEqual(data, {"body": {"text": "Héllo"}})
+
+    def test_unknown_route(self):
+        """It answers 404 to unknown routes and methods."""
+        self.assertEqual(self.send("/nope")[0], 404)
+        self.assertEqual(self.send("/echo")[0], 404)
+
+    def test_invalid_json(self):
+        """It answers 400 to invalid json bodies."""
+        self.assertEqual(self.send("/echo", "{not json")[0], 400)
+
+    def test_request_error(self):
+        """It answers 400 with the message of request errors."""
+        self.assertEqual(self.send("/reject", "{}"), (400, {"error": "bad request"}))
+
+    def test_unexpected_error(self):
+        """It answers 500 to unexpected errors and keeps serving."""
+        self.assertEqual(self.send("/fail"), (500, {"error": "boom"}))
+        self.assertEqual(self.send("/health")[0], 200)
+
+    def test_token_is_required(self):
+        """It answers 401 to requests without the session token."""
+        self.assertEqual(self.send("/health", Authorization=None)[0], 401)
+        self.assertEqual(self.send("/health", Authorization="Bearer nope")[0], 401)
+
+    def test_random_token(self):
+        """It generates a token per server if none is set."""
+        servers = [JSONServer({}, port=0) for _ in range(2)]
+        for server in servers:
+            server.httpd.server_close()
+        self.assertGreaterEqual(len(servers[0].token), 32)
+        self.assertNotEqual(servers[0].token, servers[1].token)
+
+    def test_host_and_origin_are_checked(self):
+        """It answers 403 to requests for another host or from another origin."""
+        port = self.server.httpd.server_address[1]
+        self.assertEqual(self.send("/health", Host=f"localhost:{port}")[0], 200)
+        self.assertEqual(self.send("/health", Host=f"evil.example:{port}")[0], 403)
+        origin = f"http://127.0.0.1:{port}"
+        self.assertEqual(self.send("/health", Origin=origin)[0], 200)
+        self.assertEqual(self.send("/health", Origin="http://evil.example")[0], 403)
+
+    def test_json_content_type_is_required(self):
+        """It answers 415 to POST requests whose body isn't json."""
+        status, _data = self.send("/echo", "{}", **{"Content-Type": "text/plain"})
+        self.assertEqual(status, 415)
+        status, _data = self.send(
+            "/echo", "{}", **{"Content-Type": "application/json; charset=utf-8"}
+        )
+        self.assertEqual(status, 200)
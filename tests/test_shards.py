@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import unittest
+from pathlib import Path
+from json_translate.shards import (
+    ShardError,
+    ShardTranslations,
+    parse_shard,
+    get_shard,
+    get_shard_path,
+    get_shard_leaves,
+    write_shard,
+    read_shard,
+    check_shards,
+)
+from json_translate.paths import to_pointer
+
+DATA = {
+    "title": "Hello",
+    "pages": [
+        {"id": idx, "text": f"Page {idx}", "tags": ["a", "b"]} for idx in range(20)
+    ],
+    "meta": {"count": 3, "author": "Me"},
+}
+
+
+class ShardsTest(unittest.TestCase):
+    """Tests for shards module."""
+
+    def test_parse_shard(self):
+        """It parses shard arguments and rejects invalid ones."""
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        self.assertEqual(parse_shard(" 1/1 "), (1, 1))
+        for value in ("0/4", "5/4", "1", "a/b", "-1/2"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_get_shard_is_stable(self):
+        """It assigns the same shard to a key path in every process."""
+        self.assertEqual(get_shard("/title", 4), 3)
+        self.assertEqual(get_shard("/pages/0/text", 4), 1)
+        self.assertEqual(get_shard("/meta/author", 4), 4)
+        self.assertEqual(get_shard("/title", 1), 1)
+
+    def test_get_shard_path(self):
+        """It names shard files after the output file."""
+        self.assertEqual(
+            get_shard_path(Path("locales/fr.json"), 1, 4),
+            Path("locales/fr.shard-1-of-4.json"),
+        )
+
+    def test_get_shard_leaves_partitions_strings(self):
+        """It assigns every string to exactly one shard."""
+        shards = [get_shard_leaves([()], [DATA], index, 3) for index in (1, 2, 3)]
+        paths = [path for shard_paths, _strings in shards for path in shard_paths]
+        self.assertEqual(len(paths), 62)
+        self.assertEqual(len(set(paths)), 62)
+        self.assertTrue(all(strings for _paths, strings in shards))
+        for shard_paths, strings in shards:
+            self.assertTrue(all(isinstance(string, str) for string in strings))
+            self.assertEqual(len(shard_paths), len(strings))
+
+        # Values located at paths keep their full path
+        paths, strings = get_shard_leaves([("pages", 1)], [DATA["pages"][1]], 1, 1)
+        self.assertEqual(
+            paths,
+            [("pages", 1, "text"), ("pages", 1, "tags", 0), ("pages", 1, "tags", 1)],
+        )
+        self.assertEqual(strings, ["Page 1", "a", "b"])
+
+    def test_write_and_read_shard(self):
+        """It saves the translations of a shard along with its metadata."""
+        with tempfile.TemporaryDirectory() as directory:
+            shard_file = Path(directory) / "fr.shard-1-of-2.json"
+            write_shard(
+                shard_file, {"/title": "Bonjour"}, index=1, count=2, output="fr.json"
+            )
+            self.assertEqual(
+                read_shard(shard_file),
+                ({"index": 1, "count": 2, "output": "fr.json"}, {"/title": "Bonjour"}),
+            )
+
+            other_file = Path(directory) / "fr.json"
+            other_file.write_text('{"title": "Bonjour"}', encoding="utf-8")
+            with self.assertRaises(ShardError):
+                read_shard(other_file)
+
+    def test_check_shards(self):
+        """It detects missing, duplicate and inconsistent shards."""
+        metadata = {"count": 3, "output": "fr.json", "source": "abc"}
+        shards = [(f"{idx}.json", dict(metadata, index=idx)) for idx in (1, 2, 3)]
+        check_shards(shards)
+
+        with self.assertRaisesRegex(ShardError, "missing shards of fr.json: 2 of 3"):
+            check_shards([shards[0], shards[2]])
+        with self.assertRaisesRegex(ShardError, "duplicate shard 1/3"):
+            check_shards([*shards, ("copy.json", dict(metadata, index=1))])
+        with self.assertRaisesRegex(ShardError, "differ in source"):
+            check_shards(
+                [*shards[:2], ("3.json", dict(metadata, index=3, source="def"))]
+            )
+        with self.assertRaisesRegex(ShardError, "differ in count"):
+            check_shards([*shards[:2], ("3.json", dict(metadata, index=3, count=4))])
+
+    def test_shard_translations(self):
+        """It rebuilds the document a single run would have translated."""
+        translations = {}
+        for index in (1, 2, 3):
+            paths, strings = get_shard_leaves([()], [DATA], index, 3)
+            translations.update(
+                {
+                    to_pointer(path): string.upper()
+                    for path, string in zip(paths, strings)
+                }
+            )
+
+        translator = ShardTranslations(translations)
+        result = translator.translate(DATA)
+        self.assertEqual(list(result), ["title", "pages", "meta"])
+        self.assertEqual(result["title"], "HELLO")
+        self.assertEqual(
+            result["pages"][4], {"id": 4, "text": "PAGE 4", "tags": ["A", "B"]}
+        )
+        self.assertEqual(result["meta"], {"count": 3, "author": "ME"})
+        self.assertEqual(
+            translator.translate_values(
+                [("meta",), ("title",)], [DATA["meta"], "Hello"]
+            ),
+            [{"count": 3, "author": "ME"}, "HELLO"],
+        )
+
+    def test_deeply_nested(self):
+        """It doesn't reach the recursion limit with deeply nested data."""
+        data = "leaf"
+        for _ in range(5000):
+            data = {"key": data}
+        paths, strings = get_shard_leaves([("root",)], [data], 1, 1)
+        self.assertEqual(paths, [("root",) + ("key",) * 5000])
+        self.assertEqual(strings, ["leaf"])
+
+        result = ShardTranslations({to_pointer(paths[0]): "LEAF"}).translate_values(
+            [("root",)], [data]
+        )[0]
+        for _ in range(5000):
+            result = result["key"]
+        self.assertEqual(result, "LEAF")
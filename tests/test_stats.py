@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from json_translate.memory import TranslationMemory
+from json_translate.stats import RunStats
+
+
+class RunStatsTest(unittest.TestCase):
+    """Tests for stats module."""
+
+    def test_record_request(self):
+        """It counts requests, billable characters and errors by status."""
+        stats = RunStats()
+        stats.record_request(0.003, characters=10)
+        stats.record_request(0.040, characters=5)
+        stats.record_request(0.020, characters=7, error="429")
+        stats.record_retries(1)
+
+        data = stats.to_dict()
+        self.assertEqual(data["requests"], 3)
+        self.assertEqual(data["retries"], 1)
+        self.assertEqual(data["billable_characters"], 15)
+        self.assertEqual(data["errors"], {"429": 1})
+        self.assertEqual(data["latency_ms"]["max"], 40)
+        histogram = data["latency_ms"]["histogram"]
+        self.assertEqual(histogram["le_5"], 1)
+        self.assertEqual(histogram["le_25"], 1)
+        self.assertEqual(histogram["le_50"], 1)
+        self.assertEqual(sum(histogram.values()), 3)
+
+    def test_latency_percentiles(self):
+        """It estimates percentiles from the histogram buckets."""
+        stats = RunStats()
+        for _ in range(98):
+            stats.record_request(0.008)
+        stats.record_request(0.2)
+        stats.record_request(30)
+
+        data = stats.to_dict()
+        self.assertEqual(data["latency_ms"]["p50"], 10)
+        self.assertEqual(data["latency_ms"]["p99"], 250)
+        self.assertEqual(RunStats().to_dict()["latency_ms"]["p50"], None)
+        self.assertEqual(stats.get_latency_percentile(100), 30000)
+
+    def test_stages_and_cache(self):
+        """It sums stage wall times and counts cache lookups."""
+        stats = RunStats()
+        with stats.stage("translate"):
+            pass
+        with stats.stage("translate"):
+            pass
+        stats.record_cache(hits=2)
+        stats.record_cache(misses=1)
+
+        data = stats.to_dict()
+        self.assertEqual(list(data["stages"]), ["translate"])
+        self.assertEqual(data["cache"], {"hits": 2, "misses": 1})
+        self.assertNotIn("memory_cache", data)
+
+    def test_memory_cache_counters(self):
+        """It adds the counters of the translation memory cache."""
+        memory = TranslationMemory(cache_size=2**20)
+        memory.get(
+            TranslationMemory.make_key(
+                service="deepl", source_locale="EN", target_locale="ES", source="Hi"
+            )
+        )
+        data = RunStats().to_dict(memory=memory)
+        self.assertEqual(data["memory_cache"]["misses"], 1)
+        self.assertEqual(data["memory_cache"]["max_bytes"], 2**20)
+
+    def test_write(self):
+        """It writes json to a file or to the standard error."""
+        stats = RunStats()
+        stats.record_request(0.01, characters=3)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / "stats.json"
+            stats.write(output)
+            with Path.open(output, encoding="utf-8") as file:
+                self.assertEqual(json.load(file)["billable_characters"], 3)
+
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            stats.write("-")
+        self.assertEqual(json.loads(stderr.getvalue())["requests"], 1)
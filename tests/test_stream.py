@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+from json_translate import stream
+from json_translate.memory import TranslationMemory
+from json_translate.translators.base import BaseTranslator
+
+DATA = {
+    "text": 'Hello "world" \\ é 😀',
+    "numbers": [0, -1, 2.5, -3e-05, 1e16, 123456789012345678901234567890],
+    "literals": [True, False, None],
+    "empty": {"map": {}, "array": [], "string": ""},
+    "nested": [[{"a": [1, {"b": "c"}]}], []],
+    "skip": {"inner": "Hello"},
+}
+
+
+def events_to_data(events) -> object:
+    """Build data from parser events."""
+    stack = [[]]
+    keys = []
+    for event, value in events:
+        if event == stream.MAP_KEY:
+            keys.append(value)
+            continue
+        if event in (stream.START_MAP, stream.START_ARRAY):
+            stack.append({} if event == stream.START_MAP else [])
+            continue
+        if event in (stream.END_MAP, stream.END_ARRAY):
+            value = stack.pop()
+        container = stack[-1]
+        if isinstance(container, dict):
+            container[keys.pop()] = value
+        else:
+            container.append(value)
+    return stack[0][0]
+
+
+class UpperTranslator(BaseTranslator):
+    """Translator converting strings to uppercase."""
+
+    service = "upper"
+
+    def translate_string(self, text: str) -> str:
+        """Translate a string."""
+        return text.upper()
+
+
+class StreamTest(unittest.TestCase):
+    """Tests for stream module."""
+
+    def test_iter_events_parses_as_json_load(self):
+        """It parses the same data json.load does, whatever the chunk size."""
+        text = json.dumps(DATA, indent=2, ensure_ascii=False)
+        for chunk_size in (1, 3, 64, 2**16):
+            events = stream.iter_events(io.StringIO(text), chunk_size=chunk_size)
+            self.assertEqual(events_to_data(events), DATA)
+
+    def test_iter_events_raises_on_invalid_json(self):
+        """It raises JSONDecodeError on malformed documents."""
+        for text in ('{"a": 1,}', '{"a" 1}', "[1 2]", "[1] 2", "", '{"a": tru}'):
+            with self.subTest(text=text), self.assertRaises(json.JSONDecodeError):
+                list(stream.iter_events(io.StringIO(text), chunk_size=2))
+
+    def test_writer_output_is_the_same_as_json_dump(self):
+        """It writes byte by byte the same json.dump does."""
+        text = json.dumps(DATA)
+        for indent in (None, 0, 2, 4):
+            output = io.StringIO()
+            writer = stream.JSONStreamWriter(output, indent=indent)
+            for event, value in stream.iter_events(io.StringIO(text)):
+                writer.write(event, value)
+            self.assertEqual(
+                output.getvalue(),
+                json.dumps(DATA, indent=indent, ensure_ascii=False),
+            )
+
+    def test_translate_events_is_the_same_as_translate(self):
+        """It translates the same values than translating the whole tree."""
+        translator = UpperTranslator("ES", sleep=0, skip=["skip", "a"])
+        events = stream.iter_events(io.StringIO(json.dumps(DATA)))
+        self.assertEqual(
+            events_to_data(stream.translate_events(translator, events, window=2)),
+            translator.translate(DATA),
+        )
+
+    def test_translate_events_only(self):
+        """It translates the values selected by key paths, like translating the whole tree."""
+        translator = UpperTranslator(
+            "ES", sleep=0, skip=["skip"], only=["text", "nested.0.*.a.1"]
+        )
+        events = stream.iter_events(io.StringIO(json.dumps(DATA)))
+        results = events_to_data(stream.translate_events(translator, events, window=2))
+        self.assertEqual(results, translator.translate(DATA))
+        self.assertEqual(results["nested"][0][0]["a"][1], {"b": "C"})
+        self.assertEqual(results["skip"], {"inner": "Hello"})
+
+    def test_translate_events_memory_is_bounded(self):
+        """It keeps the translations of distinct strings within the memory budget."""
+        memory = TranslationMemory(cache_size=10000)
+        translator = UpperTranslator("ES", sleep=0, memory=memory)
+        data = [f"Text {idx}" for idx in range(2000)]
+        events = stream.iter_events(io.StringIO(json.dumps(data)))
+        results = events_to_data(
+            stream.translate_events(translator, events, window=100)
+        )
+        self.assertEqual(results, [text.upper() for text in data])
+        self.assertLessEqual(memory.cache.size, 10000)
+        self.assertLess(len(memory), 200)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+from defusedxml import DTDForbidden
+from json_translate.memory import TranslationMemory
+from json_translate.tmx import read_tmx, write_tmx
+
+
+class TMXTest(unittest.TestCase):
+    """Tests for tmx module."""
+
+    def test_round_trip(self):
+        """It reads back the entries it writes, with their service and options."""
+        entries = [
+            (
+                TranslationMemory.make_key(
+                    service="deepl",
+                    source_locale="EN",
+                    target_locale="FR",
+                    source="<Hello> & {0}",
+                    glossary="g1",
+                ),
+                "«Bonjour» & {0}",
+            ),
+            (
+                TranslationMemory.make_key(
+                    service="aws", source_locale="", target_locale="ES", source="Bye"
+                ),
+                "Adiós",
+            ),
+        ]
+        output = io.StringIO()
+        self.assertEqual(write_tmx(output, entries), 2)
+        self.assertEqual(
+            list(read_tmx(io.BytesIO(output.getvalue().encode("utf-8")))),
+            [
+                (
+                    "EN",
+                    "FR",
+                    "<Hello> & {0}",
+                    "«Bonjour» & {0}",
+                    {"x-service": "deepl", "x-glossary": "g1"},
+                ),
+                ("", "ES", "Bye", "Adiós", {"x-service": "aws"}),
+            ],
+        )
+
+    def test_read_units_of_other_tools(self):
+        """It reads every target language of a unit, with inline markup as text."""
+        document = b"""<?xml version="1.0" encoding="UTF-8"?>
+<tmx version="1.4"><header srclang="en-US" datatype="plaintext"/><body>
+  <tu>
+    <tuv xml:lang="de-DE"><seg>Hallo <ph>{name}</ph></seg></tuv>
+    <tuv xml:lang="en-US"><seg>Hello <ph>{name}</ph></seg></tuv>
+    <tuv xml:lang="fr-FR"><seg>Bonjour <ph>{name}</ph></seg></tuv>
+  </tu>
+  <tu><tuv xml:lang="en-US"><seg>Alone</seg></tuv></tu>
+</body></tmx>"""
+        self.assertEqual(
+            list(read_tmx(io.BytesIO(document))),
+            [
+                ("en-US", "de-DE", "Hello {name}", "Hallo {name}", {}),
+                ("en-US", "fr-FR", "Hello {name}", "Bonjour {name}", {}),
+            ],
+        )
+
+    def test_rejects_entities(self):
+        """It rejects the documents declaring a DTD, which could expand entities."""
+        document = b"""<?xml version="1.0"?>
+<!DOCTYPE tmx [<!ENTITY a "aaaaaaaaaa"><!ENTITY b "&a;&a;&a;&a;&a;">]>
+<tmx version="1.4"><body><tu>
+  <tuv xml:lang="en"><seg>&b;</seg></tuv><tuv xml:lang="fr"><seg>&b;</seg></tuv>
+</tu></body></tmx>"""
+        with self.assertRaises(DTDForbidden):
+            list(read_tmx(io.BytesIO(document)))
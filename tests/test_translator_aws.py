@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import re
+import html
+import unittest
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from json_translate.translators.aws import AWSTranslator
+
+
+def translate_text(**kwargs) -> dict:
+    """Mock AWS Translate translate_text response."""
+    return {
+        "TranslatedText": kwargs["Text"][::-1],
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+    }
+
+
+class AWSTranslatorTest(unittest.TestCase):
+    """Test AWS translator."""
+
+    def setUp(self):
+        """Create translator with a mocked client."""
+        with patch("boto3.client"):
+            self.translator = AWSTranslator(
+                "ES", source_locale="EN", sleep=0, workers=4
+            )
+        self.translator.client.translate_text.side_effect = translate_text
+
+    def test_source_locale_is_required(self):
+        """It raises an exception if source locale is not provided."""
+        with patch("boto3.client"), self.assertRaises(Exception):
+            AWSTranslator("ES")
+
+    def test_translate_with_workers(self):
+        """It translates every string once with several workers."""
+        data = {"a": ["abc", "def"], "b": {"c": "abc", "d": "ghi"}}
+        self.assertEqual(
+            self.translator.translate(data),
+            {"a": ["cba", "fed"], "b": {"c": "cba", "d": "ihg"}},
+        )
+        self.assertEqual(self.translator.client.translate_text.call_count, 3)
+
+    def test_translate_string_returns_none_on_error_status(self):
+        """It returns None when the response is not successful."""
+        self.translator.client.translate_text.side_effect = None
+        self.translator.client.translate_text.return_value = {
+            "ResponseMetadata": {"HTTPStatusCode": 500},
+        }
+        self.assertIsNone(self.translator.translate_string("abc"))
+        self.assertEqual(self.translator.translate(["abc"]), ["abc"])
+        self.assertEqual(
+            self.translator.counts, {"cached": 0, "translated": 0, "failed": 1}
+        )
+        self.assertEqual(len(self.translator.memory), 0)
+
+
+def translate_upper(**kwargs) -> dict:
+    """Mock AWS Translate translate_text response, in upper case."""
+    return {
+        "TranslatedText": kwargs["Text"].upper(),
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+    }
+
+
+def translate_document(**kwargs) -> dict:
+    """Mock AWS Translate translate_document response, in upper case."""
+    content = re.sub(
+        r"(<div id=\"\d+\">)(.*?)(</div>)",
+        lambda match: (
+            match.group(1)
+            + html.escape(html.unescape(match.group(2)).upper(), quote=False)
+            + match.group(3)
+        ),
+        kwargs["Document"]["Content"].decode("utf-8"),
+    )
+    return {
+        "TranslatedDocument": {"Content": content.encode("utf-8")},
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+    }
+
+
+class AWSDocumentsTest(unittest.TestCase):
+    """Test AWS translator packing strings in documents."""
+
+    def setUp(self):
+        """Create translator in documents mode with a mocked client."""
+        with patch("boto3.client"):
+            self.translator = AWSTranslator(
+                "ES", source_locale="EN", sleep=0, documents=True
+            )
+        self.translator.client.translate_text.side_effect = translate_upper
+        self.translator.client.translate_document.side_effect = translate_document
+
+    def test_translate_packs_strings(self):
+        """It translates the strings of a batch in a single document."""
+        data = {"a": ["abc", "d & e"], "b": {"c": "abc", "d": "x < y"}}
+        self.assertEqual(
+            self.translator.translate(data),
+            {"a": ["ABC", "D & E"], "b": {"c": "ABC", "d": "X < Y"}},
+        )
+        self.assertEqual(self.translator.client.translate_document.call_count, 1)
+        self.assertEqual(self.translator.client.translate_text.call_count, 0)
+        kwargs = self.translator.client.translate_document.call_args.kwargs
+        self.assertEqual(kwargs["Document"]["ContentType"], "text/html")
+        self.assertIn(b'<div id="1">d &amp; e</div>', kwargs["Document"]["Content"])
+
+    def test_translate_keeps_non_html_spaces(self):
+        """It packs and keeps the spaces html doesn't collapse, like NBSP."""
+        data = ["10\u00a0km", "\u00a0a\u202fb\u00a0", "a\u00a0\u00a0b"]
+        self.assertEqual(
+            self.translator.translate(data), [text.upper() for text in data]
+        )
+        self.assertEqual(self.translator.client.translate_document.call_count, 1)
+        self.assertEqual(self.translator.client.translate_text.call_count, 0)
+
+    def test_batches_fit_the_document_size(self):
+        """It splits the strings in documents within the size limit."""
+        texts = [f"text {idx} " + "x" * 1000 for idx in range(300)]
+        result = self.translator.translate(texts)
+        self.assertEqual(result, [text.upper() for text in texts])
+        calls = self.translator.client.translate_document.call_args_list
+        self.assertEqual(len(calls), 4)
+        self.assertTrue(
+            all(len(call.kwargs["Document"]["Content"]) <= 100 * 1024 for call in calls)
+        )
+
+    def test_fallback_per_string(self):
+        """It sends on their own the strings which don't round-trip the document."""
+
+        def drop_second(**kwargs) -> dict:
+            response = translate_document(**kwargs)
+            content = response["TranslatedDocument"]["Content"].decode("utf-8")
+            content = re.sub(r'<div id="1">.*?</div>', "", content)
+            content = content.replace('<div id="2">', '<div id="2"><b>')
+            response["TranslatedDocument"]["Content"] = content.encode("utf-8")
+            return response
+
+        self.translator.client.translate_document.side_effect = drop_second
+        data = ["abc", "def", "ghi", "jkl", "two\nlines"]
+        self.assertEqual(
+            self.translator.translate(data), ["ABC", "DEF", "GHI", "JKL", "TWO\nLINES"]
+        )
+        self.assertEqual(self.translator.client.translate_document.call_count, 1)
+        self.assertEqual(
+            [
+                call.kwargs["Text"]
+                for call in self.translator.client.translate_text.call_args_list
+            ],
+            ["def", "ghi", "two\nlines"],
+        )
+        self.assertEqual(self.translator.counts["translated"], 5)
+
+    def test_fallback_on_lost_placeholders(self):
+        """It sends on their own the strings whose placeholders were lost."""
+
+        def lose_tokens(**kwargs) -> dict:
+            response = translate_document(**kwargs)
+            content = response["TranslatedDocument"]["Content"].replace(b"{0}", b"")
+            response["TranslatedDocument"]["Content"] = content
+            return response
+
+        self.translator.client.translate_document.side_effect = lose_tokens
+        self.assertEqual(
+            self.translator.translate(["Hi {name}", "Bye"]), ["HI {name}", "BYE"]
+        )
+        self.assertEqual(self.translator.client.translate_text.call_count, 1)
+
+    def test_fallback_on_document_errors(self):
+        """It sends the strings on their own if the document can't be translated."""
+        self.translator.client.translate_document.side_effect = ClientError(
+            {"Error": {"Code": "ValidationException"}}, "TranslateDocument"
+        )
+        self.assertEqual(self.translator.translate(["abc", "def"]), ["ABC", "DEF"])
+        self.assertEqual(self.translator.client.translate_text.call_count, 2)
+
+    def test_auto_source_locale_sends_strings(self):
+        """It doesn't pack strings when the source language is detected."""
+        with patch("boto3.client"):
+            translator = AWSTranslator("ES", source_locale="auto", documents=True)
+        self.assertFalse(translator.documents)
+        self.assertEqual(translator.max_batch_texts, 1)
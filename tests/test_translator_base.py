@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import time
+import random
+import threading
+import unittest
+from json_translate.memory import TranslationMemory
+from json_translate.translators.base import BaseTranslator
+
+
+class UpperTranslator(BaseTranslator):
+    """Translator converting strings to uppercase."""
+
+    service = "upper"
+
+    def __init__(self, *args, **kwargs):
+        """Initialize translator with a calls register."""
+        self.calls = []
+        self.threads = set()
+        super().__init__(*args, **kwargs)
+
+    def translate_string(self, text: str) -> str:
+        """Translate a string with a random delay."""
+        time.sleep(random.random() / 1000)  # nosec
+        self.calls.append(text)
+        self.threads.add(threading.get_ident())
+        return text.upper()
+
+
+class LowerTranslator(UpperTranslator):
+    """Translator converting strings to lowercase."""
+
+    def translate_string(self, text: str) -> str:
+        """Translate a string."""
+        return text.lower()
+
+
+class FailingTranslator(UpperTranslator):
+    """Translator failing on the strings with "fail"."""
+
+    def translate_string(self, text: str) -> str | None:
+        """Translate a string, or fail."""
+        return None if "fail" in text else super().translate_string(text)
+
+
+class BaseTranslatorTest(unittest.TestCase):
+    """Tests for BaseTranslator."""
+
+    def test_translate_keeps_structure(self):
+        """It translates strings and keeps the rest of values."""
+        translator = UpperTranslator("ES", sleep=0, skip=["id"])
+        data = {"a": "x", "b": [True, 1, 1.5, "y"], "id": "z", "c": {"d": ""}}
+        self.assertEqual(
+            translator.translate(data),
+            {"a": "X", "b": [True, 1, 1.5, "Y"], "id": "z", "c": {"d": ""}},
+        )
+
+    def test_translate_dedupes_strings(self):
+        """It translates each unique string once."""
+        translator = UpperTranslator("ES", sleep=0)
+        translator.translate(["a", {"b": "a"}, ["a", "b"]])
+        self.assertEqual(sorted(translator.calls), ["a", "b"])
+
+    def test_translate_with_workers_is_deterministic(self):
+        """It returns the same results in the same order with several workers."""
+        data = {f"key-{idx}": [f"text {idx}", f"text {idx % 7}"] for idx in range(200)}
+        expected = UpperTranslator("ES", sleep=0).translate(data)
+
+        translator = UpperTranslator("ES", sleep=0, workers=8)
+        results = translator.translate(data)
+
+        self.assertEqual(results, expected)
+        self.assertEqual(list(results), list(expected))
+        self.assertGreater(len(translator.threads), 1)
+
+    def test_get_texts(self):
+        """It gets the unique strings to translate, in order."""
+        translator = UpperTranslator("ES", sleep=0, skip=["id"])
+        data = {"a": "x", "id": "z", "b": [1, "", "y", {"c": "x", "id": "w"}]}
+        self.assertEqual(translator.get_texts(data), ["x", "y"])
+        self.assertEqual(
+            translator.get_values_texts([("a",), ("id", 0), ("b",)], ["x", "z", ["y"]]),
+            ["x", "y"],
+        )
+
+    def test_translate_only(self):
+        """It translates only the values matching the key paths to translate."""
+        translator = UpperTranslator("ES", sleep=0, skip=["pages.*.id"], only=["pages"])
+        data = {"title": "a", "pages": [{"id": "b", "text": "c"}], "id": "d"}
+        self.assertEqual(
+            translator.translate(data),
+            {"title": "a", "pages": [{"id": "b", "text": "C"}], "id": "d"},
+        )
+        self.assertEqual(translator.get_texts(data), ["c"])
+        self.assertEqual(
+            translator.translate_values(
+                [("title",), ("pages", 0)], ["a", {"text": "c"}]
+            ),
+            ["a", {"text": "C"}],
+        )
+        self.assertEqual(
+            translator.get_values_texts(
+                [("title",), ("pages", 0)], ["a", {"text": "c"}]
+            ),
+            ["c"],
+        )
+
+    def test_locales_sharing_memory(self):
+        """It keeps the translations of each locale apart in a shared memory."""
+        memory = TranslationMemory()
+        spanish = UpperTranslator("ES", sleep=0, memory=memory)
+        french = LowerTranslator("FR", sleep=0, memory=memory)
+        self.assertEqual(spanish.translate({"a": "Hello"}), {"a": "HELLO"})
+        self.assertEqual(french.translate({"a": "Hello"}), {"a": "hello"})
+        self.assertEqual(spanish.translate({"b": "Hello"}), {"b": "HELLO"})
+        self.assertEqual(spanish.counts, {"cached": 1, "translated": 1, "failed": 0})
+
+    def test_estimate(self):
+        """It counts the strings not in the translation memory, without translating."""
+        translator = UpperTranslator("ES", sleep=0)
+        translator.memory.set(translator.get_cache_key("a"), "A")
+        self.assertEqual(
+            translator.estimate(["a", "bb", "ccc"]),
+            {"strings": 2, "characters": 5, "requests": 2, "cached": 1},
+        )
+        self.assertEqual(translator.calls, [])
+
+    def test_translate_masks_placeholders(self):
+        """It translates strings differing only in placeholders once."""
+        translator = UpperTranslator("ES", sleep=0)
+        results = translator.translate(
+            ["Hello {name}", "Hello {user}", "{{count}}: %d"]
+        )
+        self.assertEqual(results, ["HELLO {name}", "HELLO {user}", "{{count}}: %d"])
+        self.assertEqual(translator.calls, ["Hello {0}"])
+
+    def test_translate_keeps_source_when_placeholders_are_mangled(self):
+        """It keeps the source text, without caching it, when tokens are lost."""
+        translator = UpperTranslator("ES", sleep=0)
+        translator.translate_string = lambda text: text.replace("{0}", "").upper()
+        self.assertEqual(translator.translate(["Hello {name}"]), ["Hello {name}"])
+        self.assertEqual(translator.counts["failed"], 1)
+        self.assertEqual(len(translator.memory), 0)
+
+    def test_translate_without_masking(self):
+        """It sends placeholders as they are if masking is disabled."""
+        translator = UpperTranslator("ES", sleep=0, mask_placeholders=False)
+        self.assertEqual(translator.translate(["Hello {name}"]), ["HELLO {NAME}"])
+
+    def test_translate_splits_long_texts(self):
+        """It translates the texts too long for a call by chunks, joined in order."""
+        translator = UpperTranslator("ES", sleep=0, workers=4)
+        translator.max_text_size = 20
+        text = "First paragraph.\n\nSecond one. With two sentences.\n\nLast one."
+        self.assertEqual(translator.translate({"a": text}), {"a": text.upper()})
+        self.assertEqual(
+            sorted(translator.calls),
+            ["First paragraph.", "Last one.", "Second one.", "With two sentences."],
+        )
+
+    def test_translate_caches_chunks(self):
+        """It only sends the changed chunks of a long text translated before."""
+        translator = UpperTranslator("ES", sleep=0)
+        translator.max_text_size = 20
+        translator.translate(["First paragraph.\n\nSecond one."])
+        translator.calls.clear()
+        other = UpperTranslator("ES", sleep=0, memory=translator.memory)
+        other.max_text_size = 20
+        self.assertEqual(
+            other.translate(["First paragraph.\n\nEdited one."]),
+            ["FIRST PARAGRAPH.\n\nEDITED ONE."],
+        )
+        self.assertEqual(other.calls, ["Edited one."])
+        self.assertEqual(other.estimate(["First paragraph.\n\nNew one."])["strings"], 1)
+
+    def test_translate_keeps_source_if_a_chunk_fails(self):
+        """It keeps the source of a long text if any of its chunks fails."""
+        translator = FailingTranslator("ES", sleep=0)
+        translator.max_text_size = 20
+        text = "First paragraph.\n\nThis will fail."
+        self.assertEqual(translator.translate_texts([text]), {text: text})
+        self.assertEqual(translator.calls, ["First paragraph."])
@@ -1,8 +1,40 @@
 # -*- coding: utf-8 -*-
+import json
 import unittest
+from email.message import Message
+from urllib import parse
+from unittest.mock import patch, MagicMock
+from json_translate.memory import TranslationMemory
+from json_translate.transport import Response
 from json_translate.translators.deepl import DeepLTranslator
 
 
+def mock_response(
+    translations: list, status: int = 200, headers: Message = None
+) -> Response:
+    """Build a DeepL API response."""
+    return Response(
+        status=status,
+        headers=headers or Message(),
+        body=json.dumps(
+            {"translations": [{"text": text} for text in translations]}
+        ).encode(),
+    )
+
+
+def echo_response(method: str, body: bytes, headers: dict) -> Response:
+    """Build a DeepL API response translating texts to themselves."""
+    return mock_response(parse.parse_qs(body.decode())["text"])
+
+
+def get_sent_texts(request_mock: MagicMock) -> list:
+    """Get the texts sent on each request."""
+    return [
+        parse.parse_qs(call.kwargs["body"].decode())["text"]
+        for call in request_mock.call_args_list
+    ]
+
+
 class TranslatorTest(unittest.TestCase):
     """Test DeepL translator."""
 
@@ -10,3 +42,161 @@ class TranslatorTest(unittest.TestCase):
         """Test encoded string."""
         translator = DeepLTranslator("en")
         self.assertEqual(translator.decode("m\u00b2"), "m²")
+
+    def test_get_text_size(self):
+        """It measures texts as they are urlencoded."""
+        translator = DeepLTranslator("ES")
+        for text in ("Hello", "a b+c&d=e", "Ça va? 100% 😀", "~_.-", ""):
+            self.assertEqual(
+                translator.get_text_size(text),
+                len(parse.urlencode({"text": text})) + 1,
+            )
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_sends_unique_strings_in_one_request(self, request: MagicMock):
+        """It sends all the unique strings of the tree in a single request."""
+        request.return_value = mock_response(["Hola", "Adiós"])
+        translator = DeepLTranslator("ES", sleep=0)
+        results = translator.translate(
+            {"a": "Hello", "b": ["Bye", {"c": "Hello"}], "d": 1, "e": ""}
+        )
+        self.assertEqual(
+            results, {"a": "Hola", "b": ["Adiós", {"c": "Hola"}], "d": 1, "e": ""}
+        )
+        self.assertEqual(get_sent_texts(request), [["Hello", "Bye"]])
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_splits_batches_by_text_count(self, request: MagicMock):
+        """It doesn't send more texts per request than allowed."""
+        request.side_effect = echo_response
+        translator = DeepLTranslator("ES", sleep=0)
+        translator.translate([f"text {idx}" for idx in range(120)])
+        self.assertEqual(
+            [len(texts) for texts in get_sent_texts(request)], [50, 50, 20]
+        )
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_splits_batches_by_payload_size(self, request: MagicMock):
+        """It doesn't send requests bigger than the payload limit."""
+        request.side_effect = echo_response
+        translator = DeepLTranslator("ES", sleep=0)
+        translator.translate([str(idx) * 50000 for idx in range(5)])
+        self.assertEqual([len(texts) for texts in get_sent_texts(request)], [2, 2, 1])
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_string_returns_none_on_error_status(self, request: MagicMock):
+        """It returns None when the response is not successful."""
+        request.return_value = mock_response([], status=204)
+        translator = DeepLTranslator("ES", sleep=0)
+        self.assertIsNone(translator.translate_string("Hello"))
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_keeps_unsuccessful_responses_out_of_memory(
+        self, request: MagicMock
+    ):
+        """It counts the strings of unsuccessful responses as failed, without caching them."""
+        for response, translated in (
+            (mock_response([], status=204), 0),
+            (Response(status=200, headers=Message(), body=b"{}"), 0),
+            # The translation of "Bye" is missing
+            (mock_response(["Hola"]), 1),
+        ):
+            request.return_value = response
+            memory = TranslationMemory()
+            translator = DeepLTranslator("ES", sleep=0, memory=memory)
+            self.assertEqual(translator.translate(["Hello", "Bye"])[1], "Bye")
+            self.assertEqual(
+                translator.counts,
+                {"cached": 0, "translated": translated, "failed": 2 - translated},
+            )
+            self.assertEqual(len(memory), translated)
+            self.assertIsNone(memory.get(translator.get_cache_key("Bye")))
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_string_warns_on_more_than_one_translation(
+        self, request: MagicMock
+    ):
+        """It logs a warning and keeps the first translation."""
+        request.return_value = mock_response(["Hola", "Buenas"])
+        translator = DeepLTranslator("ES", sleep=0)
+        with patch.object(translator, "log_translation") as log:
+            self.assertEqual(translator.translate_string("Hello"), "Hola")
+        self.assertEqual(log.call_args.kwargs["status"], translator.Status.warning)
+        self.assertTrue(
+            log.call_args.kwargs["result"].startswith("more than 1 translation")
+        )
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_reuses_translation_memory(self, request: MagicMock):
+        """It doesn't request the strings already stored in the memory."""
+        request.return_value = mock_response(["Hola"])
+        memory = TranslationMemory()
+        DeepLTranslator("ES", sleep=0, memory=memory).translate(["Hello"])
+        results = DeepLTranslator("ES", sleep=0, memory=memory).translate(["Hello"])
+        self.assertEqual(results, ["Hola"])
+        self.assertEqual(request.call_count, 1)
+
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translation_memory_is_scoped_by_locale(self, request: MagicMock):
+        """It doesn't reuse translations of other target languages."""
+        memory = TranslationMemory()
+        request.return_value = mock_response(["Hola"])
+        DeepLTranslator("ES", sleep=0, memory=memory).translate(["Hello"])
+        request.return_value = mock_response(["Bonjour"])
+        results = DeepLTranslator("FR", sleep=0, memory=memory).translate(["Hello"])
+        self.assertEqual(results, ["Bonjour"])
+
+    @patch("time.sleep")
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_retries_throttled_requests(
+        self, request: MagicMock, sleep: MagicMock
+    ):
+        """It waits Retry-After seconds and retries throttled requests."""
+        headers = Message()
+        headers["Retry-After"] = "7"
+        request.side_effect = [
+            mock_response([], status=429, headers=headers),
+            mock_response(["Hola"]),
+        ]
+        translator = DeepLTranslator("ES", sleep=0)
+        self.assertEqual(translator.translate(["Hello"]), ["Hola"])
+        self.assertGreaterEqual(sleep.call_args.args[0], 7)
+
+    def test_translators_share_transport(self):
+        """It reuses the connection pool of other instances."""
+        translator = DeepLTranslator("ES", pool_size=3)
+        other = DeepLTranslator("FR", **translator.get_shared_kwargs())
+        self.assertIs(other.transport, translator.transport)
+        self.assertEqual(other.transport.pool_size, 3)
+
+    @patch("time.sleep")
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_keeps_failed_strings_out_of_memory(
+        self, request: MagicMock, _sleep: MagicMock
+    ):
+        """It keeps the source text when retries are exhausted, without caching it."""
+        request.side_effect = ConnectionResetError("connection reset")
+        memory = TranslationMemory()
+        translator = DeepLTranslator("ES", sleep=0, memory=memory)
+        self.assertEqual(translator.translate(["Hello"]), ["Hello"])
+        self.assertEqual(len(memory), 0)
+
+    @patch("time.sleep")
+    @patch("transport.HTTPConnectionPool.request")
+    def test_translate_records_stats(self, request: MagicMock, _sleep: MagicMock):
+        """It records requests, retries, errors and cache lookups."""
+        request.side_effect = [
+            mock_response([], status=429),
+            mock_response(["Hola"]),
+        ]
+        memory = TranslationMemory()
+        memory.set(DeepLTranslator("ES").get_cache_key("Bye"), "Adiós")
+        translator = DeepLTranslator("ES", sleep=0, memory=memory)
+        translator.translate(["Hello", "Bye"])
+
+        data = translator.stats.to_dict()
+        self.assertEqual(data["requests"], 2)
+        self.assertEqual(data["retries"], 1)
+        self.assertEqual(data["errors"], {"429": 1})
+        self.assertEqual(data["billable_characters"], len("Hello"))
+        self.assertEqual(data["cache"], {"hits": 1, "misses": 1})
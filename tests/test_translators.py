@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import sys
+import subprocess
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from json_translate import translators
+from json_translate.translators.base import BaseTranslator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class DummyTranslator(BaseTranslator):
+    """Translator of a third-party service."""
+
+    service = "dummy"
+
+    def translate_string(self, text: str) -> str:
+        """Translate a specific string."""
+        return text.upper()
+
+
+class TranslatorsTest(unittest.TestCase):
+    """Tests for translators registry."""
+
+    def setUp(self):
+        """Keep the registered translators."""
+        self.registry = patch.dict(translators.TRANSLATORS)
+        self.registry.start()
+
+    def tearDown(self):
+        """Restore the registered translators."""
+        self.registry.stop()
+
+    def test_get_translator_imports_builtin_service(self):
+        """It imports and returns the class of a built-in service."""
+        self.assertEqual(translators.get_translator("deepl").service, "deepl")
+        self.assertIsInstance(translators.TRANSLATORS["deepl"], type)
+
+    def test_register_translator_class(self):
+        """It returns the registered translator classes."""
+        translators.register_translator("dummy", DummyTranslator)
+        self.assertIs(translators.get_translator("dummy"), DummyTranslator)
+        self.assertIn("dummy", translators.get_services())
+
+    def test_register_translator_import_path(self):
+        """It imports the registered translators when they are used."""
+        translators.register_translator("dummy", f"{__name__}:DummyTranslator")
+        self.assertTrue(translators.has_translator("dummy"))
+        self.assertIs(translators.get_translator("dummy"), DummyTranslator)
+
+    @patch("importlib.metadata.entry_points")
+    def test_get_translator_loads_entry_point(self, entry_points_mock: MagicMock):
+        """It loads the translators registered by other packages."""
+        entry_point = MagicMock()
+        entry_point.name = "dummy"
+        entry_point.load.return_value = DummyTranslator
+        entry_points_mock.return_value = [entry_point]
+        self.assertIs(translators.get_translator("dummy"), DummyTranslator)
+        entry_points_mock.assert_called_with(
+            group=translators.ENTRY_POINT_GROUP, name="dummy"
+        )
+
+    def test_get_translator_raises_on_unknown_service(self):
+        """It raises an error listing the available services."""
+        self.assertFalse(translators.has_translator("unknown"))
+        with self.assertRaisesRegex(ValueError, "deepl, aws"):
+            translators.get_translator("unknown")
+
+    def test_deepl_does_not_import_boto3(self):
+        """It doesn't import the AWS client library to use DeepL."""
+        code = (
+            f"import sys; sys.path.insert(0, {str(ROOT)!r}); import json_translate;"
+            " from commands import main; from translators import get_translator;"
+            " get_translator('deepl'); print('boto3' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
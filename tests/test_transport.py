@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json_translate.transport import HTTPConnectionPool
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler returning the request body."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        """Count connections."""
+        with self.lock:
+            EchoHandler.connections += 1
+        super().setup()
+
+    def do_POST(self):  # noqa: N802
+        """Return request body."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Don't log requests."""
+
+
+class HTTPConnectionPoolTest(unittest.TestCase):
+    """Tests for HTTPConnectionPool."""
+
+    def setUp(self):
+        """Start a local server."""
+        EchoHandler.connections = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2/translate"
+
+    def tearDown(self):
+        """Stop the local server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_is_reused(self):
+        """It sends consecutive requests over the same connection."""
+        pool = HTTPConnectionPool(self.url)
+        for idx in range(5):
+            response = pool.request("POST", body=str(idx).encode())
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.read(), str(idx).encode())
+        pool.close()
+        self.assertEqual(EchoHandler.connections, 1)
+
+    def test_connections_are_bounded_by_pool_size(self):
+        """It doesn't open more connections than the pool size."""
+        pool = HTTPConnectionPool(self.url, pool_size=2)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(
+                executor.map(
+                    lambda idx: pool.request("POST", body=str(idx).encode()).read(),
+                    range(40),
+                )
+            )
+        pool.close()
+        self.assertEqual(bodies, [str(idx).encode() for idx in range(40)])
+        self.assertLessEqual(EchoHandler.connections, 2)
+
+    def test_closed_connection_is_replaced(self):
+        """It retries on a new connection if the idle one was closed."""
+        pool = HTTPConnectionPool(self.url)
+        pool.request("POST", body=b"a")
+        # Simulate the server closing the idle connection
+        pool._idle.queue[0].sock.shutdown(socket.SHUT_RDWR)  # noqa: SLF001
+        self.assertEqual(pool.request("POST", body=b"b").read(), b"b")
+        pool.close()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from json_translate.watch import FileWatcher
+
+
+class FileWatcherTest(unittest.TestCase):
+    """Tests for watch module."""
+
+    def setUp(self):
+        """Create a temporary directory with a watched file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        self.file = self.root / "en.json"
+        self.file.write_text("{}", encoding="utf-8")
+        self.watcher = FileWatcher(
+            lambda: sorted(self.root.glob("*.json")), interval=0.01
+        )
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def touch(self, path: Path, content: str):
+        """Write a file with a later modification time."""
+        path.write_text(content, encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_poll_without_changes(self):
+        """It returns nothing if the files didn't change."""
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_poll_detects_modified_files(self):
+        """It returns the modified files, once."""
+        self.touch(self.file, '{"a": "b"}')
+        self.assertEqual(self.watcher.poll(), [self.file])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_poll_detects_new_files(self):
+        """It returns the files added since the last poll."""
+        new_file = self.root / "other.json"
+        self.touch(new_file, "{}")
+        self.assertEqual(self.watcher.poll(), [new_file])
+
+    def test_poll_ignores_removed_files(self):
+        """It doesn't fail if a file is removed."""
+        self.file.unlink()
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_watch_calls_callback_until_stopped(self):
+        """It calls the callback with the changed files."""
+        changes = []
+
+        def callback(files):
+            changes.append(files)
+            self.watcher.stop()
+
+        thread = threading.Thread(target=self.watcher.watch, args=(callback,))
+        thread.start()
+        self.touch(self.file, '{"a": "b"}')
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(changes, [[self.file]])